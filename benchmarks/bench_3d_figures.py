@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark: 3D figure construction
+
+Compares the original per-row builders of the P&L profitability, service
+line and workstream network views (one ``Scatter3d`` per client, node or
+edge, built with ``iterrows``) with the batched Chart3DBuilder (one trace
+per category, NaN-separated edge segments). Reports build time, trace
+count and serialised JSON payload size for each row count.
+
+Usage:
+    python -m benchmarks.bench_3d_figures [rows ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.figures_3d import Chart3DBuilder, SERVICE_LINES, SERVICE_COLORS
+from utils.pl_metrics import PLMetrics
+from benchmarks.bench_pl_metrics import build_clients
+
+CATEGORY_COLORS = {
+    'NAV Calculation': '#FF6B6B', 'Portfolio Valuation': '#4ECDC4', 'Trade Capture': '#45B7D1',
+    'Reconciliation': '#96CEB4', 'Corporate Actions': '#FFEAA7', 'Expense Management': '#DDA0DD',
+    'Reporting': '#98D8C8'
+}
+
+
+def category_color(category):
+    return CATEGORY_COLORS.get(category, '#B0B0B0')
+
+
+def build_pl_analysis(clients: int) -> pd.DataFrame:
+    """Synthetic client book with service line revenues and derived P&L metrics"""
+    df = build_clients(clients)
+    rng = np.random.default_rng(11)
+    mix = rng.dirichlet(np.ones(len(SERVICE_LINES)), clients)
+    for position, service in enumerate(SERVICE_LINES):
+        df[f"{service}_Revenue_USD"] = (df['Total_Annual_Revenue_USD'] * mix[:, position]).round()
+    return PLMetrics.calculate(df)
+
+
+def build_workstreams(count: int) -> pd.DataFrame:
+    """Synthetic workstream portfolio"""
+    rng = np.random.default_rng(13)
+    return pd.DataFrame({
+        'name': [f"Workstream {i}" for i in range(count)],
+        'category': rng.choice(list(CATEGORY_COLORS), count),
+        'complexity': rng.integers(1, 11, count),
+        'risk': rng.integers(1, 11, count),
+        'investment': rng.uniform(0.5, 5, count).round(1),
+    })
+
+
+def legacy_pl_profitability(pl_analysis: pd.DataFrame) -> go.Figure:
+    """Reference copy of the original per-client trace loop"""
+    fig = go.Figure()
+    service_lines = list(SERVICE_LINES)
+    for _, row in pl_analysis.iterrows():
+        revenues = [row['Fund_Accounting_Revenue_USD'], row['Fund_Administration_Revenue_USD'],
+                    row['Transfer_Agency_Revenue_USD'], row['Regulatory_Reporting_Revenue_USD']]
+        dominant_service = service_lines[revenues.index(max(revenues))]
+        fig.add_trace(go.Scatter3d(
+            x=[row['Total_Annual_Revenue_USD']],
+            y=[row['Total_Costs']],
+            z=[row['Fund_AUM_USD_Millions']],
+            mode='markers+text',
+            marker=dict(
+                size=max(5, min(30, abs(row['Gross_Margin_Percent']) * 0.8 + 5)),
+                color=SERVICE_COLORS.get(dominant_service, '#B0B0B0'),
+                opacity=0.8,
+                line=dict(width=2, color='white'),
+                symbol='diamond' if row['Gross_Margin_Percent'] > 25 else 'circle'
+            ),
+            text=[row['Client_Name'][:8] + '...' if len(row['Client_Name']) > 8 else row['Client_Name']],
+            textposition="top center",
+            name=f"{dominant_service.replace('_', ' ')} Focused",
+            showlegend=True,
+            hovertemplate='<b>%{customdata[0]}</b><br>Revenue: $%{x:,.0f}<br>Costs: $%{y:,.0f}<br>'
+                          'AUM: $%{z:,.0f}M<br>Gross Margin: %{customdata[1]:.1f}%<br>'
+                          'Revenue per AUM: %{customdata[2]:.1f} bps<br>'
+                          'Dominant Service: %{customdata[3]}<br><extra></extra>',
+            customdata=[[row['Client_Name'], row['Gross_Margin_Percent'],
+                         row['Revenue_Per_AUM_BPS'], dominant_service.replace('_', ' ')]]
+        ))
+    return fig
+
+
+def legacy_service_line(pl_analysis: pd.DataFrame) -> go.Figure:
+    """Reference copy of the original per-row diversity index loop"""
+    pl_analysis = pl_analysis.copy()
+    for idx, row in pl_analysis.iterrows():
+        revenues = [row['Fund_Accounting_Revenue_USD'], row['Fund_Administration_Revenue_USD'],
+                    row['Transfer_Agency_Revenue_USD'], row['Regulatory_Reporting_Revenue_USD']]
+        total_rev = sum(revenues)
+        if total_rev > 0:
+            proportions = [r/total_rev for r in revenues if r > 0]
+            diversity_index = -sum([p * np.log(p) for p in proportions if p > 0])
+        else:
+            diversity_index = 0
+        pl_analysis.loc[idx, 'Service_Diversity_Index'] = diversity_index
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter3d(
+        x=pl_analysis['Service_Diversity_Index'],
+        y=pl_analysis['Gross_Margin_Percent'],
+        z=pl_analysis['Revenue_Per_AUM_BPS'],
+        mode='markers+text',
+        marker=dict(size=np.clip(pl_analysis['Total_Annual_Revenue_USD'] / 20000, 5, 30),
+                    color=pl_analysis['Number_of_Funds'], colorscale='Viridis', showscale=True,
+                    colorbar=dict(title="Number of Funds"), opacity=0.8,
+                    line=dict(width=2, color='white')),
+        text=[name[:6] + '...' if len(name) > 6 else name for name in pl_analysis['Client_Name']],
+        textposition="middle center",
+        name="Clients",
+        customdata=list(zip(pl_analysis['Client_Name'], pl_analysis['Number_of_Funds'],
+                            pl_analysis['Total_Annual_Revenue_USD']))
+    ))
+    return fig, pl_analysis['Service_Diversity_Index'].to_numpy()
+
+
+def legacy_network(df: pd.DataFrame) -> go.Figure:
+    """Reference copy of the original per-edge and per-node trace loops"""
+    fig = go.Figure()
+    positions = {}
+    for i, (_, row) in enumerate(df.iterrows()):
+        angle = i * (2 * np.pi / len(df))
+        radius = row['complexity']
+        positions[row['name']] = (radius * np.cos(angle), radius * np.sin(angle), row['risk'])
+
+    for cat in df['category'].unique():
+        cat_workstreams = df[df['category'] == cat]
+        for i in range(len(cat_workstreams) - 1):
+            x1, y1, z1 = positions[cat_workstreams.iloc[i]['name']]
+            x2, y2, z2 = positions[cat_workstreams.iloc[i + 1]['name']]
+            fig.add_trace(go.Scatter3d(x=[x1, x2], y=[y1, y2], z=[z1, z2], mode='lines',
+                                       line=dict(color=category_color(cat), width=4),
+                                       opacity=0.5, showlegend=False, hoverinfo='skip'))
+
+    for _, row in df.iterrows():
+        x, y, z = positions[row['name']]
+        fig.add_trace(go.Scatter3d(
+            x=[x], y=[y], z=[z],
+            mode='markers+text',
+            marker=dict(size=row['investment'] * 5, color=category_color(row['category']),
+                        opacity=0.8, line=dict(width=2, color='white')),
+            text=row['name'][:8] + '...' if len(row['name']) > 8 else row['name'],
+            textposition="middle center",
+            name=row['category'],
+            showlegend=False,
+            hovertemplate='<b>%{text}</b><br>Category: ' + row['category'] + '<br>' +
+                          'Investment: $' + f"{row['investment']:.1f}" + 'M<br>' +
+                          'Complexity: ' + f"{row['complexity']}" + '/10<br>' +
+                          'Risk: ' + f"{row['risk']}" + '/10<br><extra></extra>'
+        ))
+    return fig
+
+
+def measure(build):
+    """Build time, trace count and JSON payload size of one figure"""
+    start = time.perf_counter()
+    fig = build()
+    elapsed = time.perf_counter() - start
+    return elapsed, len(fig.data), len(fig.to_json())
+
+
+def report(view: str, rows: int, legacy, batched):
+    print(f"{view:<16}{rows:>7,} | legacy {legacy[0]:8.3f}s {legacy[1]:>6} traces {legacy[2] / 1024:9.0f} KB"
+          f" | batched {batched[0]:7.3f}s {batched[1]:>3} traces {batched[2] / 1024:7.0f} KB"
+          f" | {legacy[0] / batched[0]:6.1f}x")
+
+
+def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or [100, 500, 2000]
+
+    for rows in row_counts:
+        pl_analysis = build_pl_analysis(rows)
+        workstreams = build_workstreams(rows)
+
+        legacy_fig = legacy_pl_profitability(pl_analysis)
+        batched_fig = Chart3DBuilder.pl_profitability(pl_analysis)
+        legacy_points = sum(len(trace.x) for trace in legacy_fig.data)
+        batched_points = sum(len(trace.x) for trace in batched_fig.data if trace.type == 'scatter3d')
+        assert legacy_points == batched_points == rows
+
+        _, legacy_diversity = legacy_service_line(pl_analysis)
+        assert np.allclose(legacy_diversity, Chart3DBuilder.service_diversity(pl_analysis), rtol=1e-12)
+
+        report('P&L profit', rows, measure(lambda: legacy_pl_profitability(pl_analysis)),
+               measure(lambda: Chart3DBuilder.pl_profitability(pl_analysis)))
+        report('Service line', rows, measure(lambda: legacy_service_line(pl_analysis)[0]),
+               measure(lambda: Chart3DBuilder.service_line(pl_analysis)))
+        report('Network', rows, measure(lambda: legacy_network(workstreams)),
+               measure(lambda: Chart3DBuilder.network(workstreams, category_color)))
+        print()
+
+    print("✅ Batched figures plot the same points and diversity indices as the per-row builders")
+
+
+if __name__ == "__main__":
+    main()
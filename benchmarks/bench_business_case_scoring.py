@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: business case scoring
+
+Compares the Business Cases tab's scalar path (``iterrows`` + ``to_dict``
+into calculate_business_case_score / create_gap_analysis per case) with the
+columnar BusinessCaseScorer, and checks that both agree bit for bit.
+Also times a weight sweep: N scenarios x M cases in one matrix multiply
+versus re-scoring the portfolio once per scenario.
+
+Usage:
+    python -m benchmarks.bench_business_case_scoring [cases] [scenarios]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.business_case_scoring import (
+    BusinessCaseScorer, ScoringModel, SCORE_CATEGORIES, GAP_DIMENSIONS,
+    calculate_business_case_score, create_gap_analysis
+)
+
+SCORING_COLUMNS = {
+    'ROI_Percentage': (0, 150),
+    'Payback_Period_Months': (3, 72),
+    'Strategic_Alignment_Score': (1, 10),
+    'Client_Impact_Score': (1, 10),
+    'Technology_Complexity_Score': (1, 10),
+    'Implementation_Risk_Score': (1, 10),
+    'Current_Process_Efficiency': (1, 10),
+    'Target_Process_Efficiency': (1, 10),
+    'Current_Error_Rate_Percent': (0, 15),
+    'Target_Error_Rate_Percent': (0, 5),
+    'Current_Client_Satisfaction': (1, 10),
+    'Target_Client_Satisfaction': (1, 10),
+    'Current_FTE_Count': (0, 40),
+    'Target_FTE_Count': (0, 30),
+}
+
+
+def build_cases(cases: int) -> pd.DataFrame:
+    """Build a synthetic business case export with a few missing values"""
+    rng = np.random.default_rng(5)
+    data = {'Case_Title': [f"Case {i}" for i in range(cases)]}
+    for col, (low, high) in SCORING_COLUMNS.items():
+        values = rng.uniform(low, high, cases).round(1)
+        values[rng.random(cases) < 0.02] = np.nan
+        data[col] = values
+    return pd.DataFrame(data)
+
+
+def scalar_scores(df: pd.DataFrame):
+    """The original per-row driver of the Business Cases tab"""
+    results = []
+    for _, row in df.iterrows():
+        case = row.to_dict()
+        results.append((calculate_business_case_score(case), create_gap_analysis(case)))
+    return results
+
+
+def columnar_scores(df: pd.DataFrame):
+    return BusinessCaseScorer.score(df), BusinessCaseScorer.gap_analysis(df)
+
+
+def same(a, b) -> bool:
+    """Bit-for-bit float equality, treating NaN as equal to NaN"""
+    return np.float64(a).tobytes() == np.float64(b).tobytes()
+
+
+def main():
+    cases = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    df = build_cases(cases)
+    print(f"Synthetic portfolio: {cases:,} business cases")
+
+    start = time.perf_counter()
+    expected = scalar_scores(df)
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores, gaps = columnar_scores(df)
+    columnar = time.perf_counter() - start
+
+    print(f"Scalar per-row scoring: {scalar:8.3f}s")
+    print(f"Columnar scoring:       {columnar:8.3f}s")
+    print(f"Speedup:                {scalar / columnar:8.1f}x")
+
+    for position, ((overall, breakdown), gap_analysis) in enumerate(expected):
+        label = df.index[position]
+        total, columnar_breakdown = BusinessCaseScorer.score_record(scores, label)
+        assert same(overall, total), (label, 'Total')
+        for category in SCORE_CATEGORIES:
+            assert same(breakdown[category], columnar_breakdown[category]), (label, category)
+        columnar_gaps = BusinessCaseScorer.gap_record(gaps, label)
+        for dimension in GAP_DIMENSIONS:
+            for metric, value in gap_analysis[dimension].items():
+                assert same(value, columnar_gaps[dimension][metric]), (label, dimension, metric)
+    print("✅ Columnar scores and gaps are bit-for-bit equal to the scalar functions")
+
+    scenario_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    sweep_cases = df.head(10000)
+    model = ScoringModel.default()
+    scenarios = model.random_scenarios(scenario_count, seed=0)
+
+    start = time.perf_counter()
+    matrix = model.score_matrix(sweep_cases)
+    swept = model.sweep(sweep_cases, scenarios, matrix)
+    batched = time.perf_counter() - start
+
+    sampled = min(scenario_count, 50)
+    start = time.perf_counter()
+    for position in range(sampled):
+        model.with_weights(dict(zip(model.keys, scenarios[position]))).evaluate(sweep_cases)
+    per_scenario = (time.perf_counter() - start) / sampled
+
+    print(f"\nWeight sweep: {scenario_count:,} scenarios x {len(sweep_cases):,} cases")
+    print(f"Re-score per scenario (est.): {per_scenario * scenario_count:8.3f}s")
+    print(f"Batched matrix multiply:      {batched:8.3f}s")
+    check = model.with_weights(dict(zip(model.keys, scenarios[-1]))).evaluate(sweep_cases)['Total']
+    assert np.allclose(swept[-1], check, equal_nan=True)
+    print("✅ Batched sweep matches per-scenario scoring")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: capital dashboard filter changes
+
+Compares the legacy filter path (``df.copy()`` plus chained boolean
+indexing, then pandas reductions for the key metrics) with the group-by
+index and pre-aggregated partials in utils.capital_rollup.
+
+Usage:
+    python -m benchmarks.bench_capital_rollup [projects]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.constants import CAPITAL_FILTER_COLUMNS
+from utils.capital_cube import CapitalCube
+from utils.capital_metrics import CapitalMetrics
+from utils.capital_rollup import CapitalRollup
+from benchmarks.bench_capital_metrics import build_portfolio
+
+FILTER_SCENARIOS = [
+    {},
+    {'PROJECT_MANAGER': 'PM 7'},
+    {'PORTFOLIO_OBS_LEVEL1': 'Portfolio 1', 'FUND_DECISION': 'Funded'},
+    {'PORTFOLIO_OBS_LEVEL1': 'Portfolio 2', 'SUB_PORTFOLIO_OBS_LEVEL2': 'Sub 3',
+     'BRS_CLASSIFICATION': 'Run'},
+]
+
+
+def add_filter_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Attach synthetic values for the five sidebar filter columns"""
+    rng = np.random.default_rng(11)
+    projects = len(df)
+    df['PORTFOLIO_OBS_LEVEL1'] = rng.choice([f'Portfolio {i}' for i in range(4)], projects)
+    df['SUB_PORTFOLIO_OBS_LEVEL2'] = rng.choice([f'Sub {i}' for i in range(12)], projects)
+    df['PROJECT_MANAGER'] = rng.choice([f'PM {i}' for i in range(60)], projects)
+    df['BRS_CLASSIFICATION'] = rng.choice(['Run', 'Change', 'Regulatory'], projects)
+    df['FUND_DECISION'] = rng.choice(['Funded', 'Unfunded'], projects)
+    return df
+
+
+def legacy_filter(df: pd.DataFrame, filters: dict) -> dict:
+    """Reference copy of the original copy-and-filter path"""
+    filtered_df = df.copy()
+    for col_name, selected_value in filters.items():
+        if selected_value != 'All' and col_name in filtered_df.columns:
+            filtered_df = filtered_df[filtered_df[col_name] == selected_value]
+    return {
+        'count': len(filtered_df),
+        'SUM_ACTUAL_SPEND_YTD': filtered_df['SUM_ACTUAL_SPEND_YTD'].sum(),
+        'RUN_RATE_PER_MONTH_mean': filtered_df['RUN_RATE_PER_MONTH'].mean(),
+        'CAPITAL_UNDERSPEND': filtered_df['CAPITAL_UNDERSPEND'].sum(),
+        'CAPITAL_OVERSPEND': filtered_df['CAPITAL_OVERSPEND'].sum(),
+        'NET_REALLOCATION_AMOUNT': filtered_df['NET_REALLOCATION_AMOUNT'].sum(),
+    }
+
+
+def rollup_filter(rollup: CapitalRollup, filters: dict) -> dict:
+    """Filter through the group-by index"""
+    rollup.select(filters)
+    return rollup.totals(filters)
+
+
+def best_time(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    projects = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    df = CapitalMetrics.calculate(add_filter_columns(build_portfolio(projects)))
+    print(f"Synthetic portfolio: {projects:,} projects, filters on {', '.join(CAPITAL_FILTER_COLUMNS)}")
+
+    start = time.perf_counter()
+    rollup = CapitalRollup(df, CapitalCube.from_dataframe(df))
+    print(f"Index build (once per upload and year): {time.perf_counter() - start:8.3f}s "
+          f"({len(rollup.group_keys):,} groups)")
+
+    for filters in FILTER_SCENARIOS:
+        legacy = best_time(lambda: legacy_filter(df, filters))
+        indexed = best_time(lambda: rollup_filter(rollup, filters))
+
+        expected = legacy_filter(df, filters)
+        actual = rollup.totals(filters)
+        for key, value in expected.items():
+            assert np.isclose(value, actual[key]), key
+
+        label = ', '.join(f"{col}={value}" for col, value in filters.items()) or 'no filters'
+        print(f"{label}")
+        print(f"  legacy copy + filter: {legacy * 1e3:8.2f}ms")
+        print(f"  group-by partials:    {indexed * 1e3:8.2f}ms  ({legacy / indexed:.1f}x)")
+
+    print("✅ Partials match the legacy filtered metrics")
+
+
+if __name__ == "__main__":
+    main()
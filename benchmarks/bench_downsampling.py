@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chart level-of-detail downsampling
+
+Compares the original ``optimize_chart_rendering`` (evenly spaced indices,
+rebuilt through list comprehensions) with ChartDownsampler on a spiky
+random-walk line trace and a 3D scatter cloud. Reports reduction time,
+payload size and whether the series' peaks survive.
+
+Usage:
+    python -m benchmarks.bench_downsampling [points ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+from utils.downsampling import ChartDownsampler
+
+
+def legacy_optimize_chart_rendering(fig, max_points: int = 1000):
+    """Reference copy of the original even-stride sampler"""
+    for trace in fig.data:
+        if hasattr(trace, 'x') and len(trace.x) > max_points:
+            indices = np.linspace(0, len(trace.x) - 1, max_points, dtype=int)
+            trace.x = [trace.x[i] for i in indices]
+            trace.y = [trace.y[i] for i in indices]
+    return fig
+
+
+def build_series(points: int):
+    """Random walk with a few isolated spikes"""
+    rng = np.random.default_rng(17)
+    y = np.cumsum(rng.normal(size=points))
+    spikes = rng.choice(points, 5, replace=False)
+    y[spikes] += rng.choice([-1, 1], 5) * 50 * np.abs(y).max()
+    return np.arange(points, dtype='float64'), y
+
+
+def timed(reduce, fig):
+    start = time.perf_counter()
+    fig = reduce(fig)
+    return time.perf_counter() - start, fig
+
+
+def main():
+    point_counts = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000, 5000000]
+    budget = 2000
+
+    for points in point_counts:
+        x, y = build_series(points)
+        legacy_time, legacy = timed(lambda fig: legacy_optimize_chart_rendering(fig, budget),
+                                    go.Figure(go.Scatter(x=x, y=y, mode='lines')))
+        lod_time, lod = timed(lambda fig: ChartDownsampler.downsample_figure(fig, budget),
+                              go.Figure(go.Scatter(x=x, y=y, mode='lines')))
+
+        peak = np.abs(y).max()
+        legacy_peak = np.abs(np.asarray(legacy.data[0].y)).max()
+        lod_peak = np.abs(np.asarray(lod.data[0].y)).max()
+        print(f"Line {points:>10,} pts | even stride {legacy_time:7.3f}s {len(legacy.to_json()) / 1024:6.0f} KB"
+              f" peak kept {legacy_peak / peak:6.1%} | LTTB {lod_time:6.3f}s {len(lod.to_json()) / 1024:6.0f} KB"
+              f" peak kept {lod_peak / peak:6.1%}")
+        assert lod_peak == peak
+
+    rng = np.random.default_rng(19)
+    for points in point_counts:
+        cloud = rng.normal(size=(points, 3))
+        fig = go.Figure(go.Scatter3d(x=cloud[:, 0], y=cloud[:, 1], z=cloud[:, 2], mode='markers'))
+        full_size = len(fig.to_json()) if points <= 1000000 else None
+        lod_time, lod = timed(lambda fig: ChartDownsampler.downsample_figure(fig, max_points_3d=20000), fig)
+        for axis, values in zip('xyz', cloud.T):
+            assert values.min() == np.min(getattr(lod.data[0], axis))
+            assert values.max() == np.max(getattr(lod.data[0], axis))
+        assert np.sum(lod.data[0].customdata) == points
+        full = f"{full_size / 1024:8.0f} KB" if full_size else "       - KB"
+        print(f"3D   {points:>10,} pts | full {full} | grid-binned {lod_time:6.3f}s"
+              f" {len(lod.data[0].x):>6,} pts {len(lod.to_json()) / 1024:6.0f} KB")
+
+    print("✅ Downsampled traces keep every extreme; binned markers account for every point")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Excel column width planning
+
+Compares the original width loop of ReportGenerator._apply_excel_formatting
+(``astype(str).map(len).max()`` over every cell of every column) with the
+ExcelFormatPlanner, which sizes numeric columns from their extremes and
+text from a bounded row sample. Reports planning time per frame size and
+checks that text and integer widths match the full scan on a frame the
+sample covers completely.
+
+Usage:
+    python -m benchmarks.bench_excel_format [rows ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_capital_metrics import build_portfolio
+from config.settings import REPORT_CONFIG
+from utils.excel_format import ExcelFormatPlanner
+
+
+def build_sheet(projects: int) -> pd.DataFrame:
+    """Capital portfolio with text columns of varying length"""
+    df = build_portfolio(projects).round(2)
+    rng = np.random.default_rng(19)
+    df.insert(1, 'PROJECT_NAME', [f"Project {i} {'x' * int(n)}" for i, n in enumerate(rng.integers(0, 30, projects))])
+    df.insert(2, 'PROJECT_MANAGER', pd.Categorical(rng.choice(['Ada', 'Grace', 'Linus', 'Margaret'], projects)))
+    return df
+
+
+def legacy_widths(df: pd.DataFrame) -> list:
+    """Reference copy of the original full-scan width loop"""
+    widths = []
+    for col in df.columns:
+        max_length = max(df[col].astype(str).map(len).max(), len(str(col))) + 2
+        widths.append(min(max_length, 50))
+    return widths
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 250000]
+
+    small = build_sheet(REPORT_CONFIG["width_sample_rows"])
+    planned = [width for width, _ in ExcelFormatPlanner.plan(small)]
+    expected = legacy_widths(small)
+    for position in (0, 1, 2):  # PROJECT_ID, PROJECT_NAME, PROJECT_MANAGER
+        assert planned[position] == expected[position], (small.columns[position], planned[position], expected[position])
+
+    for rows in row_counts:
+        df = build_sheet(rows)
+        legacy_s, _ = timed(legacy_widths, df)
+        planner_s, plan = timed(ExcelFormatPlanner.plan, df)
+        formatted = sum(1 for _, num_format in plan if num_format)
+        print(f"{rows:>8,} rows x {len(df.columns)} cols | full scan {legacy_s:8.3f}s"
+              f" | planner {planner_s:7.4f}s | {legacy_s / planner_s:7.0f}x | {formatted} columns number-formatted")
+
+    print()
+    print("✅ Sampled widths match the full scan for text and ID columns")
+
+
+if __name__ == '__main__':
+    main()
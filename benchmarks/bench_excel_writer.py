@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Excel report export
+
+Compares building a Summary + Project_Details workbook with
+``pd.ExcelWriter`` in a BytesIO (the original report path) with the
+constant-memory StreamingExcelWriter. Reports write time and peak Python
+memory (tracemalloc) beyond the input frame for each row count, and checks
+that both workbooks read back to the same cells. The streaming peak is
+essentially the finished file, which the download needs anyway.
+
+Usage:
+    python -m benchmarks.bench_excel_writer [rows ...]
+"""
+
+import io
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_capital_metrics import build_portfolio
+from utils.excel_writer import StreamingExcelWriter
+
+
+def build_report_frame(projects: int) -> pd.DataFrame:
+    """Synthetic project details with text, date and monthly amount columns"""
+    df = build_portfolio(projects).round(2)
+    rng = np.random.default_rng(17)
+    df.insert(1, 'PROJECT_NAME', [f"Project {i}" for i in range(projects)])
+    df.insert(2, 'START_DATE', pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 700, projects), 'D'))
+    return df
+
+
+def legacy_export(metrics: dict, df: pd.DataFrame) -> bytes:
+    """Reference copy of the original in-memory export"""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        pd.DataFrame([metrics]).to_excel(writer, sheet_name='Summary', index=False)
+        df.to_excel(writer, sheet_name='Project_Details', index=False)
+    return output.getvalue()
+
+
+def streaming_export(metrics: dict, df: pd.DataFrame) -> bytes:
+    with StreamingExcelWriter() as writer:
+        writer.write_frame(writer.add_sheet('Summary'), pd.DataFrame([metrics]))
+        writer.write_frame(writer.add_sheet('Project_Details'), df)
+    return writer.getvalue()
+
+
+def measure(export, *args):
+    """Write time, peak traced memory and output size of one export"""
+    start = time.perf_counter()
+    export(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    data = export(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, data
+
+
+def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or [5000, 20000, 50000]
+
+    for position, rows in enumerate(row_counts):
+        df = build_report_frame(rows)
+        metrics = {'Number of Projects': rows, 'Total Business Allocation': float(df['BUSINESS_ALLOCATION'].sum())}
+
+        legacy = measure(legacy_export, metrics, df)
+        streaming = measure(streaming_export, metrics, df)
+        if position == 0:
+            for sheet in ('Summary', 'Project_Details'):
+                expected = pd.read_excel(io.BytesIO(legacy[2]), sheet_name=sheet)
+                actual = pd.read_excel(io.BytesIO(streaming[2]), sheet_name=sheet)
+                pd.testing.assert_frame_equal(expected, actual)
+
+        print(f"{rows:>8,} rows | legacy {legacy[0]:7.2f}s peak {legacy[1] / 1024**2:7.1f} MB"
+              f" | streaming {streaming[0]:7.2f}s peak {streaming[1] / 1024**2:6.1f} MB"
+              f" | file {len(streaming[2]) / 1024**2:5.1f} MB")
+
+    print()
+    print("✅ Streamed workbooks read back to the same cells as pd.ExcelWriter")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: figure cache
+
+Times a rerun of the 3D P&L and network views with and without the figure
+cache. Each rerun includes the figure build and the spec encoding
+Streamlit performs in st.plotly_chart; a cache hit skips the build,
+downsampling and Plotly validation. Also reports the cache footprint.
+
+Usage:
+    python -m benchmarks.bench_figure_cache [rows] [reruns]
+"""
+
+import sys
+import time
+
+import plotly.io as pio
+import plotly.tools as tools
+
+from utils.figure_cache import FigureCache, cached_figure, figure_cache
+from utils.figures_3d import Chart3DBuilder
+from benchmarks.bench_3d_figures import build_pl_analysis, build_workstreams, category_color
+
+
+def stream(fig):
+    """What st.plotly_chart does with a figure before sending it"""
+    return pio.to_json(tools.return_figure_from_figure_or_data(fig, validate_figure=True), validate=False)
+
+
+def rerun(builders, reruns: int) -> float:
+    """Average time of one rerun drawing every builder's figure"""
+    start = time.perf_counter()
+    for _ in range(reruns):
+        for build in builders:
+            stream(build())
+    return (time.perf_counter() - start) / reruns
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    pl_analysis = build_pl_analysis(rows)
+    workstreams = build_workstreams(rows)
+
+    uncached = [lambda: Chart3DBuilder.pl_profitability(pl_analysis),
+                lambda: Chart3DBuilder.service_line(pl_analysis),
+                lambda: Chart3DBuilder.network(workstreams, category_color)]
+    @cached_figure(lambda: pl_analysis)
+    def pl_profitability():
+        return Chart3DBuilder.pl_profitability(pl_analysis)
+
+    @cached_figure(lambda: pl_analysis)
+    def service_line():
+        return Chart3DBuilder.service_line(pl_analysis)
+
+    @cached_figure(lambda: workstreams)
+    def network():
+        return Chart3DBuilder.network(workstreams, category_color)
+
+    cached = [pl_profitability, service_line, network]
+
+    print(f"Synthetic data: {rows:,} clients and workstreams, {reruns} reruns")
+    baseline = rerun(uncached, reruns)
+    print(f"No figure cache:      {baseline * 1000:8.1f} ms per rerun")
+
+    figure_cache.clear()
+    start = time.perf_counter()
+    rerun(cached, 1)
+    cold = time.perf_counter() - start
+    warm = rerun(cached, reruns)
+    print(f"Figure cache (cold):  {cold * 1000:8.1f} ms")
+    print(f"Figure cache (warm):  {warm * 1000:8.1f} ms per rerun  ({baseline / warm:.1f}x)")
+
+    stats = figure_cache.stats()
+    print(f"Cache: {stats['entries']} entries, {stats['size_mb']:.2f} MB, hit rate {stats['hit_rate']:.0%}")
+
+    small = FigureCache(max_size_mb=1)
+    for position in range(20):
+        small.put(small.make_key('view', position), Chart3DBuilder.service_line(pl_analysis))
+    print(f"1 MB budget after 20 puts: {small.stats()['entries']} entries, "
+          f"{small.stats()['size_mb']:.2f} MB, {small.evictions} evictions")
+
+
+if __name__ == "__main__":
+    main()
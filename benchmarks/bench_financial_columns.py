@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: financial column classification and numeric conversion
+
+Compares the legacy per-column conversion with the batched
+DataLoader.convert_financial_columns on a synthetic wide capital export.
+
+Usage:
+    python -m benchmarks.bench_financial_columns [rows]
+"""
+
+import io
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_CONFIG
+from utils.data_loader import DataLoader
+
+
+def build_wide_csv(rows: int, years=(2024, 2025, 2026)) -> bytes:
+    """Build a CSV resembling a multi-year capital project export"""
+    rng = np.random.default_rng(42)
+    data = {
+        'PROJECT_ID': [f"P{i:06d}" for i in range(rows)],
+        'PROJECT_NAME': [f"Project {i}" for i in range(rows)],
+        'PROJECT_MANAGER': rng.choice(['Alice', 'Bob', 'Carol', 'Dan'], rows),
+        'BUSINESS_ALLOCATION': rng.uniform(1e5, 5e6, rows).round(2),
+    }
+    amount_styles = np.array(['{:,.2f}', '${:,.2f}', '({:,.2f})', '{:.2f}'])
+    
+    for year in years:
+        for month in range(1, 13):
+            for suffix in ('A', 'F', 'CP'):
+                values = rng.uniform(0, 250000, rows)
+                styles = rng.choice(amount_styles, rows, p=[0.7, 0.1, 0.1, 0.1])
+                column = [style.format(value) for style, value in zip(styles, values)]
+                # Sprinkle blanks like real exports
+                for idx in rng.choice(rows, rows // 20, replace=False):
+                    column[idx] = ''
+                data[f"{year}_{month:02d}_{suffix}"] = column
+    
+    return pd.DataFrame(data).to_csv(index=False).encode('utf-8')
+
+
+def legacy_convert(df: pd.DataFrame) -> pd.DataFrame:
+    """Reference copy of the original per-column implementation"""
+    financial_pattern = DATA_CONFIG["numeric_columns_pattern"]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        financial_cols = [col for col in df.columns
+                          if pd.Series([col]).str.contains(financial_pattern, regex=True).any()]
+    
+    for col in financial_cols:
+        df[col] = df[col].astype(str).str.replace(',', '').str.strip()
+        df[col] = df[col].replace('', '0')
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    
+    return df
+
+
+def time_call(func, df: pd.DataFrame, repeat: int = 3) -> float:
+    """Return the best wall-clock time of ``repeat`` runs on fresh copies"""
+    best = float('inf')
+    for _ in range(repeat):
+        frame = df.copy()
+        start = time.perf_counter()
+        func(frame)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    raw = build_wide_csv(rows)
+    df = pd.read_csv(io.BytesIO(raw), keep_default_na=False)
+    
+    print(f"Synthetic file: {rows:,} rows x {len(df.columns)} columns ({len(raw) / 1024**2:.1f} MB)")
+    
+    legacy = time_call(legacy_convert, df)
+    batched = time_call(DataLoader.convert_financial_columns, df)
+    
+    print(f"Legacy per-column conversion: {legacy:8.3f}s")
+    print(f"Batched conversion:           {batched:8.3f}s")
+    print(f"Speedup:                      {legacy / batched:8.1f}x")
+    
+    # Parentheses and currency symbols are only understood by the batched parser
+    converted = DataLoader.convert_financial_columns(df.copy())
+    legacy_df = legacy_convert(df.copy())
+    plain = legacy_df['2026_01_A'] != 0
+    assert np.allclose(converted.loc[plain, '2026_01_A'], legacy_df.loc[plain, '2026_01_A'])
+    print("✅ Results agree with the legacy parser on plain amounts")
+
+
+if __name__ == "__main__":
+    main()
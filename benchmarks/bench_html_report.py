@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: self-contained HTML report size
+
+Builds the capital dashboard charts (monthly trends, total and average
+spend per project, allocation against forecast) and compares three ways of
+embedding them: the original ``fig.to_html(include_plotlyjs='cdn')`` per
+chart (small, but blank without CDN access), the offline equivalent with
+plotly.js inlined in every chart, and the HTMLChartBundle (plotly.js
+once, typed arrays, shared template), plain and gzipped. Checks that every
+typed array decodes back to the values of the downsampled figure.
+
+Usage:
+    python -m benchmarks.bench_html_report [projects ...]
+"""
+
+import base64
+import gzip
+import re
+import sys
+import time
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from benchmarks.bench_capital_metrics import build_portfolio
+from config.constants import CURRENT_YEAR
+from utils.downsampling import ChartDownsampler
+from utils.html_report import HTMLChartBundle
+
+
+def build_figures(projects: int) -> dict:
+    """The charts of the capital HTML report"""
+    df = build_portfolio(projects).round(2)
+    months = [f"{CURRENT_YEAR}_{month:02d}_A" for month in range(1, 13)]
+    df['TOTAL_SPEND'] = df[months].sum(axis=1)
+    df['AVG_SPEND'] = df[months].mean(axis=1)
+    df['PROJECT_NAME'] = [f"Project {i}" for i in range(projects)]
+
+    monthly = df[months].sum().reset_index()
+    monthly.columns = ['Month', 'Spend']
+    return {
+        'monthly_trends': px.line(monthly, x='Month', y='Spend', markers=True),
+        'total_spend': px.bar(df.nlargest(50, 'TOTAL_SPEND'), x='PROJECT_NAME', y='TOTAL_SPEND'),
+        'avg_spend': px.bar(df.nlargest(50, 'AVG_SPEND'), x='PROJECT_NAME', y='AVG_SPEND'),
+        'allocation': px.scatter(df, x='BUSINESS_ALLOCATION', y='TOTAL_SPEND', color='PROJECT_ID'),
+    }
+
+
+def legacy_report(figures: dict, include_plotlyjs) -> str:
+    """Reference copy of the per-chart embedding"""
+    return "".join(figure.to_html(full_html=False, include_plotlyjs=include_plotlyjs) for figure in figures.values())
+
+
+def bundled_report(figures: dict) -> str:
+    bundle = HTMLChartBundle()
+    divs = "".join(bundle.div(figure) for figure in figures.values())
+    return divs + bundle.scripts()
+
+
+def decode(spec: dict) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(spec['bdata']), dtype='<' + spec['dtype'])
+
+
+def check_round_trip(figures: dict):
+    """Every typed array holds exactly the values of the downsampled figure"""
+    bundle = HTMLChartBundle()
+    for figure in figures.values():
+        bundle.div(figure)
+    for figure, embedded in zip(figures.values(), bundle.figures):
+        expected = ChartDownsampler.downsample_figure(go.Figure(figure))
+        for trace, data in zip(expected.data, embedded['data']):
+            for prop in ('x', 'y'):
+                if isinstance(data.get(prop), dict):
+                    np.testing.assert_array_equal(decode(data[prop]), np.asarray(trace[prop], dtype='float64'))
+    assert len(bundle.templates) == 1, bundle.templates.keys()
+
+
+def mb(text) -> float:
+    return len(text.encode('utf-8') if isinstance(text, str) else text) / 1024**2
+
+
+def main():
+    project_counts = [int(arg) for arg in sys.argv[1:]] or [500, 5000, 50000]
+
+    for position, projects in enumerate(project_counts):
+        figures = build_figures(projects)
+        if position == 0:
+            check_round_trip(figures)
+
+        cdn = legacy_report(figures, 'cdn')
+        inline = legacy_report(figures, True)
+        start = time.perf_counter()
+        bundled = bundled_report(figures)
+        elapsed = time.perf_counter() - start
+        compressed = HTMLChartBundle.compress(bundled)
+        payload = re.search(r'id="report-figures">(.*?)</script>', bundled, re.S).group(1)
+
+        print(f"{projects:>7,} projects | cdn {mb(cdn):6.2f} MB (needs network) | inline per chart {mb(inline):6.2f} MB"
+              f" | bundle {mb(bundled):5.2f} MB (data {mb(payload):5.2f}) | gzip {mb(compressed):5.2f} MB"
+              f" | built in {elapsed:.2f}s")
+        assert gzip.decompress(compressed).decode('utf-8') == bundled
+
+    print()
+    print("✅ Typed arrays decode to the charted values; plotly.js and the template are embedded once")
+
+
+if __name__ == '__main__':
+    main()
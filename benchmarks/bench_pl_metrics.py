@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: P&L derived metrics
+
+Compares the legacy column-at-a-time ``calculate_pl_metrics`` (which copies
+the input first) with the fused PLMetrics engine, and a batch of assumption
+scenarios evaluated in one pass versus one call per scenario.
+
+Usage:
+    python -m benchmarks.bench_pl_metrics [clients] [scenarios]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.pl_metrics import PLMetrics, PL_METRICS
+
+
+def build_clients(clients: int) -> pd.DataFrame:
+    """Build a synthetic P&L client book"""
+    rng = np.random.default_rng(3)
+    revenue = rng.uniform(1e5, 2e6, clients)
+    return pd.DataFrame({
+        'Client_Name': [f"Client {i}" for i in range(clients)],
+        'Fund_AUM_USD_Millions': rng.uniform(100, 5000, clients),
+        'Number_of_Funds': rng.integers(1, 30, clients),
+        'Total_Annual_Revenue_USD': revenue,
+        'Fund_Accountants_Required': rng.uniform(0.5, 6, clients).round(1),
+        'Average_Accountant_Salary_USD': rng.uniform(70000, 110000, clients),
+        'Fully_Burdened_Cost_Multiplier': rng.uniform(1.3, 1.5, clients),
+        'Senior_Manager_Time_Percent': rng.uniform(5, 30, clients),
+        'Manager_Hourly_Rate_USD': rng.uniform(120, 200, clients),
+        'Software_License_Cost_USD': rng.uniform(5000, 20000, clients),
+        'Data_Provider_Costs_USD': rng.uniform(5000, 30000, clients),
+        'Cloud_Infrastructure_USD': rng.uniform(2000, 10000, clients),
+    })
+
+
+def legacy_pl_metrics(df: pd.DataFrame, overhead_rate: float = 0.15, annual_hours: float = 2080) -> pd.DataFrame:
+    """Reference copy of the original column-at-a-time implementation"""
+    df_calc = df.copy()
+    df_calc['Total_Direct_Labor_Cost'] = (
+        df_calc['Fund_Accountants_Required'] * df_calc['Average_Accountant_Salary_USD'] *
+        df_calc['Fully_Burdened_Cost_Multiplier']
+    )
+    df_calc['Manager_Oversight_Cost'] = (
+        df_calc['Senior_Manager_Time_Percent'] / 100 * df_calc['Manager_Hourly_Rate_USD'] * annual_hours
+    )
+    df_calc['Total_Technology_Cost'] = (
+        df_calc['Software_License_Cost_USD'] + df_calc['Data_Provider_Costs_USD'] + df_calc['Cloud_Infrastructure_USD']
+    )
+    df_calc['Total_Direct_Costs'] = (
+        df_calc['Total_Direct_Labor_Cost'] + df_calc['Manager_Oversight_Cost'] + df_calc['Total_Technology_Cost']
+    )
+    df_calc['Overhead_Allocation'] = df_calc['Total_Annual_Revenue_USD'] * overhead_rate
+    df_calc['Total_Costs'] = df_calc['Total_Direct_Costs'] + df_calc['Overhead_Allocation']
+    df_calc['Gross_Profit'] = df_calc['Total_Annual_Revenue_USD'] - df_calc['Total_Costs']
+    df_calc['Gross_Margin_Percent'] = (df_calc['Gross_Profit'] / df_calc['Total_Annual_Revenue_USD']) * 100
+    df_calc['Revenue_Per_Fund'] = df_calc['Total_Annual_Revenue_USD'] / df_calc['Number_of_Funds']
+    df_calc['Cost_Per_Fund'] = df_calc['Total_Costs'] / df_calc['Number_of_Funds']
+    df_calc['Profit_Per_Fund'] = df_calc['Gross_Profit'] / df_calc['Number_of_Funds']
+    df_calc['Revenue_Per_AUM_BPS'] = (df_calc['Total_Annual_Revenue_USD'] / (df_calc['Fund_AUM_USD_Millions'] * 1000000)) * 10000
+    df_calc['Cost_Per_AUM_BPS'] = (df_calc['Total_Costs'] / (df_calc['Fund_AUM_USD_Millions'] * 1000000)) * 10000
+    return df_calc
+
+
+def best_time(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    scenario_count = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+    df = build_clients(clients)
+    print(f"Synthetic client book: {clients:,} clients")
+
+    legacy = best_time(lambda: legacy_pl_metrics(df))
+    engine = best_time(lambda: PLMetrics.calculate(df))
+    print(f"Legacy copy + column-at-a-time: {legacy:8.3f}s")
+    print(f"Fused engine (no source copy):  {engine:8.3f}s")
+
+    expected = legacy_pl_metrics(df)
+    actual = PLMetrics.calculate(df)
+    for col in PL_METRICS:
+        assert np.array_equal(expected[col].to_numpy(dtype='float64'), actual[col].to_numpy(dtype='float64'),
+                              equal_nan=True), col
+    print("✅ Engine output is bit-for-bit equal to the legacy implementation")
+
+    rates = np.linspace(0.05, 0.30, scenario_count)
+    scenarios = [PLMetrics.scenario(overhead_rate=rate, annual_hours=hours)
+                 for rate, hours in zip(rates, np.resize([1800, 2080], scenario_count))]
+
+    looped = best_time(lambda: [legacy_pl_metrics(df, s['overhead_rate'], s['annual_hours']) for s in scenarios], 2)
+    batched = best_time(lambda: PLMetrics.calculate_scenarios(df, scenarios), 2)
+    print(f"\n{scenario_count} assumption scenarios")
+    print(f"Legacy, one call per scenario:  {looped:8.3f}s")
+    print(f"Batched scenario pass:          {batched:8.3f}s")
+
+    cube = PLMetrics.calculate_scenarios(df, scenarios)
+    check = legacy_pl_metrics(df, scenarios[-1]['overhead_rate'], scenarios[-1]['annual_hours'])
+    assert np.allclose(cube[-1, :, PL_METRICS.index('Gross_Profit')], check['Gross_Profit'])
+    print("✅ Batched scenarios match per-scenario results")
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,28 @@ FINANCIAL_PATTERNS = {
     "capital_plan": r'^{year}_\d{{2}}_CP$'
 }
 
+# Amount columns of a capital project upload, converted from text to numbers on load
+CAPITAL_FINANCIAL_PATTERN = r'^(20\d{2}_\d{2}_(A|F|CP)(_\d+)?|ALL_PRIOR_YEARS_ACTUALS|BUSINESS_ALLOCATION|CURRENT_EAC|QE_FORECAST_VS_QE_PLAN|FORECAST_VS_BA|YE_RUN|RATE|QE_RUN|RATE_SUPPLEMENTARY)$'
+
+# Columns an upload must have to be analysed
+PL_REQUIRED_COLUMNS = ['Client_Name', 'Fund_Name', 'Total_Annual_Revenue_USD', 'Fund_AUM_USD_Millions']
+COMPETITORS_REQUIRED_COLUMNS = ['Competitor_Name', 'Assets_Under_Administration_USD_Trillions', 'Market_Share_Percent']
+BUSINESS_CASE_REQUIRED_COLUMNS = ['Case_Title', 'Estimated_Investment_USD', 'Expected_Annual_Savings_USD']
+WORKSTREAM_REQUIRED_COLUMNS = ['id', 'name', 'category', 'complexity', 'automation', 'risk', 'investment', 'completion',
+                               'priority', 'description']
+
+# Excel number formats of report columns by naming convention, first match wins:
+# (column pattern, Excel format, equivalent Python format used to size the column)
+EXCEL_COLUMN_FORMATS = [
+    (r'(_USD_Millions|_M)$', '$#,##0.0"M"', '${:,.1f}M'),
+    (r'_USD_Billions$', '$#,##0.00"B"', '${:,.2f}B'),
+    (r'_USD_Trillions$', '$#,##0.00"T"', '${:,.2f}T'),
+    (r'(_USD|_SPEND|_SPEND_YTD|_ACTUALS|_ACTUALS_TO_DATE|_FORECASTS|_CAPITAL_PLAN|_VARIANCE|_UNDERSPEND|_OVERSPEND|_AMOUNT)$'
+     r'|^\d{4}_\d{2}_(A|F|CP)(_\d+)?$'
+     r'|^(ALL_PRIOR_YEARS_ACTUALS|BUSINESS_ALLOCATION|CURRENT_EAC|RUN_RATE_PER_MONTH)$', '$#,##0.00', '${:,.2f}'),
+    (r'(_Percent|_Percentage)$', '0.00"%"', '{:.2f}%'),  # Values are percentage points, e.g. 18.5
+]
+
 # Excel template headers
 CAPITAL_PROJECT_HEADERS = [
     "PROJECT_ID", "PROJECT_NAME", "PORTFOLIO_OBS_LEVEL1", "SUB_PORTFOLIO_OBS_LEVEL2",
@@ -43,6 +65,15 @@ CAPITAL_PROJECT_HEADERS = [
     "CURRENT_EAC", "ALL_PRIOR_YEARS_ACTUALS"
 ]
 
+# Sidebar filters of the capital project dashboards
+CAPITAL_FILTER_COLUMNS = {
+    "PORTFOLIO_OBS_LEVEL1": "Select Portfolio Level",
+    "SUB_PORTFOLIO_OBS_LEVEL2": "Select Sub-Portfolio Level",
+    "PROJECT_MANAGER": "Select Project Manager",
+    "BRS_CLASSIFICATION": "Select BRS Classification",
+    "FUND_DECISION": "Select Fund Decision"
+}
+
 # Score categories
 SCORE_CATEGORIES = {
     "excellent": {"min": 9.0, "color": "#2ca02c", "label": "Excellent (9.0+)"},
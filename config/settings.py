@@ -2,6 +2,8 @@
 Configuration settings for the Fund Administration Platform
 """
 
+import os
+
 # Page Configuration
 PAGE_CONFIG = {
     "page_title": "Operational Workstreams - Fund Administration",
@@ -16,6 +18,23 @@ UPLOAD_CONFIG = {
     "chunk_size": 10000  # For large file processing
 }
 
+# Bulk upload of many files, zip archives and every sheet of a workbook
+BULK_UPLOAD_CONFIG = {
+    "max_workers": int(os.environ.get("BULK_UPLOAD_WORKERS", "0")),  # 0 = one per CPU, at most 8
+    "start_method": os.environ.get("BULK_UPLOAD_START_METHOD", "spawn"),  # Forking a threaded server is unsafe
+    "parallel_min_files": 2,  # Smaller batches are parsed in-process
+    "max_files": 200,
+    "max_total_mb": 2048  # Uncompressed size limit of one batch
+}
+
+# Persistent cache of parsed uploads (shared between restarts and replicas)
+UPLOAD_CACHE_CONFIG = {
+    "enabled": True,
+    "directory": os.environ.get("UPLOAD_CACHE_DIR", ".cache/uploads"),
+    "max_size_mb": int(os.environ.get("UPLOAD_CACHE_MAX_MB", "2048")),
+    "pipeline_version": "2"  # Bump when loader/cleaning logic changes
+}
+
 # Chart Configuration
 CHART_CONFIG = {
     "default_height": 600,
@@ -23,6 +42,42 @@ CHART_CONFIG = {
     "template": "plotly_white"
 }
 
+# Level-of-detail downsampling of large chart traces
+CHART_LOD_CONFIG = {
+    "enabled": True,
+    "max_points": int(os.environ.get("CHART_MAX_POINTS", "5000")),  # 2D points per figure
+    "max_points_3d": int(os.environ.get("CHART_MAX_POINTS_3D", "20000")),  # 3D points per figure
+    "min_trace_points": 200,  # Smallest share of the budget given to one trace
+    "minmax_ratio": 4  # Min/max preselection size for LTTB, as a multiple of the output size
+}
+
+# In-memory cache of rendered figures (JSON), shared by all sessions
+FIGURE_CACHE_CONFIG = {
+    "enabled": True,
+    "max_size_mb": int(os.environ.get("FIGURE_CACHE_MAX_MB", "128"))
+}
+
+# Instrumentation of loaders, metric engines, figures and reports
+PROFILER_CONFIG = {
+    "enabled": os.environ.get("PROFILER_ENABLED", "1") != "0",
+    "slow_operation_s": 5.0,  # Log operations slower than this
+    "max_sessions": 50,  # Per-session statistics kept for the most recent sessions
+    "max_traces": 10,  # Span trees kept per root operation, per session and for the process
+    "max_children": 200,  # Child spans kept per span
+    "export_dir": os.environ.get("PROFILER_EXPORT_DIR", ".cache/profiles"),
+    "export_interval_s": int(os.environ.get("PROFILER_EXPORT_INTERVAL", "0"))  # 0 = export on demand only
+}
+
+# Per-session memory accounting; large frames of idle or over-budget sessions spill to Parquet
+SESSION_MEMORY_CONFIG = {
+    "enabled": os.environ.get("SESSION_MEMORY_ENABLED", "1") != "0",
+    "session_budget_mb": int(os.environ.get("SESSION_MEMORY_BUDGET_MB", "256")),
+    "process_budget_mb": int(os.environ.get("SESSION_MEMORY_PROCESS_BUDGET_MB", "1024")),
+    "min_spill_mb": 1,  # Smaller frames always stay in memory
+    "spill_dir": os.environ.get("SESSION_SPILL_DIR", ".cache/session_spill"),
+    "stale_run_s": 1800  # A run this old without finishing no longer protects its session
+}
+
 # Data Processing
 DATA_CONFIG = {
     "date_formats": ["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y"],
@@ -30,22 +85,105 @@ DATA_CONFIG = {
     "cache_timeout": 3600  # seconds
 }
 
+# Dtype planning of ingested frames
+DTYPE_PLAN_CONFIG = {
+    "enabled": True,
+    "category_max_ratio": 0.5,  # Strings with at most this share of distinct values become categoricals
+    "category_min_rows": 50  # Smaller frames keep plain strings
+}
+
+# Concurrent report jobs and the shared cache of finished artefacts
+REPORT_JOBS_CONFIG = {
+    "enabled": True,
+    "max_workers": int(os.environ.get("REPORT_WORKERS", "4")),
+    "max_size_mb": 256
+}
+
+# Headless report scheduler (python scheduler.py): one input subdirectory per report pack
+REPORT_SCHEDULER_CONFIG = {
+    "input_dir": os.environ.get("REPORT_INPUT_DIR", "data/report_inputs"),
+    "output_dir": os.environ.get("REPORT_OUTPUT_DIR", "data/report_packs"),
+    "schedule": os.environ.get("REPORT_SCHEDULE", "0 5 * * *"),  # cron: minute hour day month weekday
+    "max_workers": int(os.environ.get("REPORT_SCHEDULER_WORKERS", "2")),
+    "start_method": os.environ.get("REPORT_SCHEDULER_START_METHOD", "spawn"),
+    "poll_interval_s": 30  # Longest sleep between checks for the next run or a stop request
+}
+
 # Report Generation
 REPORT_CONFIG = {
     "excel_engine": "xlsxwriter",
     "date_format": "%Y-%m-%d %H:%M:%S",
-    "currency_format": "${:,.2f}"
+    "currency_format": "${:,.2f}",
+    "excel_chunk_rows": 5000,  # Rows converted to cells at a time by the streaming writer
+    "excel_spool_mb": 32,  # Finished workbooks larger than this are kept on disk until downloaded
+    "width_sample_rows": 1000,  # Rows sampled to size text columns
+    "max_column_width": 50,
+    "html_min_typed_array": 8,  # Shorter numeric arrays stay plain JSON in HTML reports
+    "html_gzip": os.environ.get("REPORT_HTML_GZIP", "0") != "0",  # Offer HTML reports as .html.gz
+    "gzip_level": 9
+}
+
+# P&L cost model assumptions (per-scenario overrides go through PLMetrics)
+PL_CONFIG = {
+    "overhead_rate": 0.15,         # share of revenue allocated as overhead
+    "annual_hours": 2080,          # manager hours per year
+    "burden_multiplier": None      # None uses each client's Fully_Burdened_Cost_Multiplier
 }
 
 # Business Case Scoring
+# Each category score is the weighted sum of its terms, optionally capped.
+# A term reads ``column`` (``default`` when the column is absent), optionally
+# subtracts ``minus`` = [column, default], then applies ``steps`` in order:
+#   div/mul/sub: v / x, v * x, v - x      rsub: x - v
+#   cap: min(v, x)    floor: max(v, x)    floor_missing: max(x, v), NaN -> x
 SCORING_CONFIG = {
     "weights": {
-        "financial": 0.25,
-        "strategic": 0.20,
+        "financial": 0.30,
+        "strategic": 0.25,
         "feasibility": 0.20,
-        "impact": 0.20,
-        "resource": 0.15
+        "impact": 0.15,
+        "resource": 0.10
+    },
+    "categories": {
+        "financial": {
+            "terms": [
+                {"column": "ROI_Percentage", "default": 0, "weight": 0.6,
+                 "steps": [["div", 50], ["mul", 10], ["cap", 10]]},
+                {"column": "Payback_Period_Months", "default": 60, "weight": 0.4,
+                 "steps": [["div", 6], ["rsub", 10], ["floor", 0]]}
+            ]
+        },
+        "strategic": {
+            "terms": [
+                {"column": "Strategic_Alignment_Score", "default": 5, "weight": 0.7},
+                {"column": "Client_Impact_Score", "default": 5, "weight": 0.3}
+            ]
+        },
+        "feasibility": {
+            "terms": [
+                {"column": "Technology_Complexity_Score", "default": 5, "weight": 0.5,
+                 "steps": [["rsub", 10], ["div", 10], ["mul", 10]]},
+                {"column": "Implementation_Risk_Score", "default": 5, "weight": 0.5,
+                 "steps": [["rsub", 10], ["div", 10], ["mul", 10]]}
+            ]
+        },
+        "impact": {
+            "cap": 10,
+            "terms": [
+                {"column": "Target_Process_Efficiency", "default": 5, "weight": 0.6,
+                 "minus": ["Current_Process_Efficiency", 5]},
+                {"column": "Current_Error_Rate_Percent", "default": 0, "weight": 0.4,
+                 "minus": ["Target_Error_Rate_Percent", 0], "steps": [["floor_missing", 0]]}
+            ]
+        },
+        "resource": {
+            "terms": [
+                {"column": "Current_FTE_Count", "default": 0, "weight": 1.0,
+                 "minus": ["Target_FTE_Count", 0], "steps": [["floor_missing", 0], ["mul", 2], ["cap", 10]]}
+            ]
+        }
     },
+    "qualification_score": 70,
     "thresholds": {
         "high": 8.0,
         "medium": 6.0,
@@ -10,6 +10,7 @@ sys.path.insert(0, str(project_root))
 from config.settings import PAGE_CONFIG, SESSION_KEYS
 from config.constants import CURRENT_YEAR
 from utils.data_loader import SessionStateManager
+from utils.session_memory import session_memory
 
 # Import modules
 from modules.capital_projects import CapitalProjects
@@ -17,6 +18,7 @@ from modules.workstream_management import WorkstreamManagement
 from modules.pl_analysis import PLAnalysis  
 from modules.competitors import CompetitorsAnalysis
 from modules.business_cases import BusinessCases
+from modules.performance import PerformanceDashboard
 
 
 class FundAdministrationApp:
@@ -35,6 +37,7 @@ class FundAdministrationApp:
         """Initialize session state variables"""
         SessionStateManager.initialize_session_state()
         SessionStateManager.load_workstream_data()
+        session_memory.restore()
     
     def setup_modules(self):
         """Initialize feature modules"""
@@ -43,7 +46,8 @@ class FundAdministrationApp:
             "💰 Capital Projects": CapitalProjects(),
             "📊 P&L Analysis": PLAnalysis(),
             "🏆 Competitors Analysis": CompetitorsAnalysis(), 
-            "💼 Business Cases": BusinessCases()
+            "💼 Business Cases": BusinessCases(),
+            "⏱️ Performance": PerformanceDashboard()
         }
     
     def render_sidebar_navigation(self):
@@ -67,7 +71,8 @@ class FundAdministrationApp:
             "💰 Capital Projects": "Capital project portfolio tracking and variance analysis", 
             "📊 P&L Analysis": "Profit & Loss analysis with comparative metrics",
             "🏆 Competitors Analysis": "Competitive positioning and market analysis",
-            "💼 Business Cases": "Business case development and scoring system"
+            "💼 Business Cases": "Business case development and scoring system",
+            "⏱️ Performance": "Operation timings, cache hit rates and memory use"
         }
         
         for module, description in module_descriptions.items():
@@ -153,6 +158,10 @@ def main():
     except Exception as e:
         st.error(f"Critical application error: {str(e)}")
         st.stop()
+    finally:
+        # Account this session's memory and spill idle or over-budget data, also after
+        # st.rerun(), st.stop() or an error ended the run early
+        session_memory.enforce()
 
 
 if __name__ == "__main__":
@@ -7,11 +7,13 @@ from .capital_projects import CapitalProjects
 from .pl_analysis import PLAnalysis
 from .competitors import CompetitorsAnalysis
 from .business_cases import BusinessCases
+from .performance import PerformanceDashboard
 
 __all__ = [
     'WorkstreamManagement',
     'CapitalProjects', 
     'PLAnalysis',
     'CompetitorsAnalysis',
-    'BusinessCases'
+    'BusinessCases',
+    'PerformanceDashboard'
 ]
\ No newline at end of file
@@ -10,6 +10,8 @@ from typing import Dict, Any, Optional, List
 from utils.data_loader import DataLoader, SessionStateManager
 from utils.validators import DataValidator, InputSanitizer
 from utils.report_generator import ReportGenerator
+from utils.filter_index import FilterIndex
+from utils.downsampling import ChartDownsampler
 from config.settings import PAGE_CONFIG
 from config.constants import ERROR_MESSAGES, SUCCESS_MESSAGES
 
@@ -52,6 +54,10 @@ class BaseModule(ABC):
         """Display info message"""
         st.info(f"ℹ️ {message}")
     
+    def render_chart(self, fig, **kwargs):
+        """Render a Plotly figure, downsampled to the configured point budget"""
+        return ChartDownsampler.render(fig, **kwargs)
+    
     def create_file_uploader(self, label: str, file_types: List[str] = None, 
                            help_text: str = None) -> Optional[Any]:
         """Create standardized file uploader"""
@@ -93,24 +99,18 @@ class BaseModule(ABC):
         if uploaded_file is None:
             return pd.DataFrame()
         
-        # Load data
+        # Load data (column names are cleaned and financial columns
+        # converted chunk by chunk while the file is streamed in)
         df = self.data_loader.load_uploaded_file(uploaded_file)
         
         if df.empty:
             return df
         
-        # Clean column names
-        df.columns = [self.data_loader.clean_column_name(col) for col in df.columns]
-        df.columns = self.data_loader.handle_duplicate_columns(df.columns.tolist())
-        
         # Validate required columns
         if required_columns:
             if not self.validator.validate_required_columns(df, required_columns, self.module_name):
                 return pd.DataFrame()
         
-        # Convert financial columns
-        df = self.data_loader.convert_financial_columns(df)
-        
         self.show_success(SUCCESS_MESSAGES["data_processed"])
         return df
     
@@ -137,10 +137,11 @@ class BaseModule(ABC):
             
         st.sidebar.header(f"Filter {self.module_name}")
         filters = {}
+        filter_index = self.get_filter_index(df)
         
         for col_name, display_name in filter_columns.items():
             if col_name in df.columns:
-                unique_values = ['All'] + sorted(df[col_name].dropna().unique().tolist())
+                unique_values = ['All'] + filter_index.options(col_name)
                 filters[col_name] = st.sidebar.selectbox(display_name, unique_values)
             else:
                 st.sidebar.warning(f"Column '{col_name}' not found")
@@ -148,18 +149,16 @@ class BaseModule(ABC):
         
         return filters
     
+    def get_filter_index(self, df: pd.DataFrame) -> FilterIndex:
+        """Return the shared filter index of ``df``, built once per dataset"""
+        return FilterIndex.for_frame(df)
+    
     def apply_filters(self, df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
-        """Apply filters to dataframe"""
+        """Apply filters to dataframe by ANDing cached per-value bitmaps"""
         if df.empty or not filters:
             return df
-            
-        filtered_df = df.copy()
-        
-        for col_name, selected_value in filters.items():
-            if selected_value != 'All' and col_name in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df[col_name] == selected_value]
         
-        return filtered_df
+        return self.get_filter_index(df).select(filters)
     
     def handle_empty_data(self, df: pd.DataFrame, message: str = None) -> bool:
         """Handle empty dataframe case"""
@@ -185,7 +184,16 @@ class BaseModule(ABC):
             st.metric("Columns", len(df.columns))
         with col3:
             memory_usage = df.memory_usage(deep=True).sum() / 1024**2
-            st.metric("Memory Usage", f"{memory_usage:.1f} MB")
+            plan = df.attrs.get('dtype_plan')
+            if plan and plan['columns']:
+                # Footprint as loaded vs. after dtype planning at ingestion
+                loaded = plan['before_bytes'] / 1024**2
+                st.metric("Memory Usage", f"{memory_usage:.1f} MB",
+                          delta=f"{memory_usage - loaded:+.1f} MB vs {loaded:.1f} MB as loaded",
+                          delta_color="inverse",
+                          help=f"{len(plan['columns'])} columns stored in narrower types")
+            else:
+                st.metric("Memory Usage", f"{memory_usage:.1f} MB")
         
         # Show data
         display_df = df.head(max_rows) if len(df) > max_rows else df
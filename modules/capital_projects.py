@@ -4,15 +4,22 @@ Capital Projects Analysis Module
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import html
 import io
 import re
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
 from .base import BaseModule
-from config.constants import CURRENT_YEAR, CURRENT_MONTH, CURRENT_YEAR_STR, CAPITAL_PROJECT_HEADERS
+from utils.capital_metrics import CapitalMetrics
+from utils.capital_cube import CapitalCube, CapitalTimeSeries
+from utils.capital_rollup import CapitalRollup
+from utils.report_jobs import ReportArtefact, report_pipeline
+from config.constants import (CURRENT_YEAR, CURRENT_MONTH, CURRENT_YEAR_STR, CAPITAL_PROJECT_HEADERS,
+                              CAPITAL_FILTER_COLUMNS)
 from config.settings import CHART_CONFIG, REPORT_CONFIG
 
 
@@ -21,6 +28,8 @@ class CapitalProjects(BaseModule):
     
     def __init__(self):
         super().__init__("Capital Projects")
+        self.analysis_year = CURRENT_YEAR
+        self.analysis_month = CURRENT_MONTH
         
     def render(self):
         """Render the Capital Projects module"""
@@ -37,14 +46,19 @@ class CapitalProjects(BaseModule):
         )
         
         if uploaded_file is not None:
-            # Reset reports flag
-            st.session_state.reports_ready = False
+            # Reports are prepared again for each new upload, not on every rerun
+            upload_id = getattr(uploaded_file, 'file_id', uploaded_file.name)
+            if st.session_state.get('capital_reports_upload') != upload_id:
+                st.session_state.capital_reports_upload = upload_id
+                st.session_state.reports_ready = False
             
             # Process data
             df = self.process_capital_project_data(uploaded_file)
             
             if not self.handle_empty_data(df):
-                self.render_dashboard(df)
+                time_series = self._get_time_series(df, uploaded_file)
+                df, cube = self._select_analysis_year(df, time_series)
+                self.render_dashboard(df, cube, time_series)
         else:
             self.show_info("Upload your Capital Project CSV or Excel file to get started!")
     
@@ -69,92 +83,74 @@ class CapitalProjects(BaseModule):
     def _calculate_derived_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate derived metrics for capital projects"""
         try:
-            # Get monthly columns
-            monthly_cols = self.data_loader.get_monthly_columns(df, CURRENT_YEAR)
-            
-            # Calculate totals
-            df[f'TOTAL_{CURRENT_YEAR}_ACTUALS'] = df[monthly_cols['actuals']].sum(axis=1) if monthly_cols['actuals'] else 0
-            df[f'TOTAL_{CURRENT_YEAR}_FORECASTS'] = df[monthly_cols['forecasts']].sum(axis=1) if monthly_cols['forecasts'] else 0
-            df[f'TOTAL_{CURRENT_YEAR}_CAPITAL_PLAN'] = df[monthly_cols['capital_plan']].sum(axis=1) if monthly_cols['capital_plan'] else 0
-            
-            # Calculate YTD actuals
-            ytd_actual_cols = [col for col in monthly_cols['actuals'] 
-                             if int(col.split('_')[1]) <= CURRENT_MONTH]
-            df['SUM_ACTUAL_SPEND_YTD'] = df[ytd_actual_cols].sum(axis=1) if ytd_actual_cols else 0
-            
-            # Calculate total actuals to date
-            if 'ALL_PRIOR_YEARS_ACTUALS' in df.columns:
-                df['TOTAL_ACTUALS_TO_DATE'] = df['ALL_PRIOR_YEARS_ACTUALS'] + df[f'TOTAL_{CURRENT_YEAR}_ACTUALS']
-            else:
-                df['TOTAL_ACTUALS_TO_DATE'] = df[f'TOTAL_{CURRENT_YEAR}_ACTUALS']
-                self.show_warning("Column 'ALL_PRIOR_YEARS_ACTUALS' not found.")
-            
-            # Calculate run rates and averages
-            df['RUN_RATE_PER_MONTH'] = (df[f'TOTAL_{CURRENT_YEAR}_ACTUALS'] + df[f'TOTAL_{CURRENT_YEAR}_FORECASTS']) / 12
-            
-            num_actual_months = len(ytd_actual_cols) if ytd_actual_cols else 1
-            num_forecast_months = len(monthly_cols['forecasts']) if monthly_cols['forecasts'] else 1
-            
-            df['AVG_ACTUAL_SPEND'] = df['SUM_ACTUAL_SPEND_YTD'] / num_actual_months
-            df['AVG_FORECAST_SPEND'] = df[f'TOTAL_{CURRENT_YEAR}_FORECASTS'] / num_forecast_months
-            
-            # Calculate variances
-            if 'BUSINESS_ALLOCATION' in df.columns:
-                df['CAPITAL_VARIANCE'] = df['BUSINESS_ALLOCATION'] - df[f'TOTAL_{CURRENT_YEAR}_FORECASTS']
-                df['CAPITAL_UNDERSPEND'] = df['CAPITAL_VARIANCE'].apply(lambda x: x if x > 0 else 0)
-                df['CAPITAL_OVERSPEND'] = df['CAPITAL_VARIANCE'].apply(lambda x: abs(x) if x < 0 else 0)
-            else:
-                df['CAPITAL_VARIANCE'] = 0
-                df['CAPITAL_UNDERSPEND'] = 0
-                df['CAPITAL_OVERSPEND'] = 0
-                self.show_warning("Column 'BUSINESS_ALLOCATION' not found.")
-            
-            df['NET_REALLOCATION_AMOUNT'] = df['CAPITAL_UNDERSPEND'] - df['CAPITAL_OVERSPEND']
-            df['TOTAL_SPEND_VARIANCE'] = df[f'TOTAL_{CURRENT_YEAR}_ACTUALS'] - df[f'TOTAL_{CURRENT_YEAR}_FORECASTS']
-            
-            # Calculate monthly variance scores
-            monthly_variance_cols = []
-            for i in range(1, 13):
-                actual_col = f'{CURRENT_YEAR}_{i:02d}_A'
-                forecast_col = f'{CURRENT_YEAR}_{i:02d}_F'
-                if actual_col in df.columns and forecast_col in df.columns:
-                    variance_col = f'{CURRENT_YEAR}_{i:02d}_AF_VARIANCE'
-                    df[variance_col] = df[actual_col] - df[forecast_col]
-                    monthly_variance_cols.append(variance_col)
-            
-            df['AVERAGE_MONTHLY_SPREAD_SCORE'] = df[monthly_variance_cols].abs().mean(axis=1) if monthly_variance_cols else 0
-            
-            return df
+            return CapitalMetrics.calculate(df, CURRENT_YEAR, CURRENT_MONTH, on_warning=self.show_warning)
             
         except Exception as e:
             self.show_error(f"Error calculating derived metrics: {str(e)}")
             return df
     
-    def render_dashboard(self, df: pd.DataFrame):
+    def _get_time_series(self, df: pd.DataFrame, uploaded_file) -> CapitalTimeSeries:
+        """Return the multi-year index of the uploaded portfolio, built once per upload"""
+        series_key = (getattr(uploaded_file, 'file_id', None) or uploaded_file.name, len(df))
+        cached = st.session_state.get('capital_time_series')
+        
+        if cached is None or cached[0] != series_key:
+            cached = (series_key, CapitalTimeSeries(df))
+            st.session_state.capital_time_series = cached
+        
+        return cached[1]
+    
+    def _select_analysis_year(self, df: pd.DataFrame, time_series: CapitalTimeSeries):
+        """Let the user pick an analysis year and return that year's frame and cube"""
+        years = time_series.years
+        if not years:
+            return df, CapitalCube.from_dataframe(df, CURRENT_YEAR)
+        
+        default_year = time_series.default_year()
+        year = st.sidebar.selectbox(
+            "Analysis Year",
+            years,
+            index=years.index(default_year),
+            key="capital_analysis_year"
+        )
+        
+        self.analysis_year = year
+        self.analysis_month = time_series.analysis_month(year)
+        
+        if year == CURRENT_YEAR:
+            # The processed upload already carries current-year metrics
+            return df, time_series.cube(year)
+        
+        return time_series.frame_for_year(year), time_series.cube(year)
+    
+    def render_dashboard(self, df: pd.DataFrame, cube: Optional[CapitalCube] = None,
+                         time_series: Optional[CapitalTimeSeries] = None):
         """Render the main dashboard"""
-        # Sidebar filters
-        filters = self.create_sidebar_filters(df, {
-            "PORTFOLIO_OBS_LEVEL1": "Select Portfolio Level",
-            "SUB_PORTFOLIO_OBS_LEVEL2": "Select Sub-Portfolio Level", 
-            "PROJECT_MANAGER": "Select Project Manager",
-            "BRS_CLASSIFICATION": "Select BRS Classification",
-            "FUND_DECISION": "Select Fund Decision"
-        })
-        
-        # Apply filters
-        filtered_df = self.apply_filters(df, filters)
+        # Pre-aggregated group-by index of the portfolio, built once per year
+        if cube is None:
+            cube = CapitalCube.from_dataframe(df, self.analysis_year)
+        rollup = (time_series.rollup(self.analysis_year, df) if time_series is not None
+                  else CapitalRollup(df, cube))
+        
+        # Sidebar filters (options come from the rollup frame's shared filter index)
+        filters = self.create_sidebar_filters(rollup.df, CAPITAL_FILTER_COLUMNS)
+        filtered_df, filtered_cube = rollup.select(filters)
         
         if self.handle_empty_data(filtered_df, "No projects match the selected filters."):
             return
         
         # Key metrics
-        self._render_key_metrics(filtered_df)
+        self._render_key_metrics(rollup.totals(filters))
         
         # Project details table
         self._render_project_details(filtered_df)
         
         # Monthly trends
-        self._render_monthly_trends(filtered_df)
+        self._render_monthly_trends(filtered_cube)
+        
+        # Year-over-year comparison when the upload spans several years
+        if time_series is not None and len(time_series.years) > 1:
+            self._render_year_over_year(time_series)
         
         # Variance analysis
         self._render_variance_analysis(filtered_df)
@@ -163,7 +159,7 @@ class CapitalProjects(BaseModule):
         self._render_budget_impact(filtered_df)
         
         # Individual project view
-        self._render_individual_project(filtered_df)
+        self._render_individual_project(filtered_df, filtered_cube)
         
         # Project performance
         self._render_project_performance(filtered_df)
@@ -171,18 +167,18 @@ class CapitalProjects(BaseModule):
         # Report generation
         self._render_report_generation(filtered_df)
     
-    def _render_key_metrics(self, df: pd.DataFrame):
-        """Render key metrics section"""
+    def _render_key_metrics(self, totals: Dict[str, float]):
+        """Render key metrics section from combined group partials"""
         st.subheader("Key Metrics Overview")
         
         metrics = {
-            "Number of Projects": len(df),
-            "Sum Actual Spend (YTD)": f"${df['SUM_ACTUAL_SPEND_YTD'].sum():,.2f}",
-            "Sum Of Forecasted Numbers": f"${df[f'TOTAL_{CURRENT_YEAR}_FORECASTS'].sum():,.2f}",
-            "Average Run Rate / Month": f"${df['RUN_RATE_PER_MONTH'].mean():,.2f}",
-            "Total Potential Underspend": f"${df['CAPITAL_UNDERSPEND'].sum():,.2f}",
-            "Total Potential Overspend": f"${df['CAPITAL_OVERSPEND'].sum():,.2f}",
-            "Net Reallocation Amount": f"${df['NET_REALLOCATION_AMOUNT'].sum():,.2f}"
+            "Number of Projects": totals['count'],
+            "Sum Actual Spend (YTD)": f"${totals['SUM_ACTUAL_SPEND_YTD']:,.2f}",
+            "Sum Of Forecasted Numbers": f"${totals[f'TOTAL_{self.analysis_year}_FORECASTS']:,.2f}",
+            "Average Run Rate / Month": f"${totals['RUN_RATE_PER_MONTH_mean']:,.2f}",
+            "Total Potential Underspend": f"${totals['CAPITAL_UNDERSPEND']:,.2f}",
+            "Total Potential Overspend": f"${totals['CAPITAL_OVERSPEND']:,.2f}",
+            "Net Reallocation Amount": f"${totals['NET_REALLOCATION_AMOUNT']:,.2f}"
         }
         
         self.create_metrics_display(metrics, columns=4)
@@ -194,9 +190,9 @@ class CapitalProjects(BaseModule):
         
         display_cols = [col for col in CAPITAL_PROJECT_HEADERS if col in df.columns]
         display_cols.extend([
-            f'TOTAL_{CURRENT_YEAR}_ACTUALS',
-            f'TOTAL_{CURRENT_YEAR}_FORECASTS', 
-            f'TOTAL_{CURRENT_YEAR}_CAPITAL_PLAN',
+            f'TOTAL_{self.analysis_year}_ACTUALS',
+            f'TOTAL_{self.analysis_year}_FORECASTS', 
+            f'TOTAL_{self.analysis_year}_CAPITAL_PLAN',
             'CAPITAL_UNDERSPEND',
             'CAPITAL_OVERSPEND',
             'AVERAGE_MONTHLY_SPREAD_SCORE'
@@ -215,34 +211,32 @@ class CapitalProjects(BaseModule):
         )
         st.markdown("---")
     
-    def _render_monthly_trends(self, df: pd.DataFrame):
+    def _render_monthly_trends(self, cube: CapitalCube):
         """Render monthly trends chart"""
-        st.subheader(f"{CURRENT_YEAR} Monthly Spend Trends")
+        st.subheader(f"{self.analysis_year} Monthly Spend Trends")
         
         try:
-            # Get monthly data
-            monthly_cols = self.data_loader.get_monthly_columns(df, CURRENT_YEAR)
+            # Portfolio totals per month and measure
+            month_totals = cube.month_totals()
             
             # Prepare data for chart
             trend_data = []
             
             # Add actuals (up to current month)
-            for col in monthly_cols['actuals']:
-                month_num = int(col.split('_')[1])
-                if month_num <= CURRENT_MONTH:
+            for month_num in cube.months_present('A'):
+                if month_num <= self.analysis_month:
                     trend_data.append({
-                        'Month': f'{CURRENT_YEAR}_{month_num:02d}',
-                        'Amount': df[col].sum(),
+                        'Month': f'{self.analysis_year}_{month_num:02d}',
+                        'Amount': month_totals[month_num - 1, 0],
                         'Type': 'Actuals'
                     })
             
             # Add forecasts (from current month + 1)
-            for col in monthly_cols['forecasts']:
-                month_num = int(col.split('_')[1])
-                if month_num > CURRENT_MONTH:
+            for month_num in cube.months_present('F'):
+                if month_num > self.analysis_month:
                     trend_data.append({
-                        'Month': f'{CURRENT_YEAR}_{month_num:02d}',
-                        'Amount': df[col].sum(),
+                        'Month': f'{self.analysis_year}_{month_num:02d}',
+                        'Amount': month_totals[month_num - 1, 1],
                         'Type': 'Forecasts'
                     })
             
@@ -255,13 +249,13 @@ class CapitalProjects(BaseModule):
                     x='Month',
                     y='Amount',
                     color='Type',
-                    title=f'Monthly Capital Trends for {CURRENT_YEAR}',
+                    title=f'Monthly Capital Trends for {self.analysis_year}',
                     markers=True,
                     height=CHART_CONFIG["default_height"]
                 )
                 
                 fig.update_layout(template=CHART_CONFIG["template"])
-                st.plotly_chart(fig, use_container_width=True)
+                self.render_chart(fig, use_container_width=True)
             else:
                 self.show_warning("No monthly trend data available")
                 
@@ -270,6 +264,33 @@ class CapitalProjects(BaseModule):
         
         st.markdown("---")
     
+    def _render_year_over_year(self, time_series: CapitalTimeSeries):
+        """Render portfolio actuals by month for every year in the upload"""
+        st.subheader("📆 Year-over-Year Actuals (Full Portfolio)")
+        
+        try:
+            yoy_df = time_series.year_over_year('A')
+            yoy_df.index.name = 'Month'
+            melted_df = yoy_df.reset_index().melt(id_vars='Month', var_name='Year', value_name='Amount')
+            melted_df['Year'] = melted_df['Year'].astype(str)
+            
+            fig = px.line(
+                melted_df,
+                x='Month',
+                y='Amount',
+                color='Year',
+                markers=True,
+                height=CHART_CONFIG["default_height"]
+            )
+            
+            fig.update_layout(template=CHART_CONFIG["template"])
+            self.render_chart(fig, use_container_width=True)
+            
+        except Exception as e:
+            self.show_error(f"Error creating year-over-year chart: {str(e)}")
+        
+        st.markdown("---")
+    
     def _render_variance_analysis(self, df: pd.DataFrame):
         """Render variance analysis section"""
         st.subheader("🔎 Project Spend Variance Analysis")
@@ -290,7 +311,7 @@ class CapitalProjects(BaseModule):
         with col1:
             st.write("**Total Spend: Actuals vs. Forecast**")
             self._create_variance_chart(variance_df, 
-                                      [f'TOTAL_{CURRENT_YEAR}_ACTUALS', f'TOTAL_{CURRENT_YEAR}_FORECASTS'],
+                                      [f'TOTAL_{self.analysis_year}_ACTUALS', f'TOTAL_{self.analysis_year}_FORECASTS'],
                                       ['Total Actuals', 'Total Forecasts'])
         
         with col2:
@@ -336,7 +357,7 @@ class CapitalProjects(BaseModule):
                 template=CHART_CONFIG["template"]
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_chart(fig, use_container_width=True)
             
         except Exception as e:
             st.error(f"Error creating variance chart: {str(e)}")
@@ -353,7 +374,7 @@ class CapitalProjects(BaseModule):
         with col1:
             st.write("#### Projects with Largest Forecasted Overspend")
             if not overspend_df.empty:
-                display_cols = ['PROJECT_NAME', 'BUSINESS_ALLOCATION', f'TOTAL_{CURRENT_YEAR}_FORECASTS', 'CAPITAL_OVERSPEND']
+                display_cols = ['PROJECT_NAME', 'BUSINESS_ALLOCATION', f'TOTAL_{self.analysis_year}_FORECASTS', 'CAPITAL_OVERSPEND']
                 display_cols = [col for col in display_cols if col in overspend_df.columns]
                 
                 currency_format = {col: "${:,.2f}" for col in display_cols[1:]}
@@ -368,7 +389,7 @@ class CapitalProjects(BaseModule):
         with col2:
             st.write("#### Projects with Largest Potential Underspend")
             if not underspend_df.empty:
-                display_cols = ['PROJECT_NAME', 'BUSINESS_ALLOCATION', f'TOTAL_{CURRENT_YEAR}_FORECASTS', 'CAPITAL_UNDERSPEND']
+                display_cols = ['PROJECT_NAME', 'BUSINESS_ALLOCATION', f'TOTAL_{self.analysis_year}_FORECASTS', 'CAPITAL_UNDERSPEND']
                 display_cols = [col for col in display_cols if col in underspend_df.columns]
                 
                 currency_format = {col: "${:,.2f}" for col in display_cols[1:]}
@@ -389,7 +410,7 @@ class CapitalProjects(BaseModule):
         st.text_area("Add comments for the Budget Impact section:", key="comment_impact")
         st.markdown("---")
     
-    def _render_individual_project(self, df: pd.DataFrame):
+    def _render_individual_project(self, df: pd.DataFrame, cube: CapitalCube):
         """Render individual project detailed view"""
         st.subheader("Individual Project Financials")
         
@@ -401,7 +422,8 @@ class CapitalProjects(BaseModule):
         selected_project = st.selectbox("Select a project for detailed monthly view:", project_names)
         
         if selected_project != 'Select a Project':
-            project_data = df[df['PROJECT_NAME'] == selected_project].iloc[0]
+            project_position = int(np.flatnonzero((df['PROJECT_NAME'] == selected_project).to_numpy())[0])
+            project_data = df.iloc[project_position]
             
             st.write(f"### Details for: {project_data['PROJECT_NAME']}")
             
@@ -415,30 +437,17 @@ class CapitalProjects(BaseModule):
                 st.metric("All Prior Years Actuals", f"${project_data.get('ALL_PRIOR_YEARS_ACTUALS', 0):,.2f}")
             
             # Monthly breakdown
-            self._render_project_monthly_breakdown(project_data)
+            self._render_project_monthly_breakdown(project_data, cube.to_frame(project_position))
         else:
             self.show_info("Select a project from the dropdown to see its detailed monthly financials.")
         
         st.markdown("---")
     
-    def _render_project_monthly_breakdown(self, project_data: pd.Series):
+    def _render_project_monthly_breakdown(self, project_data: pd.Series, monthly_df: pd.DataFrame):
         """Render monthly breakdown for a specific project"""
-        st.write(f"#### {CURRENT_YEAR} Monthly Breakdown:")
+        st.write(f"#### {self.analysis_year} Monthly Breakdown:")
         
         try:
-            # Prepare monthly data
-            monthly_data = {'Month': [f"{CURRENT_YEAR}_{i:02d}" for i in range(1, 13)]}
-            
-            monthly_types = {'_A': 'Actuals', '_F': 'Forecasts', '_CP': 'Capital Plan'}
-            for suffix, name in monthly_types.items():
-                monthly_values = []
-                for i in range(1, 13):
-                    col_name = f'{CURRENT_YEAR}_{i:02d}{suffix}'
-                    monthly_values.append(project_data.get(col_name, 0))
-                monthly_data[name] = monthly_values
-            
-            monthly_df = pd.DataFrame(monthly_data)
-            
             # Display table
             currency_format = {col: "${:,.2f}" for col in ['Actuals', 'Forecasts', 'Capital Plan']}
             st.dataframe(
@@ -461,7 +470,7 @@ class CapitalProjects(BaseModule):
             )
             
             fig.update_layout(template=CHART_CONFIG["template"])
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_chart(fig, use_container_width=True)
             
         except Exception as e:
             self.show_error(f"Error creating monthly breakdown: {str(e)}")
@@ -511,69 +520,69 @@ class CapitalProjects(BaseModule):
             st.session_state.reports_ready = True
         
         if st.session_state.get('reports_ready', False):
-            try:
-                # Generate reports
-                reports = self._generate_reports(df)
-                
-                if reports:
-                    self.create_download_section(reports, "📥 Download Capital Project Reports")
-                    
-            except Exception as e:
-                self.show_error(f"Error generating reports: {str(e)}")
+            comments = {
+                "Spend Variance": st.session_state.get('comment_variance', ''),
+                "Budget Impact": st.session_state.get('comment_impact', ''),
+                "Bottom 5 Projects": st.session_state.get('comment_bottom5', '')
+            }
+            date_stamp = datetime.now().strftime('%Y%m%d')
+            
+            st.markdown("### 📥 Download Capital Project Reports")
+            report_pipeline.render_downloads([
+                ReportArtefact("Capital Project Excel Report", "capital_projects_excel", self._build_excel_report,
+                               (df, self.analysis_year), f"capital_project_report_{date_stamp}.xlsx",
+                               "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+                ReportArtefact("Capital Project HTML Report", "capital_projects_html", self._build_html_report,
+                               (df, self.analysis_year, comments), f"capital_project_report_{date_stamp}.html",
+                               "text/html", compress=REPORT_CONFIG["html_gzip"]),
+            ], key="capital_projects_reports")
+    
+    def _report_metrics(self, df: pd.DataFrame, analysis_year) -> Dict[str, Any]:
+        """Portfolio metrics shown in both reports"""
+        return {
+            "Number of Projects": len(df),
+            "Sum Actual Spend (YTD)": df['SUM_ACTUAL_SPEND_YTD'].sum(),
+            "Sum Of Forecasted Numbers": df[f'TOTAL_{analysis_year}_FORECASTS'].sum(),
+            "Avg Run Rate / Month": df['RUN_RATE_PER_MONTH'].mean(),
+            "Total Potential Underspend": df['CAPITAL_UNDERSPEND'].sum(),
+            "Total Potential Overspend": df['CAPITAL_OVERSPEND'].sum(),
+            "Net Reallocation": df['NET_REALLOCATION_AMOUNT'].sum()
+        }
     
-    def _generate_reports(self, df: pd.DataFrame) -> Dict[str, bytes]:
-        """Generate downloadable reports"""
-        reports = {}
+    def _build_excel_report(self, df: pd.DataFrame, analysis_year) -> bytes:
+        """Build the Excel report (runs on a report worker thread)"""
+        data_sheets = {
+            'Project_Details': df,
+            'Over_Spend_Projects': df[df['CAPITAL_OVERSPEND'] > 0],
+            'Under_Spend_Projects': df[df['CAPITAL_UNDERSPEND'] > 0],
+            'Performance_Rankings': df.sort_values('AVERAGE_MONTHLY_SPREAD_SCORE')
+        }
+        return self.report_generator.write_excel_report(
+            data_sheets, metadata=self._report_metrics(df, analysis_year)
+        ).getvalue()
+    
+    def _build_html_report(self, df: pd.DataFrame, analysis_year, comments: Dict[str, str]) -> str:
+        """Build the HTML report with the analyst comments (runs on a report worker thread)"""
+        html_sections = {
+            "Executive Summary": self._create_html_summary(self._report_metrics(df, analysis_year)),
+            "Key Findings": self._create_html_findings(df)
+        }
+        if any(comment.strip() for comment in comments.values()):
+            html_sections["Analyst Comments"] = self._create_html_comments(comments)
         
-        try:
-            # Prepare data for reports
-            metrics = {
-                "Number of Projects": len(df),
-                "Sum Actual Spend (YTD)": df['SUM_ACTUAL_SPEND_YTD'].sum(),
-                "Sum Of Forecasted Numbers": df[f'TOTAL_{CURRENT_YEAR}_FORECASTS'].sum(),
-                "Avg Run Rate / Month": df['RUN_RATE_PER_MONTH'].mean(),
-                "Total Potential Underspend": df['CAPITAL_UNDERSPEND'].sum(),
-                "Total Potential Overspend": df['CAPITAL_OVERSPEND'].sum(),
-                "Net Reallocation": df['NET_REALLOCATION_AMOUNT'].sum()
-            }
-            
-            # Prepare data sheets
-            data_sheets = {
-                'Project_Details': df,
-                'Over_Spend_Projects': df[df['CAPITAL_OVERSPEND'] > 0],
-                'Under_Spend_Projects': df[df['CAPITAL_UNDERSPEND'] > 0],
-                'Performance_Rankings': df.sort_values('AVERAGE_MONTHLY_SPREAD_SCORE')
-            }
-            
-            # Generate Excel report
-            excel_report = self.report_generator.generate_excel_report(
-                data_sheets,
-                f"capital_project_report_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                metadata=metrics
-            )
-            
-            if excel_report:
-                reports["Capital Project Excel Report"] = excel_report
-            
-            # Generate HTML report (simplified version)
-            html_sections = {
-                "Executive Summary": self._create_html_summary(metrics),
-                "Key Findings": self._create_html_findings(df)
-            }
-            
-            html_report = self.report_generator.generate_html_report(
-                "Capital Project Portfolio Report",
-                html_sections
-            )
-            
-            if html_report:
-                reports["Capital Project HTML Report"] = html_report.encode('utf-8')
-            
-            return reports
-            
-        except Exception as e:
-            self.show_error(f"Error generating reports: {str(e)}")
-            return {}
+        return self.report_generator.generate_html_report(
+            "Capital Project Portfolio Report",
+            html_sections
+        )
+    
+    def _create_html_comments(self, comments: Dict[str, str]) -> str:
+        """Create HTML section of the analyst comments"""
+        comments_html = ""
+        for section, comment in comments.items():
+            if comment.strip():
+                comments_html += f"<h3>{html.escape(section)}</h3>"
+                comments_html += f"<p>{html.escape(comment).replace(chr(10), '<br>')}</p>"
+        return comments_html
     
     def _create_html_summary(self, metrics: Dict[str, Any]) -> str:
         """Create HTML summary section"""
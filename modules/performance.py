@@ -0,0 +1,192 @@
+"""
+Performance Dashboard Module - Timings, cache efficiency and memory of the running app
+"""
+
+import json
+import time
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from utils.derived_cache import DerivedDataCache
+from utils.figure_cache import figure_cache
+from utils.profiler import profiler
+from utils.report_jobs import report_pipeline
+from utils.session_memory import SessionMemory, session_memory
+from utils.upload_cache import upload_cache
+from .base import BaseModule
+
+SCOPES = ["This session", "Process"]
+
+
+class PerformanceDashboard(BaseModule):
+    """Where time and memory go, from the profiler's instrumentation"""
+
+    def __init__(self):
+        super().__init__("Performance")
+
+    def render(self):
+        """Render the Performance Dashboard module"""
+        self.show_header(
+            "⏱️ Performance Dashboard",
+            "Slowest operations, upload pipeline stages, cache efficiency and memory, "
+            "for this session or the whole server process."
+        )
+
+        if not profiler.enabled:
+            self.show_warning("Profiling is disabled (PROFILER_ENABLED=false) - timings are not being recorded")
+
+        scope = st.radio("Scope", SCOPES, horizontal=True, key="perf_scope")
+        session_id = profiler.session_id() if scope == SCOPES[0] else None
+        summary = profiler.summary(session_id)
+
+        self.render_overview(summary)
+        self.render_slowest_operations(summary)
+        self.render_upload_pipeline(session_id)
+        self.render_cache_efficiency(summary)
+        self.render_memory()
+        self.render_export()
+
+    def render_overview(self, summary: pd.DataFrame):
+        """Headline process and session figures"""
+        process_mb = SessionMemory.process_memory_mb()
+        session_mb = SessionMemory.usage()['Size_MB'].sum()
+        self.create_metrics_display({
+            "Process Memory": f"{process_mb:,.0f} MB" if process_mb is not None else "N/A",
+            "Session State": f"{session_mb:,.1f} MB",
+            "Active Sessions": len(profiler.sessions()),
+            "Operations Timed": f"{int(summary['Calls'].sum()):,}",
+            "Time Recorded": f"{summary['Total_s'].sum():,.1f} s",
+            "Profiling Since": datetime.fromtimestamp(profiler.started).strftime('%H:%M:%S'),
+        })
+
+    def render_slowest_operations(self, summary: pd.DataFrame):
+        """Operations ranked by total time, with tail latencies"""
+        st.subheader("🐢 Slowest Operations")
+        if summary.empty:
+            self.show_info("No operations recorded yet - load data or open a chart to start profiling")
+            return
+
+        top = summary.head(15).iloc[::-1]
+        fig = px.bar(top, x='Total_s', y='Operation', orientation='h',
+                     hover_data={'Calls': True, 'Mean_ms': ':.1f', 'P95_ms': ':.1f', 'Max_ms': ':.1f'},
+                     labels={'Total_s': 'Total time (s)', 'Operation': ''})
+        fig.update_layout(height=max(250, 28 * len(top)), margin=dict(l=10, r=10, t=10, b=10))
+        self.render_chart(fig, use_container_width=True)
+
+        st.dataframe(summary, use_container_width=True, hide_index=True, column_config={
+            'Total_s': st.column_config.NumberColumn('Total (s)', format="%.2f"),
+            'Mean_ms': st.column_config.NumberColumn('Mean (ms)', format="%.1f"),
+            'P50_ms': st.column_config.NumberColumn('P50 (ms)', format="%.1f"),
+            'P95_ms': st.column_config.NumberColumn('P95 (ms)', format="%.1f"),
+            'P99_ms': st.column_config.NumberColumn('P99 (ms)', format="%.1f"),
+            'Max_ms': st.column_config.NumberColumn('Max (ms)', format="%.1f"),
+        })
+
+    def render_upload_pipeline(self, session_id):
+        """Stage timeline of a recent upload"""
+        st.subheader("📥 Upload Pipeline")
+        loads = profiler.traces(session_id, prefix="load.")
+        if not loads:
+            self.show_info("No uploads processed yet in this scope")
+            return
+
+        labels = [f"{trace['name']} - {trace['started'][11:19]} ({trace['duration_ms']:,.0f} ms)"
+                  for trace in loads]
+        choice = st.selectbox("Upload", range(len(loads)), format_func=labels.__getitem__, key="perf_upload")
+        stages = profiler.stages(loads[choice])
+        stages['Share'] *= 100
+        stages['Stage'] = ['  ' * depth + name for depth, name in zip(stages['Depth'], stages['Stage'])]
+
+        fig = px.bar(stages, x='Duration_ms', y='Stage', base='Start_ms', orientation='h',
+                     hover_data={'Attributes': True, 'Share': ':.0f'},
+                     labels={'Duration_ms': 'Milliseconds since start', 'Stage': ''})
+        fig.update_yaxes(autorange='reversed')
+        fig.update_layout(height=max(200, 32 * len(stages)), margin=dict(l=10, r=10, t=10, b=10))
+        self.render_chart(fig, use_container_width=True)
+
+        st.dataframe(stages.drop(columns=['Depth']), use_container_width=True, hide_index=True, column_config={
+            'Start_ms': st.column_config.NumberColumn('Start (ms)', format="%.1f"),
+            'Duration_ms': st.column_config.NumberColumn('Duration (ms)', format="%.1f"),
+            'Share': st.column_config.ProgressColumn('Share', format="%.0f%%", min_value=0, max_value=100),
+        })
+
+    def render_cache_efficiency(self, summary: pd.DataFrame):
+        """Hit rates of the upload, derived data, figure and report caches"""
+        st.subheader("🎯 Cache Efficiency")
+        upload = upload_cache.stats()
+        derived = DerivedDataCache.for_session().stats()
+        figures = figure_cache.stats()
+        reports = report_pipeline.stats()
+
+        def hit_rate(stats):
+            total = stats['hits'] + stats['misses']
+            return 100 * stats['hits'] / total if total else 0.0
+
+        caches = pd.DataFrame([
+            {'Cache': 'Uploads (disk, shared)', 'Hits': upload['hits'], 'Misses': upload['misses'],
+             'Hit_Rate': hit_rate(upload), 'Entries': upload['entries'], 'Size_MB': upload['size_mb']},
+            {'Cache': 'Derived data (session)', 'Hits': derived['hits'], 'Misses': derived['misses'],
+             'Hit_Rate': hit_rate(derived), 'Entries': derived['entries'], 'Size_MB': None},
+            {'Cache': 'Figures (memory, shared)', 'Hits': figures['hits'], 'Misses': figures['misses'],
+             'Hit_Rate': hit_rate(figures), 'Entries': figures['entries'], 'Size_MB': figures['size_mb']},
+            {'Cache': 'Reports (memory, shared)', 'Hits': reports['hits'], 'Misses': reports['misses'],
+             'Hit_Rate': hit_rate(reports), 'Entries': reports['entries'], 'Size_MB': reports['size_mb']},
+        ])
+        st.dataframe(caches, use_container_width=True, hide_index=True, column_config={
+            'Hit_Rate': st.column_config.ProgressColumn('Hit Rate', format="%.0f%%", min_value=0, max_value=100),
+            'Size_MB': st.column_config.NumberColumn('Size (MB)', format="%.2f"),
+        })
+
+        st.markdown("#### 🖼️ Figure Payloads")
+        payloads = figure_cache.payloads()
+        if payloads.empty:
+            self.show_info("No figures cached yet")
+            return
+
+        # Per-builder hit rate in this scope: every call opens figure.<name>, misses also figure.<name>.build
+        calls = summary.set_index('Operation')['Calls']
+        payloads['Calls'] = [int(calls.get(f"figure.{name}", 0)) for name in payloads['Figure']]
+        builds = [int(calls.get(f"figure.{name}.build", 0)) for name in payloads['Figure']]
+        payloads['Hit_Rate'] = [100 * (1 - built / total) if total else 0.0
+                                for built, total in zip(builds, payloads['Calls'])]
+        st.dataframe(payloads, use_container_width=True, hide_index=True, column_config={
+            'Total_KB': st.column_config.NumberColumn('Total (KB)', format="%.1f"),
+            'Largest_KB': st.column_config.NumberColumn('Largest (KB)', format="%.1f"),
+            'Hit_Rate': st.column_config.ProgressColumn('Hit Rate', format="%.0f%%", min_value=0, max_value=100),
+        })
+
+    def render_memory(self):
+        """Memory held by each session-state key"""
+        st.subheader("🧠 Session Memory")
+        spill = session_memory.stats()
+        st.caption(f"Budgets: {spill['session_budget_mb']:,.0f} MB per session, {spill['process_budget_mb']:,.0f} MB "
+                   f"across {spill['sessions']} tracked sessions ({spill['tracked_mb']:,.1f} MB in memory). "
+                   f"{spill['spilled_frames']} frames currently spilled to disk; "
+                   f"{spill['spills']} spills and {spill['restores']} reloads since start.")
+        usage = SessionMemory.usage()
+        large = usage[usage['Size_MB'] >= 0.01]
+        if not large.empty:
+            fig = px.bar(large.head(15).iloc[::-1], x='Size_MB', y='Key', orientation='h',
+                         hover_data={'Type': True}, labels={'Size_MB': 'MB', 'Key': ''})
+            fig.update_layout(height=max(200, 28 * min(len(large), 15)), margin=dict(l=10, r=10, t=10, b=10))
+            self.render_chart(fig, use_container_width=True)
+
+        st.dataframe(usage, use_container_width=True, hide_index=True, column_config={
+            'Size_MB': st.column_config.NumberColumn('Size (MB)', format="%.3f"),
+        })
+
+    def render_export(self):
+        """Profile downloads and reset"""
+        st.subheader("📤 Export")
+        col1, col2, col3 = st.columns(3)
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        col1.download_button("⬇️ Profile (JSON)", json.dumps(profiler.to_dict(), indent=2, default=str),
+                             f"profile_{stamp}.json", "application/json")
+        col2.download_button("⬇️ Metrics (Prometheus)", profiler.to_prometheus(),
+                             f"profile_{stamp}.prom", "text/plain")
+        if col3.button("🔄 Reset Statistics", help="Clear the timings of every session in this process"):
+            profiler.reset()
+            st.rerun()
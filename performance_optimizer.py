@@ -4,65 +4,24 @@ Performance optimization utilities for the Fund Administration Platform
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import List, Any, Optional
 from functools import lru_cache
-import time
 import gc
 
-class PerformanceMonitor:
-    """Monitor and optimize application performance"""
-    
-    def __init__(self):
-        self.metrics = {}
-        self.start_time = None
-    
-    def start_timer(self, operation: str):
-        """Start timing an operation"""
-        self.start_time = time.time()
-        self.metrics[operation] = {'start': self.start_time}
-    
-    def end_timer(self, operation: str):
-        """End timing an operation and log duration"""
-        if self.start_time and operation in self.metrics:
-            duration = time.time() - self.start_time
-            self.metrics[operation]['duration'] = duration
-            self.metrics[operation]['end'] = time.time()
-            
-            if duration > 5.0:  # Log slow operations
-                st.warning(f"⚠️ Slow operation detected: {operation} took {duration:.2f}s")
-    
-    def get_performance_summary(self) -> Dict[str, float]:
-        """Get summary of performance metrics"""
-        return {op: data.get('duration', 0) for op, data in self.metrics.items()}
+from utils.downsampling import ChartDownsampler
+from utils.dtype_planner import DtypePlanner
+from utils.profiler import profiler, profiled
+from utils.session_memory import session_memory
 
-# Global performance monitor
-perf_monitor = PerformanceMonitor()
+# Global performance monitor: nested spans with per-session and process-wide
+# p50/p95/p99 statistics (see utils.profiler)
+perf_monitor = profiler
 
-@st.cache_data(ttl=600)  # Cache for 10 minutes
 def optimize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """Optimize DataFrame memory usage and performance"""
     try:
-        # Convert object columns to appropriate types
-        for col in df.select_dtypes(include=['object']):
-            if df[col].nunique() / len(df) < 0.5:  # Low cardinality
-                df[col] = df[col].astype('category')
-        
-        # Convert numeric columns to appropriate types
-        for col in df.select_dtypes(include=['int64']):
-            if df[col].min() >= 0:
-                if df[col].max() < 255:
-                    df[col] = df[col].astype('uint8')
-                elif df[col].max() < 65535:
-                    df[col] = df[col].astype('uint16')
-                else:
-                    df[col] = df[col].astype('uint32')
-        
-        # Convert float columns
-        for col in df.select_dtypes(include=['float64']):
-            df[col] = pd.to_numeric(df[col], downcast='float')
-        
-        return df
+        # Narrowest safe dtype per column; returns a new frame, the input is untouched
+        return DtypePlanner.optimize(df)[0]
     except Exception as e:
         st.warning(f"DataFrame optimization failed: {str(e)}")
         return df
@@ -90,19 +49,11 @@ def batch_process_data(data_list: List[pd.DataFrame],
     
     return results
 
-def optimize_chart_rendering(fig, max_points: int = 1000):
+def optimize_chart_rendering(fig, max_points: int = None):
     """Optimize chart rendering for large datasets"""
     try:
-        # Reduce data points for large datasets
-        if hasattr(fig, 'data') and len(fig.data) > 0:
-            for trace in fig.data:
-                if hasattr(trace, 'x') and len(trace.x) > max_points:
-                    # Sample data points
-                    indices = np.linspace(0, len(trace.x) - 1, max_points, dtype=int)
-                    trace.x = [trace.x[i] for i in indices]
-                    trace.y = [trace.y[i] for i in indices]
-        
-        return fig
+        # LTTB for lines, grid binning for scatters; extremes are always kept
+        return ChartDownsampler.downsample_figure(fig, max_points)
     except Exception as e:
         st.warning(f"Chart optimization failed: {str(e)}")
         return fig
@@ -121,10 +72,9 @@ def memory_usage_optimization():
             # Force garbage collection
             gc.collect()
             
-            # Clear Streamlit cache if needed
+            # Spill the data of idle sessions instead of flushing every session's caches
             if memory_mb > 1000:  # Critical at 1GB
-                st.cache_data.clear()
-                st.cache_resource.clear()
+                session_memory.evict(0, exclude=profiler.session_id())
         
         return memory_mb
     except ImportError:
@@ -140,13 +90,4 @@ def async_data_loading(func: callable):
 # Performance monitoring decorator
 def monitor_performance(operation_name: str):
     """Decorator to monitor function performance"""
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            perf_monitor.start_timer(operation_name)
-            try:
-                result = func(*args, **kwargs)
-                return result
-            finally:
-                perf_monitor.end_timer(operation_name)
-        return wrapper
-    return decorator 
\ No newline at end of file
+    return profiled(operation_name)
@@ -0,0 +1,62 @@
+"""
+Headless report scheduler for the Fund Administration Platform
+
+Rebuilds the capital, P&L, competitor and business-case report packs from
+the files dropped in the input directory, on a cron schedule, so month-end
+packs are ready before anyone opens the dashboard:
+
+    python scheduler.py                  # run at every scheduled time
+    python scheduler.py --once           # build now and exit
+    python scheduler.py --schedule "0 5 1 * *" --input-dir data/report_inputs
+
+Inputs go in one subdirectory per pack (capital/, pl/, competitors/,
+business_cases/); reports are written to <output-dir>/YYYY-MM-DD/<pack>/.
+"""
+
+import argparse
+import logging
+import signal
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import REPORT_SCHEDULER_CONFIG
+from utils.report_scheduler import ReportScheduler
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild report packs from a watched input directory")
+    parser.add_argument("--once", action="store_true", help="build the packs of new or changed inputs now and exit")
+    parser.add_argument("--input-dir", default=REPORT_SCHEDULER_CONFIG["input_dir"])
+    parser.add_argument("--output-dir", default=REPORT_SCHEDULER_CONFIG["output_dir"])
+    parser.add_argument("--schedule", default=REPORT_SCHEDULER_CONFIG["schedule"],
+                        help="cron expression: minute hour day month weekday")
+    parser.add_argument("--workers", type=int, default=REPORT_SCHEDULER_CONFIG["max_workers"])
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Scheduler entry point"""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    scheduler = ReportScheduler(args.input_dir, args.output_dir, args.schedule, args.workers)
+    if args.once:
+        scheduler.create_input_dirs()
+        try:
+            run = scheduler.run_once()
+        finally:
+            scheduler.shutdown()
+        return 1 if run['failed'] else 0
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: scheduler.stop())
+    scheduler.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
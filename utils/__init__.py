@@ -5,6 +5,26 @@ Utility modules for the Fund Administration Platform
 from .data_loader import DataLoader, SessionStateManager
 from .validators import DataValidator, InputSanitizer
 from .report_generator import ReportGenerator, ChartGenerator
+from .upload_cache import UploadCache, cached_upload
+from .capital_cube import CapitalCube
+from .capital_metrics import CapitalMetrics
+from .capital_rollup import CapitalRollup
+from .filter_index import FilterIndex
+from .pl_metrics import PLMetrics
+from .derived_cache import DerivedDataCache
+from .business_case_scoring import BusinessCaseScorer, ScoringModel
+from .figures_3d import Chart3DBuilder
+from .downsampling import ChartDownsampler
+from .figure_cache import FigureCache, cached_figure
+from .profiler import Profiler, profiled
+from .session_memory import SessionMemory, SpilledFrame
+from .dtype_planner import DtypePlanner
+from .bulk_loader import BulkLoader, bulk_loader
+from .excel_writer import StreamingExcelWriter
+from .excel_format import ExcelFormatPlanner
+from .html_report import HTMLChartBundle
+from .report_jobs import ReportArtefact, ReportPipeline, report_pipeline
+from .report_scheduler import CronSchedule, ReportScheduler
 
 __all__ = [
     'DataLoader',
@@ -12,5 +32,34 @@ __all__ = [
     'DataValidator',
     'InputSanitizer',
     'ReportGenerator',
-    'ChartGenerator'
+    'ChartGenerator',
+    'UploadCache',
+    'cached_upload',
+    'CapitalCube',
+    'CapitalMetrics',
+    'CapitalRollup',
+    'FilterIndex',
+    'BusinessCaseScorer',
+    'ScoringModel',
+    'PLMetrics',
+    'DerivedDataCache',
+    'Chart3DBuilder',
+    'ChartDownsampler',
+    'FigureCache',
+    'cached_figure',
+    'Profiler',
+    'profiled',
+    'SessionMemory',
+    'SpilledFrame',
+    'DtypePlanner',
+    'BulkLoader',
+    'bulk_loader',
+    'StreamingExcelWriter',
+    'ExcelFormatPlanner',
+    'HTMLChartBundle',
+    'ReportArtefact',
+    'ReportPipeline',
+    'report_pipeline',
+    'CronSchedule',
+    'ReportScheduler'
 ]
\ No newline at end of file
@@ -0,0 +1,298 @@
+"""
+Parallel ingestion of upload batches: many files, zip archives and every workbook sheet
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import PurePosixPath
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import BULK_UPLOAD_CONFIG, UPLOAD_CONFIG
+from .dtype_planner import DtypePlanner
+from .profiler import profiler
+from .upload_cache import upload_cache
+
+logger = logging.getLogger(__name__)
+
+REPORT_COLUMNS = ['Source', 'Sheet', 'Rows', 'Columns', 'Seconds', 'Status', 'Error']
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xls')
+
+
+def _part(source: str, sheet: Optional[str], frame: Optional[pd.DataFrame] = None, status: Optional[str] = None,
+          error: Optional[str] = None, seconds: float = 0.0) -> dict:
+    """One parsed sheet (or failed file) of a batch, with its report fields"""
+    if status is None:
+        status = 'failed' if error else ('loaded' if frame is not None and len(frame) else 'empty')
+    return {
+        'Source': source,
+        'Sheet': sheet,
+        'Rows': len(frame) if frame is not None else 0,
+        'Columns': len(frame.columns) if frame is not None else 0,
+        'Seconds': round(seconds, 3),
+        'Status': status,
+        'Error': error,
+        'frame': frame,
+    }
+
+
+def _sheet_names(buffer: io.BytesIO, extension: str) -> List[str]:
+    if extension == '.xlsx':
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(buffer, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+    return list(pd.ExcelFile(buffer).sheet_names)
+
+
+def _read(buffer: io.BytesIO, extension: str, sheet: Optional[str], clean: bool) -> pd.DataFrame:
+    buffer.seek(0)
+    if clean:
+        from .data_loader import DataLoader
+
+        chunks = [chunk for chunk, _ in DataLoader.iter_file_chunks(buffer, sheet=0 if sheet is None else sheet)]
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    if extension == '.csv':
+        return pd.read_csv(buffer)
+    return pd.read_excel(buffer, sheet_name=sheet)
+
+
+def parse_source(name: str, data: bytes, clean: bool = False, all_sheets: bool = True) -> List[dict]:
+    """Parse one file into a frame per sheet; runs in a worker process, so errors are returned, not raised"""
+    extension = PurePosixPath(name).suffix.lower()
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    try:
+        sheets = _sheet_names(buffer, extension) if extension in WORKBOOK_EXTENSIONS else [None]
+    except Exception as e:
+        return [_part(name, None, error=f"Could not open file: {e}")]
+
+    parts = []
+    for sheet in (sheets if all_sheets else sheets[:1]):
+        started = time.perf_counter()
+        try:
+            frame = _read(buffer, extension, sheet, clean)
+            parts.append(_part(name, sheet, frame=frame, seconds=time.perf_counter() - started))
+        except Exception as e:
+            parts.append(_part(name, sheet, error=str(e) or type(e).__name__, seconds=time.perf_counter() - started))
+    return parts
+
+
+class BulkLoader:
+    """Load a batch of uploads into one DataFrame.
+
+    Zip archives are unpacked and, optionally, every sheet of a workbook is
+    read. Files are parsed in a process pool shared by all sessions, so a
+    batch of workbooks uses every core instead of one GIL-bound thread;
+    small batches are parsed in-process. Each file's frame is kept in the
+    upload cache, so re-uploading a batch with one changed file only parses
+    that file. The parts are stacked with a single concat, and a file that
+    fails is reported without aborting the rest of the batch. Sheets that
+    are not data of the batch (e.g. a template's instructions sheet) are
+    reported as skipped instead of being stacked.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: Optional[str] = None):
+        configured = max_workers or BULK_UPLOAD_CONFIG["max_workers"]
+        self.max_workers = configured if configured > 0 else min(8, os.cpu_count() or 1)
+        self.start_method = start_method or BULK_UPLOAD_CONFIG["start_method"]
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def expand(uploads: Iterable) -> Tuple[List[Tuple[str, bytes]], List[dict]]:
+        """Named contents of every file in the uploads, zip archives unpacked, and the entries skipped"""
+        allowed = set(UPLOAD_CONFIG["allowed_extensions"])
+        max_file_bytes = UPLOAD_CONFIG["max_file_size"] * 1024**2
+        max_total_bytes = BULK_UPLOAD_CONFIG["max_total_mb"] * 1024**2
+        sources, skipped = [], []
+        total = 0
+
+        def add(name: str, size: int, read: Callable[[], bytes]):
+            nonlocal total
+            extension = PurePosixPath(name).suffix.lower()
+            if extension not in allowed:
+                skipped.append(_part(name, None, status='skipped', error=f"Unsupported file type '{extension}'"))
+            elif size > max_file_bytes:
+                skipped.append(_part(name, None, status='skipped',
+                                     error=f"Larger than {UPLOAD_CONFIG['max_file_size']} MB"))
+            elif len(sources) >= BULK_UPLOAD_CONFIG["max_files"] or total + size > max_total_bytes:
+                skipped.append(_part(name, None, status='skipped', error="Batch size limit reached"))
+            else:
+                total += size
+                sources.append((name, read()))
+
+        for upload in uploads:
+            data = upload.getvalue()
+            if PurePosixPath(upload.name).suffix.lower() != '.zip':
+                add(upload.name, len(data), lambda: data)
+                continue
+            try:
+                with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                    for info in archive.infolist():
+                        member = PurePosixPath(info.filename)
+                        if info.is_dir() or '__MACOSX' in member.parts or member.name.startswith('.'):
+                            continue
+                        add(f"{upload.name}/{info.filename}", info.file_size,
+                            lambda info=info: archive.read(info))
+            except (zipfile.BadZipFile, OSError) as e:
+                skipped.append(_part(upload.name, None, error=f"Could not open archive: {e}"))
+        return sources, skipped
+
+    def executor(self) -> ProcessPoolExecutor:
+        """Worker pool shared by every session, started on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context(self.start_method))
+            return self._executor
+
+    def shutdown(self):
+        """Stop the worker pool; the next batch starts a new one"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _parse(self, pending: Dict[int, Tuple[str, bytes]], clean: bool, all_sheets: bool,
+               done: Callable[[str], None]) -> Dict[int, List[dict]]:
+        """Parse the pending sources, in the worker pool when the batch is large enough"""
+        results = {}
+        if len(pending) >= BULK_UPLOAD_CONFIG["parallel_min_files"] and self.max_workers > 1:
+            try:
+                executor = self.executor()
+                futures = {executor.submit(parse_source, name, data, clean, all_sheets): index
+                           for index, (name, data) in pending.items()}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    name = pending[index][0]
+                    try:
+                        results[index] = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        results[index] = [_part(name, None, error=f"Worker failed: {e}")]
+                    done(name)
+            except BrokenProcessPool as e:
+                logger.warning(f"Upload worker pool failed ({e}) - parsing the rest of the batch in-process")
+                self.shutdown()
+
+        # Small batches, and whatever a failed pool left behind
+        for index, (name, data) in pending.items():
+            if index not in results:
+                results[index] = parse_source(name, data, clean, all_sheets)
+                done(name)
+        return results
+
+    @staticmethod
+    def _mismatch(frame: pd.DataFrame, required: List[str], header: Optional[List]) -> Optional[str]:
+        """Why a parsed sheet is left out of the combined frame, or None to stack it"""
+        if required:
+            missing = [col for col in required if col not in frame.columns]
+            if missing:
+                return f"Missing required columns: {', '.join(map(str, missing))}"
+        elif header is not None and list(frame.columns) != header:
+            return "Columns differ from the first data sheet"
+        return None
+
+    def load(self, uploads: Iterable, clean: bool = False, all_sheets: bool = True,
+             source_column: Optional[str] = None, required_columns: Optional[Iterable[str]] = None,
+             progress: Optional[Callable[[int, int, str], None]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Parse a batch of uploads and stack their data sheets into one frame.
+
+        ``clean`` runs the DataLoader cleaning (upper-case names, parsed
+        financial columns) and dtype planning; otherwise columns are kept as
+        read. Only sheets with every ``required_columns`` (or, without them,
+        the same header as the first sheet) are stacked; the others are
+        reported as skipped. ``source_column`` adds a categorical column
+        naming each row's file (and sheet). ``progress(done, total, name)``
+        is called as files finish. Returns the combined frame and a report
+        row per file or sheet.
+        """
+        with profiler.span("load.bulk", workers=self.max_workers) as span:
+            with profiler.span("load.bulk.expand"):
+                sources, report = self.expand(uploads)
+
+            context = f"clean={clean}|all_sheets={all_sheets}"
+            keys = [upload_cache.make_key(data, "bulk", context) if upload_cache.enabled else None
+                    for _, data in sources]
+            finished = 0
+
+            def done(name: str):
+                nonlocal finished
+                finished += 1
+                if progress is not None:
+                    progress(finished, len(sources), name)
+
+            results, pending = {}, {}
+            with profiler.span("load.bulk.cache"):
+                for index, (name, data) in enumerate(sources):
+                    cached = upload_cache.get(keys[index]) if keys[index] else None
+                    if cached is None:
+                        pending[index] = (name, data)
+                        continue
+                    results[index] = [_part(name, cached.attrs.get('bulk_sheet'), frame=cached, status='cached')]
+                    done(name)
+
+            with profiler.span("load.bulk.parse", files=len(pending)):
+                parsed = self._parse(pending, clean, all_sheets, done)
+            for index, parts in parsed.items():
+                # Cache whole files only; the sheets of a multi-sheet workbook are re-read together
+                if keys[index] and len(parts) == 1 and parts[0]['Status'] == 'loaded':
+                    parts[0]['frame'].attrs['bulk_sheet'] = parts[0]['Sheet']
+                    upload_cache.put(keys[index], parts[0]['frame'])
+            results.update(parsed)
+
+            required = list(required_columns or [])
+            frames, labels, header = [], [], None
+            for index in sorted(results):
+                parts = results[index]
+                for part in parts:
+                    frame = part.pop('frame')
+                    if part['Status'] in ('loaded', 'cached'):
+                        reason = self._mismatch(frame, required, header)
+                        if reason is not None:
+                            part.update(Status='skipped', Error=reason)
+                            report.append(part)
+                            continue
+                        if header is None:
+                            header = list(frame.columns)
+                        frame.attrs.pop('bulk_sheet', None)
+                        frames.append(frame)
+                        label = part['Source'] if len(parts) == 1 else f"{part['Source']} [{part['Sheet']}]"
+                        # Categories must be unique, e.g. for two uploads of the same name
+                        while label in labels:
+                            label += "'"
+                        labels.append(label)
+                    report.append(part)
+            for part in report:
+                part.pop('frame', None)
+
+            with profiler.span("load.bulk.concat", parts=len(frames)):
+                combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+                if source_column and frames and source_column not in combined.columns:
+                    codes = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+                    combined.insert(0, source_column, pd.Categorical.from_codes(codes, categories=labels))
+            if clean and not combined.empty:
+                with profiler.span("load.bulk.dtypes"):
+                    combined, _ = DtypePlanner.optimize(combined)
+
+            report = pd.DataFrame(report, columns=REPORT_COLUMNS)
+            span.set(files=len(sources), rows=len(combined), failed=int(report['Status'].isin(['failed']).sum()))
+            return combined, report
+
+
+# Global bulk loader
+bulk_loader = BulkLoader()
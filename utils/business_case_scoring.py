@@ -0,0 +1,391 @@
+"""
+Business case scoring and gap analysis
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from config.settings import SCORING_CONFIG
+from .profiler import profiled
+
+SCORE_CATEGORIES = tuple(category.title() for category in SCORING_CONFIG["categories"])
+SCORE_WEIGHTS = {category.title(): weight for category, weight in SCORING_CONFIG["weights"].items()}
+
+# Gap dimension -> (current column, target column, default current, default target,
+#                   default current used as the improvement denominator)
+GAP_DIMENSIONS = {
+    'Process_Efficiency': ('Current_Process_Efficiency', 'Target_Process_Efficiency', 5, 5, 5),
+    'Error_Rate': ('Current_Error_Rate_Percent', 'Target_Error_Rate_Percent', 0, 0, 1),
+    'Client_Satisfaction': ('Current_Client_Satisfaction', 'Target_Client_Satisfaction', 5, 5, 5),
+    'FTE_Count': ('Current_FTE_Count', 'Target_FTE_Count', 0, 0, 1),
+}
+# Gaps measured as current - target (lower is better); the rest are target - current
+REDUCTION_GAPS = ('Error_Rate', 'FTE_Count')
+
+# Fields of a case promoted to the parking lot
+PIPELINE_COLUMNS = ['Case_ID', 'Case_Name', 'Total_Score', 'Investment_Required_M', 'Primary_Workstream',
+                    'Target_Region', 'ROI_Percentage', 'Implementation_Timeline', 'Status', 'Date_Added']
+
+
+def calculate_business_case_score(case_data):
+    """Calculate comprehensive business case score with gap analysis."""
+
+    scores = {}
+
+    # Financial Score (30% weight)
+    roi_score = min(case_data.get('ROI_Percentage', 0) / 50 * 10, 10)  # Normalize ROI to 10-point scale
+    payback_score = max(10 - (case_data.get('Payback_Period_Months', 60) / 6), 0)  # Better score for shorter payback
+    financial_score = (roi_score * 0.6 + payback_score * 0.4)
+    scores['Financial'] = financial_score
+
+    # Strategic Alignment Score (25% weight)
+    strategic_score = case_data.get('Strategic_Alignment_Score', 5)
+    client_impact = case_data.get('Client_Impact_Score', 5)
+    strategic_combined = (strategic_score * 0.7 + client_impact * 0.3)
+    scores['Strategic'] = strategic_combined
+
+    # Implementation Feasibility Score (20% weight)
+    complexity_penalty = (10 - case_data.get('Technology_Complexity_Score', 5)) / 10 * 10
+    risk_penalty = (10 - case_data.get('Implementation_Risk_Score', 5)) / 10 * 10
+    feasibility_score = (complexity_penalty * 0.5 + risk_penalty * 0.5)
+    scores['Feasibility'] = feasibility_score
+
+    # Business Impact Score (15% weight)
+    efficiency_gain = (case_data.get('Target_Process_Efficiency', 5) - case_data.get('Current_Process_Efficiency', 5))
+    error_reduction = max(0, case_data.get('Current_Error_Rate_Percent', 0) - case_data.get('Target_Error_Rate_Percent', 0))
+    impact_score = min((efficiency_gain * 0.6 + error_reduction * 0.4), 10)
+    scores['Impact'] = impact_score
+
+    # Resource Efficiency Score (10% weight)
+    fte_efficiency = max(0, case_data.get('Current_FTE_Count', 0) - case_data.get('Target_FTE_Count', 0))
+    resource_score = min(fte_efficiency * 2, 10)  # Max 10 points
+    scores['Resource'] = resource_score
+
+    # Calculate overall score
+    weights = SCORE_WEIGHTS
+    overall_score = sum(scores[category] * weights[category] for category in scores)
+
+    return overall_score, scores
+
+
+def create_gap_analysis(case_data):
+    """Perform detailed gap analysis between current and target state."""
+
+    gaps = {}
+
+    # Process Efficiency Gap
+    efficiency_gap = case_data.get('Target_Process_Efficiency', 5) - case_data.get('Current_Process_Efficiency', 5)
+    gaps['Process_Efficiency'] = {
+        'current': case_data.get('Current_Process_Efficiency', 5),
+        'target': case_data.get('Target_Process_Efficiency', 5),
+        'gap': efficiency_gap,
+        'improvement_percent': (efficiency_gap / case_data.get('Current_Process_Efficiency', 5)) * 100 if case_data.get('Current_Process_Efficiency', 5) > 0 else 0
+    }
+
+    # Error Rate Gap
+    error_gap = case_data.get('Current_Error_Rate_Percent', 0) - case_data.get('Target_Error_Rate_Percent', 0)
+    gaps['Error_Rate'] = {
+        'current': case_data.get('Current_Error_Rate_Percent', 0),
+        'target': case_data.get('Target_Error_Rate_Percent', 0),
+        'gap': error_gap,
+        'improvement_percent': (error_gap / case_data.get('Current_Error_Rate_Percent', 1)) * 100 if case_data.get('Current_Error_Rate_Percent', 1) > 0 else 0
+    }
+
+    # Client Satisfaction Gap
+    satisfaction_gap = case_data.get('Target_Client_Satisfaction', 5) - case_data.get('Current_Client_Satisfaction', 5)
+    gaps['Client_Satisfaction'] = {
+        'current': case_data.get('Current_Client_Satisfaction', 5),
+        'target': case_data.get('Target_Client_Satisfaction', 5),
+        'gap': satisfaction_gap,
+        'improvement_percent': (satisfaction_gap / case_data.get('Current_Client_Satisfaction', 5)) * 100 if case_data.get('Current_Client_Satisfaction', 5) > 0 else 0
+    }
+
+    # FTE Efficiency Gap
+    fte_gap = case_data.get('Current_FTE_Count', 0) - case_data.get('Target_FTE_Count', 0)
+    gaps['FTE_Count'] = {
+        'current': case_data.get('Current_FTE_Count', 0),
+        'target': case_data.get('Target_FTE_Count', 0),
+        'gap': fte_gap,
+        'improvement_percent': (fte_gap / case_data.get('Current_FTE_Count', 1)) * 100 if case_data.get('Current_FTE_Count', 1) > 0 else 0
+    }
+
+    return gaps
+
+
+class BusinessCaseScorer:
+    """Columnar business case scoring over a whole DataFrame.
+
+    Every sub-score, the weighted total and the gap metrics are array
+    expressions over the input columns. With the default ScoringModel the
+    results are equal bit for bit to ``calculate_business_case_score`` and
+    ``create_gap_analysis`` applied row by row.
+    """
+
+    @staticmethod
+    def _column(df: pd.DataFrame, name: str, default: float) -> np.ndarray:
+        """``df[name]`` as float64, or ``default`` everywhere if the column is absent"""
+        if name in df.columns:
+            return df[name].to_numpy(dtype='float64', na_value=np.nan)
+        return np.full(len(df), default, dtype='float64')
+
+    @staticmethod
+    def sub_scores(df: pd.DataFrame, model: Optional['ScoringModel'] = None) -> pd.DataFrame:
+        """Financial/Strategic/Feasibility/Impact/Resource scores (0-10 scale) per case"""
+        return (model or ScoringModel.default()).sub_scores(df)
+
+    @staticmethod
+    @profiled("metrics.business_case_scores")
+    def score(df: pd.DataFrame, model: Optional['ScoringModel'] = None) -> pd.DataFrame:
+        """Sub-scores plus the weighted ``Total`` (0-10 scale) per case"""
+        return (model or ScoringModel.default()).evaluate(df)
+
+    @staticmethod
+    def score_columns(df: pd.DataFrame, model: Optional['ScoringModel'] = None) -> pd.DataFrame:
+        """``df`` with the dashboard's 100-point ``*_Score`` columns added"""
+        scores = BusinessCaseScorer.score(df, model)
+        scored = pd.DataFrame({
+            'Total_Score': scores['Total'] * 10,
+            **{f'{category}_Score': scores[category] * 10 for category in scores.columns if category != 'Total'}
+        }, index=df.index)
+        existing = [col for col in scored.columns if col in df.columns]
+        return pd.concat([df.drop(columns=existing), scored], axis=1)
+
+    @staticmethod
+    @profiled("metrics.business_case_gaps")
+    def gap_analysis(df: pd.DataFrame) -> pd.DataFrame:
+        """``{dimension}_{current|target|gap|improvement_percent}`` columns per case"""
+        column = BusinessCaseScorer._column
+        gaps: Dict[str, np.ndarray] = {}
+
+        for dimension, (current_col, target_col, current_default, target_default,
+                        denominator_default) in GAP_DIMENSIONS.items():
+            current = column(df, current_col, current_default)
+            target = column(df, target_col, target_default)
+            denominator = column(df, current_col, denominator_default)
+            gap = current - target if dimension in REDUCTION_GAPS else target - current
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                improvement = np.where(denominator > 0, (gap / denominator) * 100, 0)
+
+            gaps[f'{dimension}_current'] = current
+            gaps[f'{dimension}_target'] = target
+            gaps[f'{dimension}_gap'] = gap
+            gaps[f'{dimension}_improvement_percent'] = improvement
+
+        return pd.DataFrame(gaps, index=df.index)
+
+    @staticmethod
+    def gap_record(gaps: pd.DataFrame, label: Any) -> Dict[str, Dict[str, float]]:
+        """One case's gap analysis in the nested ``create_gap_analysis`` layout"""
+        row = gaps.loc[label]
+        return {
+            dimension: {
+                metric: row[f'{dimension}_{metric}']
+                for metric in ('current', 'target', 'gap', 'improvement_percent')
+            }
+            for dimension in GAP_DIMENSIONS
+        }
+
+    @staticmethod
+    def score_record(scores: pd.DataFrame, label: Any) -> Tuple[float, Dict[str, float]]:
+        """One case's ``(overall_score, scores)`` in the scalar function's layout"""
+        row = scores.loc[label]
+        return row['Total'], {category: row[category] for category in SCORE_CATEGORIES}
+
+    @staticmethod
+    def qualifying(scored: pd.DataFrame, threshold: Optional[float] = None) -> pd.DataFrame:
+        """Cases of ``score_columns`` output at or above the 100-point qualification score"""
+        threshold = SCORING_CONFIG["qualification_score"] if threshold is None else threshold
+        return scored[scored['Total_Score'] >= threshold]
+
+    @staticmethod
+    def pipeline_item(case: Mapping[str, Any], added: Optional[datetime] = None) -> Dict[str, Any]:
+        """Parking-lot entry of one scored case, promoted at ``added`` (default now)"""
+        return {
+            'Case_ID': case.get('Case_ID', case.get('Case_Title', 'Unknown')),
+            'Case_Name': case.get('Case_Title', case.get('Case_Name', 'Unknown Case')),
+            'Total_Score': case.get('Total_Score', 0),
+            'Investment_Required_M': case.get('Investment_Required_M',
+                                              case.get('investment', case.get('Estimated_Investment_USD', 0))),
+            'Primary_Workstream': case.get('Primary_Workstream', 'N/A'),
+            'Target_Region': case.get('Target_Region', case.get('Region', 'Global')),
+            'ROI_Percentage': case.get('ROI_Percentage', 0),
+            'Implementation_Timeline': case.get('Implementation_Duration_Months', 'TBD'),
+            'Status': 'Parking Lot',
+            'Date_Added': (added or datetime.now()).strftime('%Y-%m-%d %H:%M'),
+        }
+
+
+def _python_cap(value: np.ndarray, cap: float) -> np.ndarray:
+    """Vectorized ``min(value, cap)``; NaN stays NaN like Python's min"""
+    return np.where(cap < value, cap, value)
+
+
+def _python_floor(value: np.ndarray, floor: float) -> np.ndarray:
+    """Vectorized ``max(value, floor)``; NaN stays NaN like Python's max"""
+    return np.where(floor > value, floor, value)
+
+
+def _python_floor_missing(value: np.ndarray, floor: float) -> np.ndarray:
+    """Vectorized ``max(floor, value)``; NaN becomes ``floor`` like Python's max"""
+    return np.where(value > floor, value, floor)
+
+
+# Term steps of the scoring spec (see SCORING_CONFIG)
+SCORING_STEPS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    'div': lambda value, x: value / x,
+    'mul': lambda value, x: value * x,
+    'sub': lambda value, x: value - x,
+    'rsub': lambda value, x: x - value,
+    'cap': _python_cap,
+    'floor': _python_floor,
+    'floor_missing': _python_floor_missing,
+}
+
+
+class ScoringModel:
+    """A scoring spec compiled into a vectorized evaluator.
+
+    The spec (``SCORING_CONFIG`` by default) defines each category as a
+    weighted sum of terms, where a term is an input column run through a
+    list of normalisation steps, plus an optional category cap. Compilation
+    validates the spec once and turns every step into a NumPy callable.
+    ``sub_scores()`` evaluates one ``(cases, categories)`` matrix and
+    ``sweep()`` scores N weight scenarios against it with one matrix multiply.
+    """
+
+    _default: Optional['ScoringModel'] = None
+
+    def __init__(self, spec: Mapping[str, Any]):
+        self.spec = spec
+        self.keys: List[str] = list(spec["categories"])
+        self.categories: List[str] = [key.title() for key in self.keys]
+        self.weights = self._weight_vector(spec["weights"])
+        self._compiled = [self._compile_category(key, spec["categories"][key]) for key in self.keys]
+
+    @classmethod
+    def default(cls) -> 'ScoringModel':
+        """The model compiled from SCORING_CONFIG, built once"""
+        if cls._default is None:
+            cls._default = cls(SCORING_CONFIG)
+        return cls._default
+
+    def with_weights(self, weights: Mapping[str, float]) -> 'ScoringModel':
+        """Copy of this model with different category weights"""
+        spec = dict(self.spec)
+        spec["weights"] = {key: weights.get(key, weights.get(key.title(), 0.0)) for key in self.keys}
+        return ScoringModel(spec)
+
+    def _weight_vector(self, weights: Mapping[str, float]) -> np.ndarray:
+        missing = [key for key in self.keys if key not in weights]
+        if missing:
+            raise ValueError(f"Scoring weights missing for: {', '.join(missing)}")
+        return np.array([weights[key] for key in self.keys], dtype='float64')
+
+    @staticmethod
+    def _compile_category(key: str, category: Mapping[str, Any]):
+        """Turn a category spec into ``(terms, cap)`` with resolved step functions"""
+        terms = []
+        for term in category["terms"]:
+            steps = []
+            for name, argument in term.get("steps", []):
+                if name not in SCORING_STEPS:
+                    raise ValueError(f"Unknown scoring step '{name}' in category '{key}'")
+                steps.append((SCORING_STEPS[name], argument))
+            minus = tuple(term["minus"]) if "minus" in term else None
+            terms.append((term["column"], term.get("default", 0), minus, steps, term.get("weight", 1.0)))
+        return terms, category.get("cap")
+
+    @staticmethod
+    def _evaluate_category(df: pd.DataFrame, compiled) -> np.ndarray:
+        terms, cap = compiled
+        column = BusinessCaseScorer._column
+
+        score = None
+        for name, default, minus, steps, weight in terms:
+            value = column(df, name, default)
+            if minus is not None:
+                value = value - column(df, *minus)
+            for step, argument in steps:
+                value = step(value, argument)
+            # Left-to-right accumulation, as the scalar expressions do
+            score = value * weight if score is None else score + value * weight
+
+        if score is None:
+            score = np.zeros(len(df))
+        if cap is not None:
+            score = _python_cap(score, cap)
+        return score
+
+    def score_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """``(cases, categories)`` matrix of sub-scores"""
+        matrix = np.empty((len(df), len(self.keys)))
+        for position, compiled in enumerate(self._compiled):
+            matrix[:, position] = self._evaluate_category(df, compiled)
+        return matrix
+
+    def sub_scores(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Category sub-scores (0-10 scale) per case"""
+        return pd.DataFrame(self.score_matrix(df), index=df.index, columns=self.categories)
+
+    def evaluate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Sub-scores plus the weighted ``Total`` (0-10 scale) per case"""
+        matrix = self.score_matrix(df)
+        scores = pd.DataFrame(matrix, index=df.index, columns=self.categories)
+
+        # Accumulate in category order so a single scenario matches sum() exactly
+        total = np.zeros(len(df))
+        for position, weight in enumerate(self.weights):
+            total = total + matrix[:, position] * weight
+        scores['Total'] = total
+        return scores
+
+    def scenario_matrix(self, scenarios: Union[np.ndarray, Sequence[Mapping[str, float]]]) -> np.ndarray:
+        """``(scenarios, categories)`` weight matrix from an array or weight dicts"""
+        if isinstance(scenarios, np.ndarray):
+            weights = np.asarray(scenarios, dtype='float64')
+        else:
+            weights = np.array([
+                [scenario.get(key, scenario.get(category, 0.0))
+                 for key, category in zip(self.keys, self.categories)]
+                for scenario in scenarios
+            ], dtype='float64')
+        if weights.ndim != 2 or weights.shape[1] != len(self.keys):
+            raise ValueError(f"Weight scenarios must have shape (n, {len(self.keys)})")
+        return weights
+
+    @profiled("metrics.scoring_sweep")
+    def sweep(self, df: pd.DataFrame, scenarios: Union[np.ndarray, Sequence[Mapping[str, float]]],
+              matrix: Optional[np.ndarray] = None) -> np.ndarray:
+        """``(scenarios, cases)`` totals for many weight scenarios in one matrix multiply.
+
+        Pass ``matrix`` from ``score_matrix()`` to reuse the sub-scores across sweeps.
+        """
+        if matrix is None:
+            matrix = self.score_matrix(df)
+        return self.scenario_matrix(scenarios) @ matrix.T
+
+    def qualification_rate(self, df: pd.DataFrame, scenarios: np.ndarray, threshold: float,
+                           matrix: Optional[np.ndarray] = None, chunk_size: int = 256) -> np.ndarray:
+        """``(cases,)`` share of scenarios in which each case's total reaches ``threshold`` (0-10 scale).
+
+        Scenarios are multiplied in chunks so memory stays at ``chunk_size x cases``.
+        """
+        if matrix is None:
+            matrix = self.score_matrix(df)
+        weights = self.scenario_matrix(scenarios)
+        qualified = np.zeros(matrix.shape[0])
+        for start in range(0, len(weights), chunk_size):
+            qualified += (weights[start:start + chunk_size] @ matrix.T >= threshold).sum(axis=0)
+        return qualified / max(len(weights), 1)
+
+    def random_scenarios(self, count: int, spread: float = 0.1, seed: Optional[int] = None) -> np.ndarray:
+        """``(count, categories)`` weights jittered around this model's, each row summing to 1"""
+        rng = np.random.default_rng(seed)
+        weights = np.clip(self.weights + rng.normal(0.0, spread, (count, len(self.keys))), 0.0, None)
+        totals = weights.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        return weights / totals
@@ -0,0 +1,253 @@
+"""
+Array representation of capital project monthly financials
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from config.constants import CURRENT_YEAR, CURRENT_MONTH, FINANCIAL_PATTERNS
+from .profiler import profiled
+
+if TYPE_CHECKING:
+    from .capital_rollup import CapitalRollup
+
+# Measure axis: Actuals, Forecasts, Capital Plan
+MEASURES = ('A', 'F', 'CP')
+MEASURE_NAMES = {'A': 'Actuals', 'F': 'Forecasts', 'CP': 'Capital Plan'}
+MONTHS = 12
+
+# Monthly columns of any year, e.g. 2024_03_A
+ANY_YEAR_MONTHLY_PATTERN = re.compile(r'^(20\d{2})_(\d{2})_(A|F|CP)$')
+
+
+class CapitalCube:
+    """Monthly capital financials as one ``(projects, months, measures)`` array.
+
+    Values live in a single contiguous float64 buffer stored measure-major,
+    so ``measure()``, ``ytd()`` and ``project_series()`` are zero-copy views
+    and per-month totals are single reductions instead of column-name scans.
+    """
+
+    def __init__(self, storage: np.ndarray, present: np.ndarray, year: int,
+                 index: Optional[pd.Index] = None, month_totals: Optional[np.ndarray] = None):
+        # storage has shape (measures, months, projects)
+        self._storage = storage
+        self.present = present
+        self.year = year
+        self.index = index if index is not None else pd.RangeIndex(storage.shape[2])
+        self._month_totals = month_totals
+
+    @classmethod
+    @profiled("metrics.capital_cube")
+    def from_dataframe(cls, df: pd.DataFrame, year: int = CURRENT_YEAR) -> 'CapitalCube':
+        """Gather the ``{year}_{MM}_{A|F|CP}`` columns of ``df`` into a cube"""
+        pattern = re.compile(FINANCIAL_PATTERNS["monthly"].format(year=year))
+        prefix = len(str(year)) + 1
+        columns, month_idx, measure_idx = [], [], []
+
+        for col in df.columns:
+            match = pattern.match(str(col))
+            if not match:
+                continue
+            month = int(str(col)[prefix:prefix + 2])
+            if 1 <= month <= MONTHS:
+                columns.append(col)
+                month_idx.append(month - 1)
+                measure_idx.append(MEASURES.index(match.group(1)))
+
+        return cls._from_columns(df, year, columns, month_idx, measure_idx)
+
+    @classmethod
+    def _from_columns(cls, df: pd.DataFrame, year: int, columns: List[str],
+                      month_idx: List[int], measure_idx: List[int]) -> 'CapitalCube':
+        """Build a cube from pre-classified monthly columns"""
+        storage = np.zeros((len(MEASURES), MONTHS, len(df)), dtype='float64')
+        present = np.zeros((MONTHS, len(MEASURES)), dtype=bool)
+
+        if columns:
+            values = df[columns].to_numpy(dtype='float64', na_value=0.0)
+            storage[measure_idx, month_idx] = values.T
+            present[month_idx, measure_idx] = True
+
+        return cls(storage, present, year, df.index)
+
+    @property
+    def values(self) -> np.ndarray:
+        """``(projects, months, measures)`` view of the cube"""
+        return self._storage.transpose(2, 1, 0)
+
+    @property
+    def n_projects(self) -> int:
+        return self._storage.shape[2]
+
+    @property
+    def month_labels(self) -> List[str]:
+        return [f"{self.year}_{month:02d}" for month in range(1, MONTHS + 1)]
+
+    def series(self) -> np.ndarray:
+        """``(measures * months, projects)`` view, one row per measure-month series"""
+        return self._storage.reshape(len(MEASURES) * MONTHS, -1)
+
+    def measure(self, measure: str) -> np.ndarray:
+        """``(projects, months)`` view of one measure"""
+        return self._storage[MEASURES.index(measure)].T
+
+    def has_month(self, month: int, measure: str) -> bool:
+        """Whether the source data had a column for ``month`` (1-12) and ``measure``"""
+        return bool(self.present[month - 1, MEASURES.index(measure)])
+
+    def months_present(self, measure: str) -> np.ndarray:
+        """1-based month numbers that exist for ``measure``"""
+        return np.flatnonzero(self.present[:, MEASURES.index(measure)]) + 1
+
+    def ytd(self, measure: str, month: int) -> np.ndarray:
+        """``(projects, month)`` view of months 1..``month``"""
+        return self.measure(measure)[:, :month]
+
+    def project_series(self, position: int) -> np.ndarray:
+        """``(months, measures)`` view of one project's time series"""
+        return self.values[position]
+
+    def month_totals(self) -> np.ndarray:
+        """``(months, measures)`` portfolio totals, computed once per cube"""
+        if self._month_totals is None:
+            self._month_totals = self._storage.sum(axis=2).T
+        return self._month_totals
+
+    def positions(self, labels: Sequence) -> np.ndarray:
+        """Map row labels of the source frame to cube positions"""
+        return self.index.get_indexer(labels)
+
+    def take(self, positions: Sequence[int],
+             month_totals: Optional[np.ndarray] = None) -> 'CapitalCube':
+        """Return a cube restricted to the given project positions.
+
+        ``month_totals`` may pass already-known totals of those projects.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        return CapitalCube(
+            np.ascontiguousarray(self._storage[:, :, positions]),
+            self.present,
+            self.year,
+            self.index[positions],
+            month_totals
+        )
+
+    def subset(self, df: pd.DataFrame) -> 'CapitalCube':
+        """Return a cube aligned with the rows of a filtered copy of the source frame"""
+        if len(df) == self.n_projects and df.index.equals(self.index):
+            return self
+        return self.take(self.positions(df.index))
+
+    def to_frame(self, position: int) -> pd.DataFrame:
+        """One project's monthly breakdown as a Month x measure table"""
+        series = self.project_series(position)
+        data = {'Month': self.month_labels}
+        for measure_idx, measure in enumerate(MEASURES):
+            data[MEASURE_NAMES[measure]] = series[:, measure_idx]
+        return pd.DataFrame(data)
+
+
+class CapitalTimeSeries:
+    """Every year of a capital upload indexed as per-year cubes.
+
+    All ``20YY_MM_{A|F|CP}`` columns are classified in one pass when the
+    series is built. Per-year aggregates and derived-metric frames are
+    computed the first time a year is requested and memoized, so switching
+    the analysis year re-serves cached results instead of reprocessing the
+    upload.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.base = df
+        self._cubes: Dict[int, CapitalCube] = {}
+        self._summaries: Dict[int, Dict[str, np.ndarray]] = {}
+        self._frames: Dict[Tuple[int, int], pd.DataFrame] = {}
+        self._rollups: Dict[int, 'CapitalRollup'] = {}
+
+        grouped: Dict[int, Tuple[List[str], List[int], List[int]]] = {}
+
+        for col in df.columns:
+            match = ANY_YEAR_MONTHLY_PATTERN.match(str(col))
+            if not match:
+                continue
+            year, month = int(match.group(1)), int(match.group(2))
+            if not 1 <= month <= MONTHS:
+                continue
+            columns, month_idx, measure_idx = grouped.setdefault(year, ([], [], []))
+            columns.append(col)
+            month_idx.append(month - 1)
+            measure_idx.append(MEASURES.index(match.group(3)))
+
+        for year, (columns, month_idx, measure_idx) in grouped.items():
+            self._cubes[year] = CapitalCube._from_columns(df, year, columns, month_idx, measure_idx)
+
+    @property
+    def years(self) -> List[int]:
+        return sorted(self._cubes)
+
+    def default_year(self, current_year: int = CURRENT_YEAR) -> Optional[int]:
+        """The current year if present, otherwise the latest year in the data"""
+        if not self._cubes:
+            return None
+        return current_year if current_year in self._cubes else self.years[-1]
+
+    @staticmethod
+    def analysis_month(year: int, current_year: int = CURRENT_YEAR, current_month: int = CURRENT_MONTH) -> int:
+        """Months of actuals to treat as YTD: all of a past year, none of a future one"""
+        if year < current_year:
+            return MONTHS
+        if year > current_year:
+            return 0
+        return current_month
+
+    def cube(self, year: int) -> CapitalCube:
+        """Return the cube for ``year`` (empty if the year has no columns)"""
+        if year not in self._cubes:
+            self._cubes[year] = CapitalCube.from_dataframe(self.base, year)
+        return self._cubes[year]
+
+    def year_summary(self, year: int) -> Dict[str, np.ndarray]:
+        """Portfolio aggregates for ``year``, computed once"""
+        if year not in self._summaries:
+            month_totals = self.cube(year).month_totals()
+            self._summaries[year] = {
+                'month_totals': month_totals,
+                'totals': month_totals.sum(axis=0),
+            }
+        return self._summaries[year]
+
+    def year_over_year(self, measure: str = 'A') -> pd.DataFrame:
+        """Month x year table of portfolio totals for one measure"""
+        measure_idx = MEASURES.index(measure)
+        data = {year: self.year_summary(year)['month_totals'][:, measure_idx] for year in self.years}
+        return pd.DataFrame(data, index=[f"{month:02d}" for month in range(1, MONTHS + 1)])
+
+    def frame_for_year(self, year: int, month: Optional[int] = None,
+                       on_warning=None) -> pd.DataFrame:
+        """The upload with derived metrics for ``year``, computed once per (year, month)"""
+        from .capital_metrics import CapitalMetrics
+
+        month = self.analysis_month(year) if month is None else month
+        key = (year, month)
+        if key not in self._frames:
+            self._frames[key] = CapitalMetrics.calculate_from_cube(
+                self.base, self.cube(year), month, on_warning
+            )
+        return self._frames[key]
+
+    def rollup(self, year: int, frame: Optional[pd.DataFrame] = None) -> 'CapitalRollup':
+        """Filter group-by index of ``year``'s frame, built once per year.
+
+        ``frame`` is the derived-metric frame of ``year`` when the caller
+        already holds it; otherwise ``frame_for_year(year)`` is used.
+        """
+        from .capital_rollup import CapitalRollup
+
+        if year not in self._rollups:
+            if frame is None:
+                frame = self.frame_for_year(year)
+            self._rollups[year] = CapitalRollup(frame, self.cube(year))
+        return self._rollups[year]
@@ -0,0 +1,96 @@
+"""
+Vectorized derived-metrics engine for capital project data
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional
+
+from config.constants import CURRENT_YEAR, CURRENT_MONTH
+from .capital_cube import CapitalCube
+from .profiler import profiled
+
+
+class CapitalMetrics:
+    """Compute every derived capital-project column from a CapitalCube.
+
+    The monthly ``{year}_{MM}_{A|F|CP}`` columns are gathered once into a
+    ``(projects, 12, 3)`` array; totals, YTD, run rate, variances,
+    over/underspend and spread scores are then plain array expressions.
+    """
+
+    @staticmethod
+    def calculate(df: pd.DataFrame, year: int = CURRENT_YEAR, month: int = CURRENT_MONTH,
+                  on_warning: Optional[Callable[[str], None]] = None) -> pd.DataFrame:
+        """Return ``df`` with all derived capital-project columns added"""
+        cube = CapitalCube.from_dataframe(df, year)
+        return CapitalMetrics.calculate_from_cube(df, cube, month, on_warning)
+
+    @staticmethod
+    @profiled("metrics.capital")
+    def calculate_from_cube(df: pd.DataFrame, cube: CapitalCube, month: int = CURRENT_MONTH,
+                            on_warning: Optional[Callable[[str], None]] = None) -> pd.DataFrame:
+        """Derive the capital-project columns of ``df`` from its cube"""
+        year = cube.year
+        actuals, forecasts = cube.measure('A'), cube.measure('F')
+
+        total_actuals = actuals.sum(axis=1)
+        total_forecasts = forecasts.sum(axis=1)
+
+        ytd_actuals = cube.ytd('A', month).sum(axis=1)
+        num_actual_months = int((cube.months_present('A') <= month).sum()) or 1
+        num_forecast_months = len(cube.months_present('F')) or 1
+
+        new_columns: Dict[str, np.ndarray] = {
+            f'TOTAL_{year}_ACTUALS': total_actuals,
+            f'TOTAL_{year}_FORECASTS': total_forecasts,
+            f'TOTAL_{year}_CAPITAL_PLAN': cube.measure('CP').sum(axis=1),
+        }
+
+        if 'ALL_PRIOR_YEARS_ACTUALS' in df.columns:
+            prior = df['ALL_PRIOR_YEARS_ACTUALS'].to_numpy(dtype='float64', na_value=np.nan)
+            new_columns['TOTAL_ACTUALS_TO_DATE'] = prior + total_actuals
+        else:
+            new_columns['TOTAL_ACTUALS_TO_DATE'] = total_actuals
+            CapitalMetrics._warn(on_warning, "Column 'ALL_PRIOR_YEARS_ACTUALS' not found.")
+
+        new_columns['SUM_ACTUAL_SPEND_YTD'] = ytd_actuals
+        new_columns['SUM_OF_FORECASTED_NUMBERS'] = total_forecasts
+        new_columns['RUN_RATE_PER_MONTH'] = (total_actuals + total_forecasts) / 12
+
+        if 'BUSINESS_ALLOCATION' in df.columns:
+            allocation = df['BUSINESS_ALLOCATION'].to_numpy(dtype='float64', na_value=np.nan)
+            variance = allocation - total_forecasts
+            new_columns['CAPITAL_VARIANCE'] = variance
+            new_columns['CAPITAL_UNDERSPEND'] = np.where(variance > 0, variance, 0.0)
+            new_columns['CAPITAL_OVERSPEND'] = np.where(variance < 0, -variance, 0.0)
+        else:
+            zeros = np.zeros(len(df))
+            new_columns['CAPITAL_VARIANCE'] = zeros
+            new_columns['CAPITAL_UNDERSPEND'] = zeros
+            new_columns['CAPITAL_OVERSPEND'] = zeros
+            CapitalMetrics._warn(on_warning, "Column 'BUSINESS_ALLOCATION' not found.")
+
+        new_columns['NET_REALLOCATION_AMOUNT'] = new_columns['CAPITAL_UNDERSPEND'] - new_columns['CAPITAL_OVERSPEND']
+        new_columns['AVG_ACTUAL_SPEND'] = ytd_actuals / num_actual_months
+        new_columns['AVG_FORECAST_SPEND'] = total_forecasts / num_forecast_months
+        new_columns['TOTAL_SPEND_VARIANCE'] = total_actuals - total_forecasts
+
+        # Monthly actual-vs-forecast variance for months that have both measures
+        variance_months = np.intersect1d(cube.months_present('A'), cube.months_present('F'))
+        monthly_variance = actuals[:, variance_months - 1] - forecasts[:, variance_months - 1]
+        for position, variance_month in enumerate(variance_months):
+            new_columns[f'{year}_{variance_month:02d}_AF_VARIANCE'] = monthly_variance[:, position]
+
+        new_columns['AVERAGE_MONTHLY_SPREAD_SCORE'] = (
+            np.abs(monthly_variance).mean(axis=1) if len(variance_months) else np.zeros(len(df))
+        )
+
+        derived = pd.DataFrame(new_columns, index=df.index)
+        existing = [col for col in derived.columns if col in df.columns]
+        return pd.concat([df.drop(columns=existing), derived], axis=1)
+
+    @staticmethod
+    def _warn(on_warning: Optional[Callable[[str], None]], message: str):
+        if on_warning is not None:
+            on_warning(message)
@@ -0,0 +1,136 @@
+"""
+Pre-aggregated capital metrics over the dashboard filter columns
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config.constants import CAPITAL_FILTER_COLUMNS
+from .capital_cube import CapitalCube, MEASURES, MONTHS
+from .filter_index import FilterIndex, ALL_VALUES
+from .profiler import profiled
+
+# Key-metric columns summed per group
+SUM_METRICS = (
+    'SUM_ACTUAL_SPEND_YTD',
+    'SUM_OF_FORECASTED_NUMBERS',
+    'CAPITAL_UNDERSPEND',
+    'CAPITAL_OVERSPEND',
+    'NET_REALLOCATION_AMOUNT',
+    'RUN_RATE_PER_MONTH',
+)
+
+
+class CapitalRollup:
+    """Group-by index of a capital frame over the sidebar filter columns.
+
+    Rows are grouped once by the combination of their filter values and
+    every key metric, plus the monthly cube totals, is pre-summed per group.
+    A filter change then only ANDs a few ``(groups,)`` masks and adds up the
+    partials of the matching groups; rows are gathered only for the tables
+    and per-project views that need them.
+    """
+
+    @profiled("metrics.capital_rollup")
+    def __init__(self, df: pd.DataFrame, cube: CapitalCube,
+                 filter_columns: Optional[Sequence[str]] = None):
+        self.df = df
+        self.cube = cube
+        self.filter_columns = [col for col in (filter_columns or CAPITAL_FILTER_COLUMNS) if col in df.columns]
+        self.metrics = [col for col in SUM_METRICS if col in df.columns]
+        year_forecasts = f'TOTAL_{cube.year}_FORECASTS'
+        if year_forecasts in df.columns:
+            self.metrics.append(year_forecasts)
+
+        # Shares the per-column codes with BaseModule's sidebar filters
+        self.filter_index = FilterIndex.for_frame(df)
+        codes = [self.filter_index.codes(col) for col in self.filter_columns]
+
+        self.group_ids, self.group_keys = self._group(codes, len(df))
+        n_groups = len(self.group_keys)
+
+        # Sort rows by group once so every partial is a single reduceat
+        order = np.argsort(self.group_ids, kind='stable')
+        counts = np.bincount(self.group_ids, minlength=n_groups)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        self.group_counts = counts
+        metric_values = df[self.metrics].to_numpy(dtype='float64', na_value=np.nan).T
+        self.metric_sums = self._reduce(np.nan_to_num(metric_values[:, order]), offsets, n_groups)
+        self.metric_counts = self._reduce((~np.isnan(metric_values[:, order])).astype('float64'),
+                                          offsets, n_groups)
+
+        self.month_partials = self._reduce(cube.series()[:, order], offsets, n_groups)
+
+    @staticmethod
+    def _group(codes: List[np.ndarray], n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Assign every row a dense group id from its combination of filter codes"""
+        if not codes:
+            return np.zeros(n_rows, dtype=np.intp), np.zeros((1 if n_rows else 0, 0), dtype=np.intp)
+
+        # Codes start at -1 (missing); shift so each column is a digit of a mixed-radix key
+        radices = [int(col_codes.max(initial=-1)) + 2 for col_codes in codes]
+        if np.prod(radices, dtype='float64') < 2 ** 62:
+            key = np.zeros(n_rows, dtype=np.int64)
+            for col_codes, radix in zip(codes, radices):
+                key = key * radix + (col_codes + 1)
+            _, first, group_ids = np.unique(key, return_index=True, return_inverse=True)
+            group_keys = np.column_stack([col_codes[first] for col_codes in codes])
+        else:
+            group_keys, group_ids = np.unique(np.column_stack(codes), axis=0, return_inverse=True)
+
+        return group_ids.ravel().astype(np.intp), group_keys
+
+    @staticmethod
+    def _reduce(values: np.ndarray, offsets: np.ndarray, n_groups: int) -> np.ndarray:
+        """Sum ``(series, rows)`` sorted by group into ``(series, groups)``"""
+        if n_groups == 0 or values.shape[1] == 0:
+            return np.zeros((values.shape[0], n_groups))
+        return np.add.reduceat(values, offsets, axis=1)
+
+    def options(self, col: str) -> List[Any]:
+        """Sorted distinct non-null values of a filter column"""
+        return self.filter_index.options(col) if col in self.filter_columns else []
+
+    def group_mask(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """``(groups,)`` mask of the groups matching ``filters``; None when nothing is filtered"""
+        mask = None
+        for position, col in enumerate(self.filter_columns):
+            selected = filters.get(col, ALL_VALUES)
+            if selected == ALL_VALUES:
+                continue
+            code = self.filter_index.code_of(col, selected)
+            col_mask = self.group_keys[:, position] == code if code >= 0 else np.zeros(len(self.group_keys), dtype=bool)
+            mask = col_mask if mask is None else mask & col_mask
+        return mask
+
+    def totals(self, filters: Dict[str, Any]) -> Dict[str, float]:
+        """Key metrics of the filtered projects combined from group partials"""
+        mask = self.group_mask(filters)
+        sums = self.metric_sums if mask is None else self.metric_sums[:, mask]
+        counts = self.metric_counts if mask is None else self.metric_counts[:, mask]
+        group_counts = self.group_counts if mask is None else self.group_counts[mask]
+
+        totals = {'count': int(group_counts.sum())}
+        for position, col in enumerate(self.metrics):
+            totals[col] = float(sums[position].sum())
+            non_null = counts[position].sum()
+            totals[f'{col}_mean'] = float(totals[col] / non_null) if non_null else float('nan')
+        return totals
+
+    def month_totals(self, filters: Dict[str, Any]) -> np.ndarray:
+        """``(months, measures)`` totals of the filtered projects"""
+        mask = self.group_mask(filters)
+        partials = self.month_partials if mask is None else self.month_partials[:, mask]
+        return partials.sum(axis=1).reshape(len(MEASURES), MONTHS).T
+
+    def select(self, filters: Dict[str, Any]) -> Tuple[pd.DataFrame, CapitalCube]:
+        """Filtered rows and cube; the cube carries its month totals from the partials"""
+        mask = self.group_mask(filters)
+        if mask is None:
+            return self.df, self.cube
+
+        positions = np.flatnonzero(mask[self.group_ids])
+        cube = self.cube.take(positions, self.month_totals(filters))
+        return self.df.iloc[positions], cube
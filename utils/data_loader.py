@@ -4,15 +4,23 @@ Utility functions for data loading and processing
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 import io
 import re
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Iterator, Tuple, Union
 from pathlib import Path
 
 from config.constants import CURRENT_YEAR, CURRENT_MONTH, ERROR_MESSAGES, SUCCESS_MESSAGES
 from config.settings import DATA_CONFIG, UPLOAD_CONFIG
+from .profiler import profiler, profiled
+from .dtype_planner import DtypePlanner
+
+# Characters stripped from amounts before numeric parsing
+FINANCIAL_STRIP_CHARS = ' \t$€£¥()'
+FINANCIAL_NOISE_PATTERN = r'[,$€£¥()\s]'
 
 
 class DataLoader:
@@ -54,29 +62,139 @@ class DataLoader:
 
     @staticmethod
     @st.cache_data(ttl=DATA_CONFIG["cache_timeout"])
+    @profiled("load.uploaded_file")
     def load_uploaded_file(uploaded_file: io.BytesIO) -> pd.DataFrame:
-        """Load data from uploaded file with caching and validation"""
+        """Load data from uploaded file with caching and validation.
+
+        The file is streamed in chunks of ``UPLOAD_CONFIG["chunk_size"]`` rows;
+        each chunk has its column names cleaned and financial columns converted
+        before it is kept, so only typed data is held in memory. The combined
+        frame is then stored in the narrowest safe dtypes (see DtypePlanner).
+        """
         if not DataLoader.validate_upload(uploaded_file):
             return pd.DataFrame()
             
         try:
-            file_extension = Path(uploaded_file.name).suffix.lower()
+            chunks = []
+            total_rows = 0
+            progress_bar = st.progress(0.0, text="Loading file...")
             
-            if file_extension == '.csv':
-                df = pd.read_csv(uploaded_file)
-            elif file_extension in ['.xlsx', '.xls']:
-                df = pd.read_excel(uploaded_file)
-            else:
-                st.error(ERROR_MESSAGES["invalid_format"])
+            with profiler.span("load.uploaded_file.parse") as span:
+                for chunk, fraction in DataLoader.iter_file_chunks(uploaded_file):
+                    chunks.append(chunk)
+                    total_rows += len(chunk)
+                    progress_bar.progress(
+                        min(max(fraction, 0.0), 1.0),
+                        text=f"Loaded {total_rows:,} rows ({len(chunks)} chunks)"
+                    )
+                span.set(file=uploaded_file.name, rows=total_rows, chunks=len(chunks))
+            
+            progress_bar.empty()
+            
+            if not chunks:
+                st.error(ERROR_MESSAGES["insufficient_data"])
                 return pd.DataFrame()
-                
+            
+            with profiler.span("load.uploaded_file.concat"):
+                df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+            with profiler.span("load.uploaded_file.dtypes") as span:
+                df, plan = DtypePlanner.optimize(df)
+                saved_mb = (plan['before_bytes'] - plan['after_bytes']) / 1024**2
+                span.set(columns=len(plan['columns']), saved_mb=round(saved_mb, 2))
+            
             st.success(SUCCESS_MESSAGES["file_uploaded"])
             return df
             
+        except ValueError as e:
+            st.error(str(e))
+            return pd.DataFrame()
         except Exception as e:
             st.error(f"Error loading file: {str(e)}")
             return pd.DataFrame()
 
+    @staticmethod
+    def iter_file_chunks(uploaded_file: io.BytesIO, 
+                         chunk_size: Optional[int] = None,
+                         sheet: Union[int, str] = 0) -> Iterator[Tuple[pd.DataFrame, float]]:
+        """Yield cleaned, typed chunks of an uploaded file (``sheet`` of a workbook) with the fraction read so far"""
+        chunk_size = chunk_size or UPLOAD_CONFIG["chunk_size"]
+        file_extension = Path(uploaded_file.name).suffix.lower()
+        uploaded_file.seek(0)
+        
+        if file_extension == '.csv':
+            raw_chunks = DataLoader._iter_csv_chunks(uploaded_file, chunk_size)
+        elif file_extension == '.xlsx':
+            raw_chunks = DataLoader._iter_xlsx_chunks(uploaded_file, chunk_size, sheet)
+        elif file_extension == '.xls':
+            raw_chunks = DataLoader._iter_frame_chunks(pd.read_excel(uploaded_file, sheet_name=sheet), chunk_size)
+        else:
+            raise ValueError(ERROR_MESSAGES["invalid_format"])
+        
+        columns = None
+        financial_cols = None
+        
+        for chunk, fraction in raw_chunks:
+            if columns is None:
+                # Column names and financial columns are resolved once per file
+                columns = [DataLoader.clean_column_name(col) for col in chunk.columns]
+                columns = DataLoader.handle_duplicate_columns(columns)
+                financial_cols = DataLoader.classify_financial_columns(columns)
+            
+            chunk.columns = columns
+            yield DataLoader.convert_financial_columns(chunk, financial_cols), fraction
+
+    @staticmethod
+    def _iter_csv_chunks(uploaded_file: io.BytesIO, chunk_size: int) -> Iterator[Tuple[pd.DataFrame, float]]:
+        """Read a CSV file in row chunks"""
+        file_size = getattr(uploaded_file, 'size', 0) or 0
+        
+        with pd.read_csv(uploaded_file, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                fraction = uploaded_file.tell() / file_size if file_size else 0.0
+                yield chunk, fraction
+
+    @staticmethod
+    def _iter_xlsx_chunks(uploaded_file: io.BytesIO, chunk_size: int,
+                          sheet: Union[int, str] = 0) -> Iterator[Tuple[pd.DataFrame, float]]:
+        """Stream one sheet (by position or name) of an xlsx workbook in row chunks"""
+        from openpyxl import load_workbook
+        
+        workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if isinstance(sheet, str) else workbook.worksheets[sheet]
+            total_rows = max((worksheet.max_row or 1) - 1, 1)
+            rows = worksheet.iter_rows(values_only=True)
+            
+            header = next(rows, None)
+            if header is None:
+                return
+            header = [f"Unnamed: {i}" if value is None else value for i, value in enumerate(header)]
+            
+            buffer = []
+            rows_read = 0
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) >= chunk_size:
+                    rows_read += len(buffer)
+                    yield pd.DataFrame(buffer, columns=header), rows_read / total_rows
+                    buffer = []
+            
+            if buffer or rows_read == 0:
+                rows_read += len(buffer)
+                yield pd.DataFrame(buffer, columns=header), 1.0
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _iter_frame_chunks(df: pd.DataFrame, chunk_size: int) -> Iterator[Tuple[pd.DataFrame, float]]:
+        """Split an already loaded frame into row chunks (formats without a streaming reader)"""
+        total_rows = max(len(df), 1)
+        
+        for start in range(0, max(len(df), 1), chunk_size):
+            chunk = df.iloc[start:start + chunk_size].copy()
+            yield chunk, min(start + chunk_size, total_rows) / total_rows
+
     @staticmethod
     def clean_column_name(col_name: str) -> str:
         """Clean and standardize column names"""
@@ -115,18 +233,64 @@ class DataLoader:
         return result
 
     @staticmethod
-    def convert_financial_columns(df: pd.DataFrame) -> pd.DataFrame:
+    @lru_cache(maxsize=32)
+    def _compile_pattern(pattern: str) -> re.Pattern:
+        """Compile and memoize a column-name pattern"""
+        return re.compile(pattern)
+
+    @staticmethod
+    def classify_financial_columns(columns: List[str], pattern: Optional[str] = None) -> List[str]:
+        """Return the columns whose names match the financial column pattern"""
+        regex = DataLoader._compile_pattern(pattern or DATA_CONFIG["numeric_columns_pattern"])
+        return [col for col in columns if regex.search(str(col))]
+
+    @staticmethod
+    def parse_financial_values(values: pd.DataFrame) -> np.ndarray:
+        """Parse a block of text amounts into a float64 matrix in a single pass.
+
+        Handles thousands separators, currency symbols, surrounding whitespace,
+        accounting-style negatives such as ``(1,250.00)`` and blanks (parsed as 0).
+        """
+        flat = pd.concat([values[col] for col in values.columns], ignore_index=True)
+        text = flat.astype(str)
+        
+        is_negative = text.str.contains('(', regex=False).to_numpy(dtype=bool, na_value=False)
+        cleaned = text.str.replace(',', '', regex=False).str.strip(FINANCIAL_STRIP_CHARS)
+        cleaned = cleaned.mask(cleaned == '', '0')
+        
+        try:
+            parsed = cleaned.astype('float64')
+        except (ValueError, TypeError):
+            # Fall back to the slower, forgiving parser for irregular values
+            cleaned = text.str.replace(FINANCIAL_NOISE_PATTERN, '', regex=True)
+            parsed = pd.to_numeric(cleaned, errors='coerce')
+        
+        parsed = parsed.to_numpy(dtype='float64', na_value=np.nan)
+        parsed = np.where(is_negative, -np.abs(parsed), parsed)
+        
+        return np.nan_to_num(parsed, nan=0.0).reshape(values.shape, order='F')
+
+    @staticmethod
+    def convert_financial_columns(df: pd.DataFrame, financial_cols: Optional[List[str]] = None) -> pd.DataFrame:
         """Convert financial columns to numeric format"""
         try:
-            financial_pattern = DATA_CONFIG["numeric_columns_pattern"]
-            financial_cols = [col for col in df.columns 
-                            if pd.Series([col]).str.contains(financial_pattern, regex=True).any()]
-            
-            for col in financial_cols:
-                if col in df.columns:
-                    df[col] = df[col].astype(str).str.replace(',', '').str.strip()
-                    df[col] = df[col].replace('', '0')
-                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+            if financial_cols is None:
+                financial_cols = DataLoader.classify_financial_columns(df.columns)
+            
+            financial_cols = [col for col in financial_cols if col in df.columns]
+            if not financial_cols:
+                return df
+            
+            # Columns already parsed as numbers only need blanks filled
+            numeric_cols = [col for col in financial_cols if pd.api.types.is_numeric_dtype(df[col])]
+            text_cols = [col for col in financial_cols if col not in numeric_cols]
+            
+            if numeric_cols:
+                df[numeric_cols] = df[numeric_cols].astype('float64').fillna(0)
+            
+            if text_cols:
+                parsed = DataLoader.parse_financial_values(df[text_cols])
+                df[text_cols] = pd.DataFrame(parsed, index=df.index, columns=text_cols)
                     
             return df
             
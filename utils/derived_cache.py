@@ -0,0 +1,122 @@
+"""
+Content-fingerprinted cache of data derived from session uploads
+"""
+
+import hashlib
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Set, Tuple
+
+import pandas as pd
+import streamlit as st
+
+SESSION_KEY = '_derived_data_cache'
+
+
+class DerivedDataCache:
+    """Memoize values derived from a source DataFrame, keyed on its content.
+
+    Each entry depends on a named source (e.g. ``pl_data``) and is stored
+    under the source's content fingerprint, so every consumer of the same
+    data version shares one computation. When a source is seen with a new
+    fingerprint (a new upload), the entries derived from the old version
+    are dropped. Fingerprints are computed once per DataFrame object.
+    """
+
+    _fingerprints: Dict[int, Tuple[weakref.ref, str]] = {}
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[str, str, Hashable], Any]' = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._dependents: Dict[str, Set[Tuple[str, str, Hashable]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @classmethod
+    def for_session(cls) -> 'DerivedDataCache':
+        """Return the cache of the current Streamlit session"""
+        if SESSION_KEY not in st.session_state:
+            st.session_state[SESSION_KEY] = cls()
+        return st.session_state[SESSION_KEY]
+
+    @classmethod
+    def fingerprint(cls, df: pd.DataFrame) -> str:
+        """Content hash of ``df`` (values, index, columns and dtypes)"""
+        key = id(df)
+        entry = cls._fingerprints.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+        hasher = hashlib.sha1()
+        hasher.update(repr(list(zip(map(str, df.columns), map(str, df.dtypes)))).encode('utf-8'))
+        if len(df):
+            try:
+                row_hashes = pd.util.hash_pandas_object(df, index=True)
+            except TypeError:
+                # Unhashable cells (lists, dicts) are hashed by their text form
+                row_hashes = pd.util.hash_pandas_object(df.astype(str), index=True)
+            hasher.update(row_hashes.to_numpy().tobytes())
+        fingerprint = hasher.hexdigest()
+        cls.remember(df, fingerprint)
+        return fingerprint
+
+    @classmethod
+    def remember(cls, df: pd.DataFrame, fingerprint: str):
+        """Record a known fingerprint of ``df``, e.g. for a frame reloaded from disk"""
+        key = id(df)
+        cls._fingerprints[key] = (weakref.ref(df, lambda _, key=key: cls._fingerprints.pop(key, None)),
+                                  fingerprint)
+
+    def get(self, name: str, source: str, df: pd.DataFrame,
+            compute: Callable[[pd.DataFrame], Any], params: Hashable = ()) -> Any:
+        """Return ``compute(df)`` for this version of ``source``, computing it at most once"""
+        fingerprint = self.fingerprint(df)
+        if self._versions.get(source) != fingerprint:
+            self.invalidate(source)
+            self._versions[source] = fingerprint
+
+        key = (name, fingerprint, params)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        value = compute(df)
+        self._entries[key] = value
+        self._dependents.setdefault(source, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            for dependents in self._dependents.values():
+                dependents.discard(evicted)
+        return value
+
+    def get_frame(self, name: str, source: str, df: pd.DataFrame,
+                  compute: Callable[[pd.DataFrame], pd.DataFrame], params: Hashable = ()) -> pd.DataFrame:
+        """Like ``get()`` for DataFrame results; callers get their own copy they may modify"""
+        # Deep, so edits by callers cannot reach the cached frame without pandas copy-on-write
+        return self.get(name, source, df, compute, params).copy()
+
+    def invalidate(self, source: str = None):
+        """Drop the entries derived from ``source`` (or everything)"""
+        sources = [source] if source is not None else list(self._dependents)
+        for name in sources:
+            for key in self._dependents.pop(name, set()):
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+            self._versions.pop(name, None)
+
+    def stats(self) -> dict:
+        """Return hit/miss/invalidation counters and the entry count"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'invalidations': self.invalidations,
+            'entries': len(self._entries),
+            'sources': dict(self._versions),
+        }
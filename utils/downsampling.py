@@ -0,0 +1,291 @@
+"""
+Level-of-detail downsampling for large Plotly traces
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import Optional, Tuple
+
+from config.settings import CHART_LOD_CONFIG
+from .profiler import profiler
+
+# Per-point trace attributes that are subset together with the coordinates
+POINT_ATTRIBUTES = (
+    'x', 'y', 'z', 'text', 'hovertext', 'customdata', 'ids', 'textposition',
+    'marker.size', 'marker.color', 'marker.symbol', 'marker.opacity',
+    'marker.line.color', 'marker.line.width',
+)
+
+
+class ChartDownsampler:
+    """Reduce traces above a point budget while keeping their shape.
+
+    Line traces use Largest-Triangle-Three-Buckets (LTTB); very long series
+    are first reduced to the min and max of each of ``minmax_ratio x budget``
+    buckets, so the LTTB pass stays small and no peak is lost. Marker-only
+    2D and 3D scatters are binned on a uniform grid and each occupied cell
+    is represented by its point nearest the cell mean, with the number of
+    points it stands for shown in its hover. The global minimum and maximum
+    along every axis are always kept.
+    """
+
+    @staticmethod
+    def numeric_axis(values) -> np.ndarray:
+        """Float positions of axis values (numbers, dates or categories by position)"""
+        array = np.asarray(values)
+        if array.dtype.kind in 'iufb':
+            return array.astype('float64')
+        if array.dtype.kind in 'mM':
+            return array.view('int64').astype('float64')
+        series = pd.Series(array, dtype=object)
+        try:
+            return pd.to_numeric(series).to_numpy(dtype='float64', na_value=np.nan)
+        except (TypeError, ValueError):
+            pass
+        try:
+            dates = pd.to_datetime(series, format='mixed')
+            return dates.to_numpy(dtype='datetime64[ns]').view('int64').astype('float64')
+        except (TypeError, ValueError, OverflowError):
+            return np.arange(len(array), dtype='float64')
+
+    @staticmethod
+    def _bucket_extreme(values: np.ndarray, starts: np.ndarray, reduce) -> np.ndarray:
+        """Position of the first min (or max) in each bucket of ``values`` starting at ``starts``"""
+        extremes = reduce.reduceat(values, starts)
+        bucket = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(values)]))
+        hits = np.flatnonzero(values == extremes[bucket])
+        _, first = np.unique(bucket[hits], return_index=True)
+        return hits[first]
+
+    @staticmethod
+    def minmax_indices(y: np.ndarray, buckets: int) -> np.ndarray:
+        """First, last, and each bucket's min and max positions of a finite series"""
+        interior = y[1:-1]
+        starts = np.unique(np.linspace(0, len(interior), buckets, endpoint=False).astype('int64'))
+        return np.unique(np.concatenate([
+            [0, len(y) - 1],
+            1 + ChartDownsampler._bucket_extreme(interior, starts, np.minimum),
+            1 + ChartDownsampler._bucket_extreme(interior, starts, np.maximum),
+        ]))
+
+    @staticmethod
+    def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int, minmax_ratio: int = None) -> np.ndarray:
+        """Positions of the ``n_out`` LTTB points of a finite, x-ordered series"""
+        n = len(y)
+        if n_out >= n or n_out < 3:
+            return np.arange(n)
+        if minmax_ratio is None:
+            minmax_ratio = CHART_LOD_CONFIG["minmax_ratio"]
+
+        candidates = np.arange(n)
+        if minmax_ratio and n > n_out * minmax_ratio:
+            candidates = ChartDownsampler.minmax_indices(y, n_out * minmax_ratio // 2)
+            if len(candidates) <= n_out:
+                return candidates
+        cx, cy = x[candidates], y[candidates]
+        m = len(candidates)
+
+        # n_out - 2 buckets between the fixed first and last points
+        bounds = np.linspace(1, m - 1, n_out - 1).astype('int64')
+        sizes = np.diff(bounds)
+        next_x = np.append(np.add.reduceat(cx[:-1], bounds[:-1]) / sizes, cx[-1])
+        next_y = np.append(np.add.reduceat(cy[:-1], bounds[:-1]) / sizes, cy[-1])
+
+        selected = np.empty(n_out, dtype='int64')
+        selected[0], selected[-1] = 0, m - 1
+        anchor = 0
+        for bucket in range(n_out - 2):
+            lo, hi = bounds[bucket], bounds[bucket + 1]
+            ax, ay = cx[anchor], cy[anchor]
+            area = np.abs((ax - next_x[bucket + 1]) * (cy[lo:hi] - ay) -
+                          (ax - cx[lo:hi]) * (next_y[bucket + 1] - ay))
+            anchor = lo + int(area.argmax())
+            selected[bucket + 1] = anchor
+        return candidates[selected]
+
+    @staticmethod
+    def grid_indices(coords: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Representative positions of a ``(points, dims)`` cloud and the points each stands for"""
+        n, dims = coords.shape
+        cells = max(1, int(n_out ** (1 / dims)))
+        low = coords.min(axis=0)
+        span = coords.max(axis=0) - low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scaled = np.where(span > 0, (coords - low) / span * cells, 0)
+        binned = np.minimum(scaled.astype('int64'), cells - 1)
+        keys = binned @ (cells ** np.arange(dims, dtype='int64'))
+
+        # Dense cell ids, then per-cell counts and means without sorting the points
+        counts = np.bincount(keys, minlength=cells ** dims)
+        occupied = np.flatnonzero(counts)
+        dense = np.zeros(cells ** dims, dtype='int64')
+        dense[occupied] = np.arange(len(occupied))
+        cell_of = dense[keys]
+        counts = counts[occupied]
+        means = np.column_stack([np.bincount(cell_of, weights=coords[:, dim], minlength=len(occupied))
+                                 for dim in range(dims)]) / counts[:, None]
+
+        # Each cell is represented by its point nearest the cell mean ...
+        distance = ((coords - means[cell_of]) ** 2).sum(axis=1)
+        nearest = np.full(len(occupied), np.inf)
+        np.minimum.at(nearest, cell_of, distance)
+        hits = np.flatnonzero(distance == nearest[cell_of])
+        _, first = np.unique(cell_of[hits], return_index=True)
+        representatives = hits[first]
+
+        # ... unless it holds an axis extreme, which is always shown
+        extremes = np.unique(np.r_[coords.argmin(axis=0), coords.argmax(axis=0)])
+        extra = []
+        for position in extremes:
+            cell = cell_of[position]
+            if representatives[cell] in extremes and representatives[cell] != position:
+                counts[cell] -= 1
+                extra.append(position)
+            else:
+                representatives[cell] = position
+
+        indices = np.r_[representatives, np.asarray(extra, dtype='int64')]
+        weights = np.r_[counts, np.ones(len(extra), dtype='int64')]
+        order = np.argsort(indices)
+        return indices[order], weights[order]
+
+    @staticmethod
+    def line_indices(x, y, n_out: int) -> np.ndarray:
+        """LTTB positions of a line trace, keeping NaN gaps and the y extremes"""
+        y = ChartDownsampler.numeric_axis(y)
+        x = ChartDownsampler.numeric_axis(x) if x is not None else np.arange(len(y), dtype='float64')
+        finite = np.isfinite(x) & np.isfinite(y)
+        valid = np.flatnonzero(finite)
+        if len(valid) == 0:
+            return np.arange(len(y))
+
+        kept = valid[ChartDownsampler.lttb_indices(x[valid], y[valid], n_out)]
+        gaps = np.flatnonzero(~finite & np.r_[False, finite[:-1]])
+        extremes = valid[[y[valid].argmin(), y[valid].argmax()]]
+        return np.unique(np.r_[kept, gaps, extremes])
+
+    @staticmethod
+    def marker_indices(axes, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Grid-binned positions of a marker-only trace and the points each stands for"""
+        coords = np.column_stack([ChartDownsampler.numeric_axis(axis) for axis in axes])
+        valid = np.flatnonzero(np.isfinite(coords).all(axis=1))
+        if len(valid) <= n_out:
+            return valid, np.ones(len(valid), dtype='int64')
+        indices, counts = ChartDownsampler.grid_indices(coords[valid], n_out)
+        return valid[indices], counts
+
+    @staticmethod
+    def trace_points(trace) -> int:
+        """Number of points in a trace (0 for non-scatter traces)"""
+        if trace.type not in ('scatter', 'scattergl', 'scatter3d'):
+            return 0
+        for axis in ('y', 'x'):
+            values = getattr(trace, axis, None)
+            if values is not None:
+                return len(values)
+        return 0
+
+    @staticmethod
+    def subset_trace(trace, indices: np.ndarray, n: int):
+        """Subset every per-point attribute of ``trace`` to ``indices``"""
+        for path in POINT_ATTRIBUTES:
+            owner, attribute = trace, path
+            while '.' in attribute:
+                parent, attribute = attribute.split('.', 1)
+                owner = getattr(owner, parent, None)
+                if owner is None:
+                    break
+            value = getattr(owner, attribute, None) if owner is not None else None
+            if value is None or isinstance(value, str) or np.isscalar(value) or len(value) != n:
+                continue
+            array = np.asarray(value)
+            if array.dtype.kind not in 'iufbmM':
+                array = np.asarray(value, dtype=object)
+            setattr(owner, attribute, array[indices])
+
+    @staticmethod
+    def annotate_counts(trace, indices: np.ndarray, counts: np.ndarray):
+        """Add the number of points each kept marker (at ``indices``) stands for to ``customdata`` and the hover"""
+        if trace.hoverinfo in ('skip', 'none'):
+            return
+        template = trace.hovertemplate
+        if template is not None and not isinstance(template, str):
+            return
+
+        if trace.customdata is None:
+            trace.customdata = counts
+            reference = '%{customdata:,}'
+        else:
+            existing = np.asarray(trace.customdata)
+            if len(existing) != len(indices):
+                # Inside batch_update the trace still returns its customdata before subset_trace
+                existing = existing[indices]
+            if existing.ndim == 1:
+                existing = existing[:, None]
+                template = template.replace('%{customdata}', '%{customdata[0]}') if template else template
+            trace.customdata = np.column_stack([existing, counts])
+            reference = f'%{{customdata[{existing.shape[1]}]:,}}'
+
+        if template is None:
+            axes = ('x', 'y', 'z') if trace.type == 'scatter3d' else ('x', 'y')
+            template = '<br>'.join(f'{axis}=%{{{axis}}}' for axis in axes)
+        line = f'points: {reference}'
+        if '<extra>' in template:
+            template = template.replace('<extra>', f'<br>{line}<extra>', 1)
+        else:
+            template = f'{template}<br>{line}'
+        trace.hovertemplate = template
+
+    @staticmethod
+    def downsample_trace(trace, max_points: int) -> bool:
+        """Reduce one trace to about ``max_points``; returns whether it changed"""
+        n = ChartDownsampler.trace_points(trace)
+        if n <= max_points:
+            return False
+
+        mode = trace.mode or 'lines'
+        counts = None
+        if trace.type == 'scatter3d':
+            if 'lines' in mode:
+                return False
+            indices, counts = ChartDownsampler.marker_indices((trace.x, trace.y, trace.z), max_points)
+        elif 'lines' in mode:
+            indices = ChartDownsampler.line_indices(trace.x, trace.y, max_points)
+        else:
+            x = trace.x if trace.x is not None else np.arange(n)
+            indices, counts = ChartDownsampler.marker_indices((x, trace.y), max_points)
+
+        ChartDownsampler.subset_trace(trace, indices, n)
+        if counts is not None and (counts > 1).any():
+            ChartDownsampler.annotate_counts(trace, indices, counts)
+        trace.meta = {'lod_points': int(n), 'lod_shown': int(len(indices))}
+        return True
+
+    @staticmethod
+    def downsample_figure(fig, max_points: Optional[int] = None, max_points_3d: Optional[int] = None):
+        """Split the point budget across a figure's traces in proportion to their size"""
+        if fig is None or not CHART_LOD_CONFIG["enabled"]:
+            return fig
+        budgets = {
+            False: max_points or CHART_LOD_CONFIG["max_points"],
+            True: max_points_3d or max_points or CHART_LOD_CONFIG["max_points_3d"],
+        }
+
+        for is_3d, budget in budgets.items():
+            traces = [trace for trace in fig.data if (trace.type == 'scatter3d') == is_3d]
+            points = [ChartDownsampler.trace_points(trace) for trace in traces]
+            total = sum(points)
+            if total <= budget:
+                continue
+            with fig.batch_update():
+                for trace, count in zip(traces, points):
+                    share = max(CHART_LOD_CONFIG["min_trace_points"], int(budget * count / total))
+                    ChartDownsampler.downsample_trace(trace, share)
+        return fig
+
+    @staticmethod
+    def render(fig, **kwargs):
+        """Downsample ``fig`` to the configured budget and draw it with st.plotly_chart"""
+        with profiler.span("chart.render"):
+            return st.plotly_chart(ChartDownsampler.downsample_figure(fig), **kwargs)
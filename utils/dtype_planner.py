@@ -0,0 +1,149 @@
+"""
+Dtype planning for ingested frames: narrowest safe storage type per column
+"""
+
+import re
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.constants import CAPITAL_FINANCIAL_PATTERN, EXCEL_COLUMN_FORMATS
+from config.settings import DTYPE_PLAN_CONFIG
+
+UNSIGNED_TYPES = ('uint8', 'uint16', 'uint32', 'uint64')
+SIGNED_TYPES = ('int8', 'int16', 'int32', 'int64')
+
+# Amounts: the columns reports format as currency, and the capital upload's financial columns
+MONEY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern, excel_format, _ in EXCEL_COLUMN_FORMATS
+                  if excel_format.startswith('$')] + [re.compile(CAPITAL_FINANCIAL_PATTERN, re.IGNORECASE)]
+
+
+class DtypePlanner:
+    """Plan and apply the narrowest safe dtype of each column.
+
+    Integers get the smallest signed type holding their range (bounds
+    inclusive), or unsigned when the caller opts in, since arithmetic on
+    unsigned columns wraps below zero; integral floats become integers,
+    nullable when they have blanks. Money columns always become float64,
+    because the dashboards sum and subtract them as stored and narrow
+    types lose whole dollars or wrap. Other floats move to float32 only
+    when every value round-trips exactly.
+    Low-cardinality strings become categoricals and boolean-like object
+    columns nullable booleans. The input frame is never modified.
+    """
+
+    @staticmethod
+    def integer_dtype(low: int, high: int, nullable: bool = False, unsigned: bool = False) -> Optional[str]:
+        """Smallest integer type holding ``[low, high]`` (pandas nullable name if ``nullable``)"""
+        for dtype in (UNSIGNED_TYPES if unsigned and low >= 0 else SIGNED_TYPES):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return dtype.capitalize().replace('Uint', 'UInt') if nullable else dtype
+        return None
+
+    @staticmethod
+    def money_columns(columns: Iterable) -> Set:
+        """Columns holding amounts, by the report naming rules and the capital financial pattern"""
+        return {col for col in columns
+                if isinstance(col, str) and any(pattern.search(col) for pattern in MONEY_PATTERNS)}
+
+    @staticmethod
+    def _float_dtype(values: np.ndarray, unsigned: bool) -> Optional[str]:
+        finite = values[np.isfinite(values)]
+        has_blanks = len(finite) < len(values)
+        if len(finite) == 0:
+            return None
+
+        if not np.isinf(values).any() and np.array_equal(finite, np.trunc(finite)):
+            low, high = finite.min(), finite.max()
+            if -2.0 ** 63 <= low and high < 2.0 ** 63:
+                return DtypePlanner.integer_dtype(int(low), int(high), nullable=has_blanks, unsigned=unsigned)
+
+        return 'float32' if np.array_equal(finite.astype('float32').astype('float64'), finite) else None
+
+    @staticmethod
+    def _text_dtype(series: pd.Series) -> Optional[str]:
+        values = series.dropna()
+        if len(values) == 0:
+            return None
+        if series.dtype == object and values.map(type).isin([bool, np.bool_]).all():
+            return 'boolean'
+
+        if len(series) < DTYPE_PLAN_CONFIG["category_min_rows"]:
+            return None
+        limit = DTYPE_PLAN_CONFIG["category_max_ratio"] * len(values)
+        # A sample rules out identifier-like columns without a full distinct count
+        sample = values.iloc[:10000]
+        if sample.nunique() > DTYPE_PLAN_CONFIG["category_max_ratio"] * len(sample):
+            return None
+        try:
+            return 'category' if values.nunique() <= limit else None
+        except TypeError:
+            # Unhashable cells (lists, dicts) stay as they are
+            return None
+
+    @staticmethod
+    def plan_column(series: pd.Series, money: bool = False, unsigned: bool = False) -> Optional[str]:
+        """Target dtype of one column, or None to keep its current type"""
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            return None
+        if pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype):
+            return None
+
+        if money and pd.api.types.is_numeric_dtype(dtype):
+            target = 'float64'
+        elif pd.api.types.is_integer_dtype(dtype):
+            values = series.dropna()
+            if len(values) == 0:
+                return None
+            target = DtypePlanner.integer_dtype(int(values.min()), int(values.max()),
+                                                nullable=isinstance(dtype, pd.api.extensions.ExtensionDtype),
+                                                unsigned=unsigned)
+        elif pd.api.types.is_float_dtype(dtype):
+            target = DtypePlanner._float_dtype(series.to_numpy(dtype='float64', na_value=np.nan), unsigned)
+        elif pd.api.types.is_string_dtype(dtype) or dtype == object:
+            target = DtypePlanner._text_dtype(series)
+        else:
+            return None
+
+        return target if target is not None and target != str(dtype) else None
+
+    @staticmethod
+    def plan(df: pd.DataFrame, money_columns: Optional[Iterable[str]] = None,
+             unsigned: bool = False) -> Dict[str, str]:
+        """Target dtypes of the columns of ``df`` that can be stored more compactly"""
+        money_columns = DtypePlanner.money_columns(df.columns) if money_columns is None else set(money_columns)
+
+        plan = {}
+        for position, col in enumerate(df.columns):
+            target = DtypePlanner.plan_column(df.iloc[:, position], money=col in money_columns, unsigned=unsigned)
+            if target is not None:
+                plan[col] = target
+        return plan
+
+    @staticmethod
+    def apply(df: pd.DataFrame, plan: Dict[str, str]) -> pd.DataFrame:
+        """Return ``df`` with the planned columns cast; other columns are shared, not copied"""
+        if not plan:
+            return df
+        return df.astype(plan)
+
+    @staticmethod
+    def optimize(df: pd.DataFrame, money_columns: Optional[Iterable[str]] = None,
+                 unsigned: bool = False) -> Tuple[pd.DataFrame, dict]:
+        """Plan and apply compact dtypes; the report is also kept in ``attrs['dtype_plan']``"""
+        before = int(df.memory_usage(deep=True).sum())
+        if not DTYPE_PLAN_CONFIG["enabled"] or df.empty or df.columns.has_duplicates:
+            return df, {'before_bytes': before, 'after_bytes': before, 'columns': {}}
+
+        plan = DtypePlanner.plan(df, money_columns, unsigned)
+        optimized = DtypePlanner.apply(df, plan) if plan else df.copy(deep=False)
+        report = {
+            'before_bytes': before,
+            'after_bytes': int(optimized.memory_usage(deep=True).sum()),
+            'columns': plan,
+        }
+        optimized.attrs['dtype_plan'] = report
+        return optimized, report
@@ -0,0 +1,105 @@
+"""
+Column widths and number formats of Excel report sheets
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.constants import EXCEL_COLUMN_FORMATS
+from config.settings import REPORT_CONFIG
+
+# Display width of datetimes in the streaming writer's default date format
+DATETIME_WIDTH = len('yyyy-mm-dd hh:mm:ss')
+
+
+@lru_cache(maxsize=1)
+def _compiled_formats() -> List[Tuple[re.Pattern, str, str]]:
+    return [(re.compile(pattern, re.IGNORECASE), excel_format, python_format)
+            for pattern, excel_format, python_format in EXCEL_COLUMN_FORMATS]
+
+
+class ExcelFormatPlanner:
+    """Plan the width and number format of each column of a report sheet.
+
+    Number formats follow the naming conventions in EXCEL_COLUMN_FORMATS
+    (amounts, scaled amounts, percentage points). Numeric columns are sized
+    from their extremes as they will be displayed, dates from the date
+    format, categoricals from their categories and other text from a
+    bounded, evenly spaced sample of rows, so no cell is ever converted to
+    a string just to measure it.
+    """
+
+    @staticmethod
+    def number_format(column) -> Tuple[Optional[str], Optional[str]]:
+        """Excel number format of a column by its name, with the Python format that renders alike"""
+        for regex, excel_format, python_format in _compiled_formats():
+            if regex.search(str(column)):
+                return excel_format, python_format
+        return None, None
+
+    @staticmethod
+    def sample_positions(rows: int, sample_rows: Optional[int] = None) -> np.ndarray:
+        """At most ``sample_rows`` evenly spaced row positions, first and last included"""
+        sample_rows = sample_rows or REPORT_CONFIG["width_sample_rows"]
+        if rows <= sample_rows:
+            return np.arange(rows)
+        return np.unique(np.linspace(0, rows - 1, sample_rows).astype('int64'))
+
+    @staticmethod
+    def _numeric_width(series: pd.Series, python_format: Optional[str]) -> int:
+        """Displayed width of the column's extremes (a vectorised min/max, no strings)"""
+        low, high = series.min(), series.max()
+        if pd.isna(low):
+            return 0
+        if not (np.isfinite(low) and np.isfinite(high)):
+            return len('#NUM!')
+        if python_format is not None:
+            return max(len(python_format.format(low)), len(python_format.format(high)))
+        if pd.api.types.is_integer_dtype(series.dtype):
+            return max(len(str(int(low))), len(str(int(high))))
+        # Excel's General format shows about ten significant digits
+        return max(len(f"{low:.10g}"), len(f"{high:.10g}"))
+
+    @staticmethod
+    def _text_width(series: pd.Series, sample: pd.Series) -> int:
+        """Longest text in the categories of a categorical, or in the sampled rows otherwise"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.categories
+        else:
+            values = sample.dropna()
+        if len(values) == 0:
+            return 0
+        return int(values.astype(str).str.len().max())
+
+    @staticmethod
+    def column_width(series: pd.Series, sample: pd.Series, python_format: Optional[str] = None) -> int:
+        """Estimated display width in characters of the values of one column"""
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            return len('FALSE')
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return DATETIME_WIDTH
+        if pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+            return ExcelFormatPlanner._numeric_width(series, python_format)
+        return ExcelFormatPlanner._text_width(series, sample)
+
+    @staticmethod
+    def plan(df: pd.DataFrame, sample_rows: Optional[int] = None,
+             max_width: Optional[int] = None) -> List[Tuple[int, Optional[str]]]:
+        """Width and Excel number format (or None) of each column of ``df``"""
+        max_width = max_width or REPORT_CONFIG["max_column_width"]
+        sample = df.iloc[ExcelFormatPlanner.sample_positions(len(df), sample_rows)]
+
+        plan = []
+        for position, col in enumerate(df.columns):
+            excel_format, python_format = ExcelFormatPlanner.number_format(col)
+            series = df.iloc[:, position]
+            if not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+                excel_format = python_format = None
+            width = ExcelFormatPlanner.column_width(series, sample.iloc[:, position], python_format)
+            plan.append((min(max(width, len(str(col))) + 2, max_width), excel_format))
+        return plan
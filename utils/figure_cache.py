@@ -0,0 +1,192 @@
+"""
+In-memory cache of serialised Plotly figures keyed by data version and view
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Optional
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from config.settings import FIGURE_CACHE_CONFIG
+from utils.derived_cache import DerivedDataCache
+from utils.downsampling import ChartDownsampler
+from utils.profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+
+class FigureCache:
+    """LRU cache of figure JSON under a byte budget.
+
+    Entries are keyed by the builder function, a content hash of the data
+    it reads and its view parameters, so a rerun that only changed an
+    unrelated widget is served the stored figure instead of rebuilding it.
+    Figures are downsampled before they are stored; a hit rebuilds the
+    figure from its JSON without re-running Plotly's validation. The cache
+    is shared by every session of the process.
+    """
+
+    def __init__(self, max_size_mb: Optional[int] = None, enabled: Optional[bool] = None):
+        self.max_size_bytes = (max_size_mb or FIGURE_CACHE_CONFIG["max_size_mb"]) * 1024 * 1024
+        self.enabled = FIGURE_CACHE_CONFIG["enabled"] if enabled is None else enabled
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._sizes = {}
+        self._labels = {}
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def data_version(value: Any) -> str:
+        """Content hash of a figure input (DataFrames by value, other objects by their JSON/repr)"""
+        if isinstance(value, pd.DataFrame):
+            return DerivedDataCache.fingerprint(value)
+        if isinstance(value, tuple):
+            return '(' + ','.join(FigureCache.data_version(item) for item in value) + ')'
+        try:
+            text = json.dumps(value, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            text = repr(value)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_key(name: str, *parts: Any) -> str:
+        """Build the cache key of figure builder ``name`` for the given inputs"""
+        hasher = hashlib.sha1(name.encode('utf-8'))
+        for part in parts:
+            hasher.update(b'|' + FigureCache.data_version(part).encode('utf-8'))
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _encode(figure) -> Optional[bytes]:
+        if figure is None:
+            return None
+        return ChartDownsampler.downsample_figure(figure).to_json().encode('utf-8')
+
+    @staticmethod
+    def _decode(payload: Optional[bytes]):
+        if payload is None:
+            return None
+        return go.Figure(json.loads(payload), _validate=False)
+
+    def get(self, key: str):
+        """Return a fresh copy of the cached figure (or tuple of figures) for ``key``, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        if isinstance(entry, tuple):
+            return tuple(self._decode(payload) for payload in entry)
+        return self._decode(entry)
+
+    def put(self, key: str, value, label: Optional[str] = None) -> bool:
+        """Serialise and store a figure (or tuple of figures); returns False if not cacheable"""
+        if not self.enabled or value is None:
+            return False
+        try:
+            entry = tuple(self._encode(fig) for fig in value) if isinstance(value, tuple) else self._encode(value)
+        except Exception as e:
+            logger.warning(f"Could not cache figure {key[:12]}: {e}")
+            return False
+
+        size = sum(len(payload) for payload in entry if payload) if isinstance(entry, tuple) else len(entry)
+        if size > self.max_size_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self.size_bytes -= self._sizes[key]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._labels[key] = label or 'figure'
+            self.size_bytes += size
+            self._evict()
+        return True
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget"""
+        while self.size_bytes > self.max_size_bytes and self._entries:
+            key, _ = self._entries.popitem(last=False)
+            self.size_bytes -= self._sizes.pop(key)
+            self._labels.pop(key, None)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove every cache entry"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._labels.clear()
+            self.size_bytes = 0
+
+    def entry_size(self, key: str) -> int:
+        """Serialised size in bytes of the entry stored under ``key`` (0 if absent)"""
+        return self._sizes.get(key, 0)
+
+    def payloads(self) -> pd.DataFrame:
+        """Stored figure JSON per builder: entry count, total and largest payload"""
+        with self._lock:
+            entries = pd.DataFrame({'Figure': list(self._labels.values()),
+                                    'Size_KB': [self._sizes[key] / 1024 for key in self._labels]})
+        return (entries.groupby('Figure', as_index=False)
+                .agg(Entries=('Size_KB', 'size'), Total_KB=('Size_KB', 'sum'), Largest_KB=('Size_KB', 'max'))
+                .sort_values('Total_KB', ascending=False, ignore_index=True))
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and the memory footprint"""
+        total = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'size_mb': self.size_bytes / 1024**2
+        }
+
+
+# Global figure cache
+figure_cache = FigureCache()
+
+
+def cached_figure(depends_on: Optional[Callable[[], Any]] = None):
+    """Decorator serving a figure builder's result from the figure cache.
+
+    The key covers the function, its arguments (DataFrames by content) and
+    whatever ``depends_on`` returns - the session data the builder reads
+    and any other view state, e.g. the current date.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.span(f"figure.{func.__name__}") as span:
+                if not figure_cache.enabled:
+                    return func(*args, **kwargs)
+
+                key = figure_cache.make_key(name, args, tuple(sorted(kwargs.items())),
+                                            depends_on() if depends_on else None)
+                figure = figure_cache.get(key)
+                span.set(cached=figure is not None)
+                if figure is None:
+                    with profiler.span(f"figure.{func.__name__}.build"):
+                        figure = func(*args, **kwargs)
+                    figure_cache.put(key, figure, label=func.__name__)
+                span.set(payload_kb=round(figure_cache.entry_size(key) / 1024, 1))
+                return figure
+        return wrapper
+    return decorator
@@ -0,0 +1,268 @@
+"""
+Batched 3D figure builders: one Scatter3d trace per category
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from typing import Callable, Iterable, Tuple
+
+SERVICE_LINES = ('Fund_Accounting', 'Fund_Administration', 'Transfer_Agency', 'Regulatory_Reporting')
+SERVICE_COLORS = {'Fund_Accounting': '#FF6B6B', 'Fund_Administration': '#4ECDC4',
+                  'Transfer_Agency': '#45B7D1', 'Regulatory_Reporting': '#96CEB4'}
+SERVICE_REVENUE_COLUMNS = [f"{service}_Revenue_USD" for service in SERVICE_LINES]
+
+
+class Chart3DBuilder:
+    """Build the 3D analysis figures from column arrays.
+
+    Points are grouped by category and each group becomes a single
+    ``Scatter3d`` trace whose marker size, symbol, text and customdata are
+    per-point arrays. Network edges of a category are drawn as one line
+    trace, with segments separated by NaN gaps. Trace count therefore
+    scales with the number of categories instead of rows or edges.
+    """
+
+    @staticmethod
+    def truncate_labels(names: pd.Series, length: int) -> np.ndarray:
+        """Labels cut to ``length`` characters with an ellipsis"""
+        names = names.astype(str)
+        return np.where(names.str.len() > length, names.str.slice(0, length) + '...', names).astype(object)
+
+    @staticmethod
+    def category_groups(categories: Iterable) -> Iterable[Tuple[object, np.ndarray]]:
+        """``(category, positions)`` pairs in order of first appearance"""
+        codes, uniques = pd.factorize(pd.Series(categories), use_na_sentinel=False)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for code, category in enumerate(uniques):
+            yield category, order[bounds[code]:bounds[code + 1]]
+
+    @staticmethod
+    def segment_coordinates(points: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        """``(3, 3 * edges)`` line coordinates: start, end, NaN gap per edge"""
+        coordinates = np.full((len(edges), 3, 3), np.nan)
+        coordinates[:, 0] = points[edges[:, 0]]
+        coordinates[:, 1] = points[edges[:, 1]]
+        return coordinates.reshape(-1, 3).T
+
+    @staticmethod
+    def dominant_services(pl_analysis: pd.DataFrame) -> np.ndarray:
+        """Service line with the highest revenue per client (first on ties, NaN ignored)"""
+        revenues = pl_analysis[SERVICE_REVENUE_COLUMNS].to_numpy(dtype='float64', na_value=np.nan)
+        positions = np.where(np.isnan(revenues), -np.inf, revenues).argmax(axis=1)
+        return np.asarray(SERVICE_LINES, dtype=object)[positions]
+
+    @staticmethod
+    def service_diversity(pl_analysis: pd.DataFrame) -> np.ndarray:
+        """Shannon entropy of each client's service line revenue mix"""
+        revenues = pl_analysis[SERVICE_REVENUE_COLUMNS].to_numpy(dtype='float64', na_value=np.nan)
+        totals = revenues.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            proportions = revenues / totals[:, None]
+            terms = np.where(revenues > 0, proportions * np.log(proportions), 0.0)
+        return np.where(totals > 0, -terms.sum(axis=1), 0.0)
+
+    @staticmethod
+    def pl_profitability(pl_analysis: pd.DataFrame) -> go.Figure:
+        """Revenue x Costs x AUM, one trace per dominant service line"""
+        fig = go.Figure()
+
+        revenue = pl_analysis['Total_Annual_Revenue_USD'].to_numpy(dtype='float64', na_value=np.nan)
+        costs = pl_analysis['Total_Costs'].to_numpy(dtype='float64', na_value=np.nan)
+        aum = pl_analysis['Fund_AUM_USD_Millions'].to_numpy(dtype='float64', na_value=np.nan)
+        margin = pl_analysis['Gross_Margin_Percent'].to_numpy(dtype='float64', na_value=np.nan)
+        revenue_bps = pl_analysis['Revenue_Per_AUM_BPS'].to_numpy(dtype='float64', na_value=np.nan)
+
+        # fmin/fmax keep the clamp's NaN handling: a NaN margin gets the largest marker
+        sizes = np.fmax(5, np.fmin(30, np.abs(margin) * 0.8 + 5))
+        symbols = np.where(margin > 25, 'diamond', 'circle').astype(object)
+        labels = Chart3DBuilder.truncate_labels(pl_analysis['Client_Name'], 8)
+        services = Chart3DBuilder.dominant_services(pl_analysis)
+        customdata = np.column_stack([pl_analysis['Client_Name'].to_numpy(dtype=object), margin,
+                                      revenue_bps, np.char.replace(services.astype(str), '_', ' ')])
+
+        for service, rows in Chart3DBuilder.category_groups(services):
+            fig.add_trace(go.Scatter3d(
+                x=revenue[rows],
+                y=costs[rows],
+                z=aum[rows],
+                mode='markers+text',
+                marker=dict(
+                    size=sizes[rows],
+                    color=SERVICE_COLORS.get(service, '#B0B0B0'),
+                    opacity=0.8,
+                    line=dict(width=2, color='white'),
+                    symbol=symbols[rows]
+                ),
+                text=labels[rows],
+                textposition="top center",
+                name=f"{service.replace('_', ' ')} Focused",
+                showlegend=True,
+                hovertemplate='<b>%{customdata[0]}</b><br>' +
+                             'Revenue: $%{x:,.0f}<br>' +
+                             'Costs: $%{y:,.0f}<br>' +
+                             'AUM: $%{z:,.0f}M<br>' +
+                             'Gross Margin: %{customdata[1]:.1f}%<br>' +
+                             'Revenue per AUM: %{customdata[2]:.1f} bps<br>' +
+                             'Dominant Service: %{customdata[3]}<br>' +
+                             '<extra></extra>',
+                customdata=customdata[rows]
+            ))
+
+        revenue_range = [np.nanmin(revenue), np.nanmax(revenue)]
+        cost_range = [np.nanmin(costs), np.nanmax(costs)]
+        aum_range = [np.nanmin(aum), np.nanmax(aum)]
+
+        # Break-even plane (Revenue = Costs)
+        fig.add_trace(go.Mesh3d(
+            x=[revenue_range[0], revenue_range[1], revenue_range[1], revenue_range[0]],
+            y=[revenue_range[0], revenue_range[1], revenue_range[1], revenue_range[0]],
+            z=[aum_range[0], aum_range[0], aum_range[1], aum_range[1]],
+            opacity=0.15,
+            color='red',
+            name='Break-Even Plane',
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+
+        fig.update_layout(
+            title="3D P&L Analysis: Revenue × Costs × AUM",
+            scene=dict(
+                xaxis_title="Total Annual Revenue (USD) →",
+                yaxis_title="Total Costs (USD) →",
+                zaxis_title="Fund AUM (USD Millions) →",
+                camera=dict(eye=dict(x=1.5, y=1.5, z=1.2)),
+                annotations=[
+                    dict(x=revenue_range[1]*0.8, y=cost_range[0]*1.2, z=aum_range[1]*0.8,
+                         text="💰 High Profit Zone", showarrow=False,
+                         bgcolor="rgba(0,255,0,0.2)", bordercolor="green"),
+                    dict(x=revenue_range[0]*1.2, y=cost_range[1]*0.8, z=aum_range[0]*1.2,
+                         text="⚠️ Loss Zone", showarrow=False,
+                         bgcolor="rgba(255,0,0,0.2)", bordercolor="red")
+                ]
+            ),
+            width=900,
+            height=700
+        )
+        return fig
+
+    @staticmethod
+    def service_line(pl_analysis: pd.DataFrame) -> go.Figure:
+        """Service diversity x Gross margin x Revenue per AUM in a single trace"""
+        fig = go.Figure()
+        revenue = pl_analysis['Total_Annual_Revenue_USD'].to_numpy(dtype='float64', na_value=np.nan)
+
+        fig.add_trace(go.Scatter3d(
+            x=Chart3DBuilder.service_diversity(pl_analysis),
+            y=pl_analysis['Gross_Margin_Percent'].to_numpy(dtype='float64', na_value=np.nan),
+            z=pl_analysis['Revenue_Per_AUM_BPS'].to_numpy(dtype='float64', na_value=np.nan),
+            mode='markers+text',
+            marker=dict(
+                size=np.clip(revenue / 20000, 5, 30),  # Size by revenue, clamped between 5-30
+                color=pl_analysis['Number_of_Funds'].to_numpy(),
+                colorscale='Viridis',
+                showscale=True,
+                colorbar=dict(title="Number of Funds"),
+                opacity=0.8,
+                line=dict(width=2, color='white')
+            ),
+            text=Chart3DBuilder.truncate_labels(pl_analysis['Client_Name'], 6),
+            textposition="middle center",
+            name="Clients",
+            hovertemplate='<b>%{customdata[0]}</b><br>' +
+                         'Service Diversity: %{x:.2f}<br>' +
+                         'Gross Margin: %{y:.1f}%<br>' +
+                         'Revenue per AUM: %{z:.1f} bps<br>' +
+                         'Number of Funds: %{customdata[1]}<br>' +
+                         'Total Revenue: $%{customdata[2]:,.0f}<br>' +
+                         '<extra></extra>',
+            customdata=np.column_stack([pl_analysis['Client_Name'].to_numpy(dtype=object),
+                                        pl_analysis['Number_of_Funds'].to_numpy(dtype=object), revenue])
+        ))
+
+        fig.update_layout(
+            title="3D Service Line Analysis: Diversity × Profitability × Efficiency",
+            scene=dict(
+                xaxis_title="Service Line Diversity Index →",
+                yaxis_title="Gross Margin (%) →",
+                zaxis_title="Revenue per AUM (bps) →",
+                camera=dict(eye=dict(x=1.5, y=1.5, z=1.5))
+            ),
+            width=900,
+            height=700
+        )
+        return fig
+
+    @staticmethod
+    def network(workstreams: pd.DataFrame, category_color: Callable[[str], str]) -> go.Figure:
+        """Workstreams on a circle (radius = complexity, height = risk), linked within categories"""
+        fig = go.Figure()
+
+        count = len(workstreams)
+        angles = np.arange(count) * (2 * np.pi / count)
+        radius = workstreams['complexity'].to_numpy(dtype='float64', na_value=np.nan)
+        points = np.column_stack([radius * np.cos(angles), radius * np.sin(angles),
+                                  workstreams['risk'].to_numpy(dtype='float64', na_value=np.nan)])
+        groups = list(Chart3DBuilder.category_groups(workstreams['category']))
+
+        # Dependency connections (simplified - chain workstreams of the same category)
+        for category, rows in groups:
+            if len(rows) < 2:
+                continue
+            x, y, z = Chart3DBuilder.segment_coordinates(points, np.column_stack([rows[:-1], rows[1:]]))
+            fig.add_trace(go.Scatter3d(
+                x=x,
+                y=y,
+                z=z,
+                mode='lines',
+                line=dict(color=category_color(category), width=4),
+                opacity=0.5,
+                showlegend=False,
+                hoverinfo='skip',
+                connectgaps=False
+            ))
+
+        investment = workstreams['investment'].to_numpy(dtype='float64', na_value=np.nan)
+        labels = Chart3DBuilder.truncate_labels(workstreams['name'], 8)
+        customdata = np.column_stack([workstreams['category'].to_numpy(dtype=object), investment,
+                                      workstreams['complexity'].to_numpy(dtype=object),
+                                      workstreams['risk'].to_numpy(dtype=object)])
+
+        for category, rows in groups:
+            fig.add_trace(go.Scatter3d(
+                x=points[rows, 0],
+                y=points[rows, 1],
+                z=points[rows, 2],
+                mode='markers+text',
+                marker=dict(
+                    size=investment[rows] * 5,
+                    color=category_color(category),
+                    opacity=0.8,
+                    line=dict(width=2, color='white')
+                ),
+                text=labels[rows],
+                textposition="middle center",
+                name=category,
+                showlegend=False,
+                hovertemplate='<b>%{text}</b><br>' +
+                             'Category: %{customdata[0]}<br>' +
+                             'Investment: $%{customdata[1]:.1f}M<br>' +
+                             'Complexity: %{customdata[2]}/10<br>' +
+                             'Risk: %{customdata[3]}/10<br>' +
+                             '<extra></extra>',
+                customdata=customdata[rows]
+            ))
+
+        fig.update_layout(
+            title="3D Network Analysis: Workstream Interdependencies",
+            scene=dict(
+                xaxis_title="Network Position X",
+                yaxis_title="Network Position Y",
+                zaxis_title="Risk Level →",
+                camera=dict(eye=dict(x=1.8, y=1.8, z=1.2))
+            ),
+            width=900,
+            height=700
+        )
+        return fig
@@ -0,0 +1,128 @@
+"""
+Reusable categorical filter index for sidebar filters
+"""
+
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sentinel used by the sidebar selectboxes for "no filter"
+ALL_VALUES = 'All'
+
+
+class FilterIndex:
+    """Categorical code arrays and per-value bitmaps of a DataFrame's filter columns.
+
+    Each column is factorized once into an integer code array plus its
+    sorted distinct values. The boolean bitmap of a selected value is built
+    on first use and kept, so a conjunctive filter is a bitwise AND of cached
+    bitmaps. Use ``for_frame()`` to share one index per DataFrame object;
+    frames are assumed not to be mutated in place after indexing.
+    """
+
+    _registry: Dict[int, Tuple[weakref.ref, 'FilterIndex']] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, df: pd.DataFrame):
+        self._frame = weakref.ref(df)
+        self.n_rows = len(df)
+        self._codes: Dict[str, np.ndarray] = {}
+        self._uniques: Dict[str, pd.Index] = {}
+        self._options: Dict[str, List[Any]] = {}
+        self._bitmaps: Dict[Tuple[str, int], np.ndarray] = {}
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame) -> 'FilterIndex':
+        """Return the shared index of ``df``, building it on first request"""
+        key = id(df)
+        with cls._lock:
+            entry = cls._registry.get(key)
+            if entry is not None and entry[0]() is df:
+                return entry[1]
+
+            index = cls(df)
+            ref = weakref.ref(df, lambda _, key=key: cls._forget(key))
+            cls._registry[key] = (ref, index)
+            index._frame = ref
+            return index
+
+    @classmethod
+    def _forget(cls, key: int):
+        with cls._lock:
+            entry = cls._registry.get(key)
+            if entry is not None and entry[0]() is None:
+                del cls._registry[key]
+
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        return self._frame()
+
+    def _index_column(self, col: str):
+        if col not in self._codes:
+            codes, uniques = pd.factorize(self.df[col], sort=True)
+            self._codes[col] = codes
+            self._uniques[col] = uniques
+
+    def codes(self, col: str) -> np.ndarray:
+        """``(rows,)`` code array of ``col``; -1 marks missing values"""
+        self._index_column(col)
+        return self._codes[col]
+
+    def uniques(self, col: str) -> pd.Index:
+        """Sorted distinct non-null values of ``col``, in code order"""
+        self._index_column(col)
+        return self._uniques[col]
+
+    def options(self, col: str) -> List[Any]:
+        """Sorted distinct non-null values of ``col`` as a cached list"""
+        if col not in self._options:
+            self._options[col] = self.uniques(col).tolist()
+        return self._options[col]
+
+    def code_of(self, col: str, value: Any) -> int:
+        """Code of ``value`` in ``col``, or -1 if the value does not occur"""
+        return int(self.uniques(col).get_indexer([value])[0])
+
+    def bitmap(self, col: str, value: Any) -> np.ndarray:
+        """``(rows,)`` boolean bitmap of the rows where ``col == value``"""
+        code = self.code_of(col, value)
+        if code < 0:
+            return np.zeros(self.n_rows, dtype=bool)
+
+        key = (col, code)
+        if key not in self._bitmaps:
+            self._bitmaps[key] = self.codes(col) == code
+        return self._bitmaps[key]
+
+    def mask(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """AND of the bitmaps of every active filter; None when nothing is filtered"""
+        df = self.df
+        active = [(col, value) for col, value in filters.items()
+                  if value != ALL_VALUES and col in df.columns]
+        if not active:
+            return None
+
+        mask = self.bitmap(*active[0])
+        if len(active) > 1:
+            mask = mask.copy()
+            for col, value in active[1:]:
+                np.logical_and(mask, self.bitmap(col, value), out=mask)
+        return mask
+
+    def positions(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Row positions matching ``filters``; None when nothing is filtered"""
+        mask = self.mask(filters)
+        return None if mask is None else np.flatnonzero(mask)
+
+    def select(self, filters: Dict[str, Any]) -> pd.DataFrame:
+        """Rows matching ``filters``.
+
+        The unfiltered frame is returned as is; otherwise only the matching
+        rows are gathered, without a defensive copy of the source first.
+        """
+        positions = self.positions(filters)
+        if positions is None:
+            return self.df
+        return self.df.iloc[positions]
@@ -0,0 +1,157 @@
+"""
+Self-contained HTML reports with one shared Plotly bundle
+"""
+
+import base64
+import gzip
+import hashlib
+from functools import lru_cache
+from typing import Any, Optional, Union
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from config.settings import REPORT_CONFIG
+from .downsampling import ChartDownsampler
+
+# Typed array element types plotly.js decodes from base64 (it has no 64-bit integers)
+TYPED_ARRAY_DTYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4', 'f4', 'f8')
+
+BOOTSTRAP_JS = """
+(function () {
+    var bundle = JSON.parse(document.getElementById('report-figures').textContent);
+    bundle.figures.forEach(function (figure) {
+        if (figure.template) { figure.layout.template = bundle.templates[figure.template]; }
+        Plotly.newPlot(figure.id, figure.data, figure.layout, bundle.config);
+    });
+})();
+"""
+
+
+@lru_cache(maxsize=1)
+def _plotly_js() -> str:
+    # The minified bundle is several MB; read it once per process
+    return get_plotlyjs()
+
+
+class HTMLChartBundle:
+    """The Plotly figures of one HTML report, embedded without a CDN.
+
+    ``div`` returns a placeholder for each figure where it should appear;
+    ``scripts`` then emits plotly.js inline exactly once, every figure's
+    data in a single JSON block and a loader that draws them, so the report
+    opens offline. Figures are downsampled to the chart point budget,
+    numeric arrays are stored as base64 typed arrays in the smallest exact
+    element type, and layout templates shared by several figures are
+    stored once.
+    """
+
+    def __init__(self, min_array_length: Optional[int] = None):
+        self.min_array_length = min_array_length or REPORT_CONFIG["html_min_typed_array"]
+        self.figures = []
+        self.templates = {}
+
+    @staticmethod
+    def _narrowest(values: np.ndarray) -> Optional[np.ndarray]:
+        """``values`` in the smallest typed array element type that holds them exactly, or None"""
+        if values.dtype.kind == 'f':
+            whole = len(values) and np.isfinite(values).all() and np.array_equal(values, np.round(values))
+            if not (whole and np.abs(values).max() < 2**31):
+                return values.astype('<f4' if values.dtype.itemsize == 4 else '<f8')
+            values = values.astype('int64')
+        for code in TYPED_ARRAY_DTYPES[:6]:
+            info = np.iinfo(code)
+            if info.min <= values.min() and values.max() <= info.max:
+                return values.astype('<' + code)
+        return values.astype('<f8') if np.abs(values).max() < 2**53 else None
+
+    @staticmethod
+    def _decode(spec: dict) -> np.ndarray:
+        """Values of a typed array spec plotly has already encoded"""
+        values = np.frombuffer(base64.b64decode(spec['bdata']), dtype='<' + spec['dtype'])
+        if 'shape' in spec:
+            values = values.reshape([int(size) for size in str(spec['shape']).split(',')])
+        return values
+
+    def _typed_array(self, value: Any) -> Optional[dict]:
+        """Base64 typed array spec of a numeric list or array, or None to leave it as JSON"""
+        if isinstance(value, dict) and 'bdata' in value and value.get('dtype') in TYPED_ARRAY_DTYPES:
+            value = self._decode(value)
+        if not isinstance(value, (list, tuple, np.ndarray)) or len(value) < self.min_array_length:
+            return None
+        if isinstance(value, np.ndarray):
+            values = value
+        else:
+            if not all(isinstance(item, (int, float, np.number)) and not isinstance(item, (bool, np.bool_))
+                       for item in value):
+                return None
+            values = np.asarray(value, dtype='float64')
+        if values.ndim not in (1, 2) or values.dtype.kind not in 'iuf' or values.size == 0:
+            return None
+
+        narrowed = self._narrowest(values.ravel())
+        if narrowed is None:
+            return None
+        spec = {'dtype': narrowed.dtype.str[1:], 'bdata': base64.b64encode(narrowed.tobytes()).decode('ascii')}
+        if values.ndim == 2:
+            spec['shape'] = f"{values.shape[0]},{values.shape[1]}"
+        return spec
+
+    def _compact(self, value: Any) -> Any:
+        """Trace properties with numeric arrays replaced by typed array specs"""
+        typed = self._typed_array(value)
+        if typed is not None:
+            return typed
+        if isinstance(value, dict):
+            return {key: self._compact(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)) and any(isinstance(item, (dict, list, tuple)) for item in value):
+            return [self._compact(item) for item in value]
+        return value
+
+    def div(self, figure: Optional[go.Figure], placeholder: str = '<p>N/A</p>') -> str:
+        """Register ``figure`` and return the element it is drawn into (``placeholder`` if None)"""
+        if figure is None:
+            return placeholder
+        figure = ChartDownsampler.downsample_figure(go.Figure(figure))
+        plotly_json = figure.to_plotly_json()
+
+        layout = dict(plotly_json.get('layout', {}))
+        template_key = None
+        template = layout.pop('template', None)
+        if template:
+            template_json = pio.json.to_json_plotly(template)
+            template_key = hashlib.md5(template_json.encode('utf-8')).hexdigest()[:12]
+            self.templates.setdefault(template_key, template)
+
+        figure_id = f"report-figure-{len(self.figures)}"
+        self.figures.append({
+            'id': figure_id,
+            'data': [self._compact(trace) for trace in plotly_json.get('data', [])],
+            'layout': layout,
+            'template': template_key,
+        })
+        height = f"{layout['height']}px" if layout.get('height') else '100%'
+        width = f"{layout['width']}px" if layout.get('width') else '100%'
+        return f'<div id="{figure_id}" class="plotly-graph-div" style="height:{height}; width:{width};"></div>'
+
+    def scripts(self) -> str:
+        """plotly.js, the figure data and the loader; empty if the report has no figures"""
+        if not self.figures:
+            return ""
+        bundle = pio.json.to_json_plotly({
+            'config': {'responsive': True, 'displaylogo': False},
+            'templates': self.templates,
+            'figures': self.figures,
+        })
+        return (f'<script type="text/javascript">{_plotly_js()}</script>\n'
+                f'<script type="application/json" id="report-figures">{bundle}</script>\n'
+                f'<script type="text/javascript">{BOOTSTRAP_JS}</script>')
+
+    @staticmethod
+    def compress(html: Union[str, bytes]) -> bytes:
+        """Gzip a finished report for e-mail or archiving"""
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+        return gzip.compress(html, compresslevel=REPORT_CONFIG["gzip_level"])
@@ -0,0 +1,150 @@
+"""
+Vectorized P&L metric engine with assumption scenarios
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from config.settings import PL_CONFIG
+from .profiler import profiled
+
+# Source columns read by the engine
+PL_INPUT_COLUMNS = (
+    'Fund_Accountants_Required',
+    'Average_Accountant_Salary_USD',
+    'Fully_Burdened_Cost_Multiplier',
+    'Senior_Manager_Time_Percent',
+    'Manager_Hourly_Rate_USD',
+    'Software_License_Cost_USD',
+    'Data_Provider_Costs_USD',
+    'Cloud_Infrastructure_USD',
+    'Total_Annual_Revenue_USD',
+    'Number_of_Funds',
+    'Fund_AUM_USD_Millions',
+)
+
+# Derived columns, in output order along the metric axis
+PL_METRICS = (
+    'Total_Direct_Labor_Cost',
+    'Manager_Oversight_Cost',
+    'Total_Technology_Cost',
+    'Total_Direct_Costs',
+    'Overhead_Allocation',
+    'Total_Costs',
+    'Gross_Profit',
+    'Gross_Margin_Percent',
+    'Revenue_Per_Fund',
+    'Cost_Per_Fund',
+    'Profit_Per_Fund',
+    'Revenue_Per_AUM_BPS',
+    'Cost_Per_AUM_BPS',
+)
+
+SCENARIO_KEYS = ('overhead_rate', 'annual_hours', 'burden_multiplier')
+
+
+class PLMetrics:
+    """Compute every derived P&L column in one pass over a NumPy block.
+
+    The input columns are read once into a ``(inputs, clients)`` float64
+    block and all metrics are written into one preallocated array, viewed
+    as ``(scenarios, clients, metrics)``, so a batch of assumption
+    scenarios (overhead rate, annual hours, burden multiplier) costs one
+    broadcasted pass. The source frame is never copied: ``calculate()``
+    returns it joined with the derived columns.
+    """
+
+    @staticmethod
+    def scenario(**overrides: Any) -> Dict[str, Any]:
+        """An assumption scenario: PL_CONFIG with ``overrides`` applied"""
+        unknown = [key for key in overrides if key not in SCENARIO_KEYS]
+        if unknown:
+            raise ValueError(f"Unknown P&L assumptions: {', '.join(unknown)}")
+        return {key: overrides.get(key, PL_CONFIG[key]) for key in SCENARIO_KEYS}
+
+    @staticmethod
+    def _scenario_vectors(scenarios: Sequence[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+        """``(scenarios, 1)`` column vectors of each assumption; NaN burden = per-client value"""
+        vectors = {}
+        for key in SCENARIO_KEYS:
+            values = [scenario.get(key, PL_CONFIG[key]) for scenario in scenarios]
+            vectors[key] = np.array([np.nan if value is None else value for value in values],
+                                    dtype='float64')[:, None]
+        return vectors
+
+    @staticmethod
+    def _input_block(df: pd.DataFrame) -> np.ndarray:
+        """``(inputs, clients)`` float64 block of the source columns"""
+        missing = [col for col in PL_INPUT_COLUMNS if col not in df.columns]
+        if missing:
+            raise KeyError(f"P&L data is missing columns: {', '.join(missing)}")
+        return df[list(PL_INPUT_COLUMNS)].to_numpy(dtype='float64', na_value=np.nan).T
+
+    @staticmethod
+    @profiled("metrics.pl")
+    def calculate_scenarios(df: pd.DataFrame,
+                            scenarios: Optional[Sequence[Mapping[str, Any]]] = None) -> np.ndarray:
+        """``(scenarios, clients, metrics)`` array of PL_METRICS for each scenario"""
+        scenarios = list(scenarios) if scenarios else [PLMetrics.scenario()]
+        (accountants, salary, burden_column, manager_percent, manager_rate,
+         software, data_provider, cloud, revenue, funds, aum) = PLMetrics._input_block(df)
+        assumptions = PLMetrics._scenario_vectors(scenarios)
+
+        # Metric-major storage keeps every write contiguous; returned as a
+        # (scenarios, clients, metrics) view
+        out = np.empty((len(PL_METRICS), len(scenarios), len(df)))
+        labor, manager, technology, direct, overhead, costs, profit, margin, \
+            revenue_per_fund, cost_per_fund, profit_per_fund, revenue_bps, cost_bps = out
+
+        burden = np.where(np.isnan(assumptions['burden_multiplier']), burden_column,
+                          assumptions['burden_multiplier'])
+        aum_usd = aum * 1000000
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.multiply(accountants * salary, burden, out=labor)
+            np.multiply(manager_percent / 100 * manager_rate, assumptions['annual_hours'], out=manager)
+            technology[:] = software + data_provider + cloud
+            np.add(labor + manager, technology, out=direct)
+            np.multiply(revenue, assumptions['overhead_rate'], out=overhead)
+            np.add(direct, overhead, out=costs)
+            np.subtract(revenue, costs, out=profit)
+            np.multiply(profit / revenue, 100, out=margin)
+            revenue_per_fund[:] = revenue / funds
+            np.divide(costs, funds, out=cost_per_fund)
+            np.divide(profit, funds, out=profit_per_fund)
+            revenue_bps[:] = (revenue / aum_usd) * 10000
+            np.multiply(costs / aum_usd, 10000, out=cost_bps)
+
+        return out.transpose(1, 2, 0)
+
+    @staticmethod
+    def calculate(df: pd.DataFrame, scenario: Optional[Mapping[str, Any]] = None) -> pd.DataFrame:
+        """Return ``df`` joined with the derived P&L columns of one scenario"""
+        if df.empty:
+            return pd.DataFrame()
+
+        metrics = PLMetrics.calculate_scenarios(df, [scenario or PLMetrics.scenario()])[0]
+        derived = pd.DataFrame(metrics, index=df.index, columns=list(PL_METRICS))
+        existing = [col for col in PL_METRICS if col in df.columns]
+        source = df.drop(columns=existing) if existing else df
+        return pd.concat([source, derived], axis=1)
+
+    @staticmethod
+    def scenario_summary(df: pd.DataFrame, scenarios: Sequence[Mapping[str, Any]]) -> pd.DataFrame:
+        """Portfolio totals per scenario (revenue, costs, profit, margin)"""
+        scenarios = list(scenarios)
+        cube = PLMetrics.calculate_scenarios(df, scenarios)
+        metric = {name: position for position, name in enumerate(PL_METRICS)}
+
+        revenue = np.nansum(df['Total_Annual_Revenue_USD'].to_numpy(dtype='float64', na_value=np.nan))
+        costs = np.nansum(cube[:, :, metric['Total_Costs']], axis=1)
+        profit = np.nansum(cube[:, :, metric['Gross_Profit']], axis=1)
+
+        summary = pd.DataFrame([{key: scenario.get(key, PL_CONFIG[key]) for key in SCENARIO_KEYS}
+                                for scenario in scenarios])
+        summary['Total_Revenue'] = revenue
+        summary['Total_Costs'] = costs
+        summary['Total_Profit'] = profit
+        summary['Average_Margin_Percent'] = np.nanmean(cube[:, :, metric['Gross_Margin_Percent']], axis=1)
+        return summary
@@ -0,0 +1,324 @@
+"""
+Nested timing spans with per-session and process-wide latency histograms
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from config.settings import PROFILER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets: 0.5 ms to ~2 min in half-octave steps
+BUCKETS = tuple(0.0005 * 2 ** (step / 2) for step in range(37))
+
+SUMMARY_COLUMNS = ['Operation', 'Calls', 'Total_s', 'Mean_ms', 'P50_ms', 'P95_ms', 'P99_ms', 'Max_ms']
+
+STAGE_COLUMNS = ['Stage', 'Depth', 'Start_ms', 'Duration_ms', 'Share', 'Attributes']
+
+
+class SpanStats:
+    """Fixed-bucket latency histogram of one operation"""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.buckets[bisect_left(BUCKETS, duration)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Estimate of the ``q`` quantile (0-1), interpolated within its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for position, hits in enumerate(self.buckets):
+            if hits and cumulative + hits >= rank:
+                lower = BUCKETS[position - 1] if position else 0.0
+                upper = BUCKETS[position] if position < len(BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - cumulative) / hits, self.max)
+            cumulative += hits
+        return self.max
+
+    def summary(self, name: str) -> Dict[str, Any]:
+        return {
+            'Operation': name,
+            'Calls': self.count,
+            'Total_s': self.total,
+            'Mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'P50_ms': self.percentile(0.50) * 1000,
+            'P95_ms': self.percentile(0.95) * 1000,
+            'P99_ms': self.percentile(0.99) * 1000,
+            'Max_ms': self.max * 1000,
+        }
+
+
+class Span:
+    """One timed operation; ``set()`` attaches attributes such as row counts"""
+
+    __slots__ = ('name', 'parent', 'started', 'duration', 'attributes', 'children', 'dropped')
+
+    def __init__(self, name: str, parent: Optional['Span'], attributes: Dict[str, Any]):
+        self.name = name
+        self.parent = parent
+        self.started = time.time()
+        self.duration = 0.0
+        self.attributes = attributes
+        self.children: List['Span'] = []
+        self.dropped = 0
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'started': datetime.fromtimestamp(self.started).isoformat(timespec='milliseconds'),
+            'duration_ms': self.duration * 1000,
+            'attributes': {key: value if isinstance(value, (int, float, bool)) else str(value)
+                           for key, value in self.attributes.items()},
+            'children': [child.to_dict() for child in self.children],
+            'dropped_children': self.dropped,
+        }
+
+
+class SessionProfile:
+    """Operation statistics and recent span trees of one Streamlit session"""
+
+    def __init__(self):
+        self.stats: Dict[str, SpanStats] = {}
+        self.traces: Dict[str, deque] = {}
+
+
+class Profiler:
+    """Instrumentation layer for the app's expensive operations.
+
+    ``span()`` is a context manager and ``profiled()`` the matching
+    decorator. Spans nest through a context variable, so concurrent
+    sessions (each on its own script thread) never overwrite each other's
+    timings. Every finished span feeds a process-wide and a per-session
+    latency histogram (p50/p95/p99); finished root spans are also kept as
+    trees for the last few operations. Snapshots can be written as JSON
+    or Prometheus text, optionally on a fixed interval.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = PROFILER_CONFIG["enabled"] if enabled is None else enabled
+        self.max_sessions = PROFILER_CONFIG["max_sessions"]
+        self.max_traces = PROFILER_CONFIG["max_traces"]
+        self.max_children = PROFILER_CONFIG["max_children"]
+        self.slow_threshold = PROFILER_CONFIG["slow_operation_s"]
+        self.started = time.time()
+        self._stats: Dict[str, SpanStats] = {}
+        self._traces: Dict[str, deque] = {}
+        self._sessions: 'OrderedDict[str, SessionProfile]' = OrderedDict()
+        self._current: ContextVar = ContextVar('profiler_span', default=None)
+        self._lock = threading.Lock()
+        self._last_export = time.monotonic()
+
+    @staticmethod
+    def session_id() -> Optional[str]:
+        """ID of the Streamlit session running on this thread, if any"""
+        try:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+            ctx = get_script_run_ctx(suppress_warning=True)
+        except Exception:
+            return None
+        return ctx.session_id if ctx is not None else None
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time the enclosed block as operation ``name``"""
+        parent = self._current.get()
+        node = Span(name, parent, attributes)
+        if not self.enabled:
+            yield node
+            return
+
+        token = self._current.set(node)
+        start = time.perf_counter()
+        try:
+            yield node
+        finally:
+            node.duration = time.perf_counter() - start
+            self._current.reset(token)
+            self._record(node)
+
+    def _record(self, node: Span):
+        session_id = self.session_id()
+        with self._lock:
+            self._stats.setdefault(node.name, SpanStats()).add(node.duration)
+
+            session = None
+            if session_id is not None:
+                session = self._sessions.get(session_id)
+                if session is None:
+                    session = self._sessions[session_id] = SessionProfile()
+                    while len(self._sessions) > self.max_sessions:
+                        self._sessions.popitem(last=False)
+                self._sessions.move_to_end(session_id)
+                session.stats.setdefault(node.name, SpanStats()).add(node.duration)
+
+            if node.parent is not None:
+                if len(node.parent.children) < self.max_children:
+                    node.parent.children.append(node)
+                else:
+                    node.parent.dropped += 1
+            else:
+                # Kept per root operation, so frequent chart renders never push out the last upload
+                self._traces.setdefault(node.name, deque(maxlen=self.max_traces)).append(node)
+                if session is not None:
+                    session.traces.setdefault(node.name, deque(maxlen=self.max_traces)).append(node)
+
+        if node.duration > self.slow_threshold:
+            logger.warning(f"Slow operation: {node.name} took {node.duration:.2f}s")
+
+        interval = PROFILER_CONFIG["export_interval_s"]
+        if node.parent is None and interval and time.monotonic() - self._last_export >= interval:
+            self._last_export = time.monotonic()
+            try:
+                self.export()
+            except OSError as e:
+                logger.warning(f"Could not export profile: {e}")
+
+    def summary(self, session_id: Optional[str] = None) -> pd.DataFrame:
+        """Per-operation statistics of one session (or the whole process), slowest first"""
+        with self._lock:
+            if session_id is not None:
+                session = self._sessions.get(session_id)
+                stats = dict(session.stats) if session is not None else {}
+            else:
+                stats = dict(self._stats)
+            rows = [entry.summary(name) for name, entry in stats.items()]
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS).sort_values('Total_s', ascending=False,
+                                                                       ignore_index=True)
+
+    def traces(self, session_id: Optional[str] = None, name: Optional[str] = None,
+               prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent root span trees (newest first), optionally only those named ``name`` or ``prefix*``"""
+        with self._lock:
+            if session_id is not None:
+                session = self._sessions.get(session_id)
+                traces = session.traces if session is not None else {}
+            else:
+                traces = self._traces
+            roots = [root for root_name, kept in traces.items()
+                     if (name is None or root_name == name) and (prefix is None or root_name.startswith(prefix))
+                     for root in kept]
+        roots.sort(key=lambda root: root.started, reverse=True)
+        return [root.to_dict() for root in roots]
+
+    @staticmethod
+    def stages(trace: Dict[str, Any]) -> pd.DataFrame:
+        """Flatten a span tree from ``traces()`` into one row per span, depth first"""
+        origin = datetime.fromisoformat(trace['started'])
+        total = trace['duration_ms'] or 1.0
+        rows = []
+
+        def visit(node: Dict[str, Any], depth: int):
+            rows.append({
+                'Stage': node['name'],
+                'Depth': depth,
+                'Start_ms': (datetime.fromisoformat(node['started']) - origin).total_seconds() * 1000,
+                'Duration_ms': node['duration_ms'],
+                'Share': node['duration_ms'] / total,
+                'Attributes': ', '.join(f"{key}={value}" for key, value in node['attributes'].items()),
+            })
+            for child in node['children']:
+                visit(child, depth + 1)
+
+        visit(trace, 0)
+        return pd.DataFrame(rows, columns=STAGE_COLUMNS)
+
+    def sessions(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    def reset(self):
+        """Forget every recorded span"""
+        with self._lock:
+            self._stats.clear()
+            self._traces.clear()
+            self._sessions.clear()
+            self.started = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable snapshot of the process and per-session statistics"""
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'since': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+            'pid': os.getpid(),
+            'operations': self.summary().to_dict(orient='records'),
+            'sessions': {session_id: self.summary(session_id).to_dict(orient='records')
+                         for session_id in self.sessions()},
+            'traces': self.traces(),
+        }
+
+    def to_prometheus(self, metric: str = 'app_operation_duration_seconds') -> str:
+        """Process-wide histograms in the Prometheus text exposition format"""
+        lines = [f"# HELP {metric} Duration of instrumented operations",
+                 f"# TYPE {metric} histogram"]
+        with self._lock:
+            stats = sorted(self._stats.items())
+            for name, entry in stats:
+                label = name.replace('\\', '\\\\').replace('"', '\\"')
+                cumulative = 0
+                for bound, hits in zip(BUCKETS, entry.buckets):
+                    cumulative += hits
+                    lines.append(f'{metric}_bucket{{operation="{label}",le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{operation="{label}",le="+Inf"}} {entry.count}')
+                lines.append(f'{metric}_sum{{operation="{label}"}} {entry.total:.6f}')
+                lines.append(f'{metric}_count{{operation="{label}"}} {entry.count}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, directory: Optional[str] = None) -> Dict[str, Path]:
+        """Write ``profile.json`` and ``profile.prom`` to ``directory``; returns their paths"""
+        directory = Path(directory or PROFILER_CONFIG["export_dir"])
+        directory.mkdir(parents=True, exist_ok=True)
+        outputs = {
+            'json': (directory / 'profile.json', json.dumps(self.to_dict(), indent=2, default=str)),
+            'prometheus': (directory / 'profile.prom', self.to_prometheus()),
+        }
+        for path, content in outputs.values():
+            # Atomic rename so scrapers never read a partial file
+            tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            tmp_path.write_text(content, encoding='utf-8')
+            os.replace(tmp_path, path)
+        return {kind: path for kind, (path, _) in outputs.items()}
+
+
+# Global profiler
+profiler = Profiler()
+
+
+def profiled(name: str):
+    """Decorator timing every call of the wrapped function as operation ``name``"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
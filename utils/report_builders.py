@@ -0,0 +1,242 @@
+"""
+Report builders shared by the dashboard and the headless report scheduler
+
+Every builder takes plain data (frames, dicts) and returns the finished
+report as bytes or text, without touching Streamlit, so it can run on a
+report worker thread or in a scheduler worker process.
+"""
+
+import io
+import re
+from datetime import datetime
+
+import pandas as pd
+
+from config.constants import CURRENT_YEAR
+from .excel_writer import StreamingExcelWriter
+from .html_report import HTMLChartBundle
+from .profiler import profiled
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def frame_to_csv(df):
+    """CSV export of a frame, for report jobs."""
+    return df.to_csv(index=False)
+
+
+def capital_report_metrics(totals):
+    """Key metrics of the capital reports, formatted, from ``CapitalRollup.totals``."""
+    return {
+        "Number of Projects": totals['count'],
+        "Sum Actual Spend (YTD)": f"${totals['SUM_ACTUAL_SPEND_YTD']:,.2f}",
+        "Sum Of Forecasted Numbers": f"${totals['SUM_OF_FORECASTED_NUMBERS']:,.2f}",
+        "Avg Run Rate / Month": f"${totals['RUN_RATE_PER_MONTH_mean']:,.2f}",
+        "Total Potential Underspend": f"${totals['CAPITAL_UNDERSPEND']:,.2f}",
+        "Total Potential Overspend": f"${totals['CAPITAL_OVERSPEND']:,.2f}",
+        "Net Reallocation": f"${totals['NET_REALLOCATION_AMOUNT']:,.2f}"
+    }
+
+
+def pl_summary_stats(pl_analysis, analysis_date=None):
+    """Executive summary of the P&L report, dated ``analysis_date`` (default today)."""
+    return {
+        'Total_Revenue': pl_analysis['Total_Annual_Revenue_USD'].sum(),
+        'Total_Costs': pl_analysis['Total_Costs'].sum(),
+        'Total_Profit': pl_analysis['Gross_Profit'].sum(),
+        'Average_Margin_Percent': pl_analysis['Gross_Margin_Percent'].mean(),
+        'Total_AUM_Millions': pl_analysis['Fund_AUM_USD_Millions'].sum(),
+        'Number_of_Clients': len(pl_analysis),
+        'Analysis_Date': (analysis_date or datetime.now()).strftime('%Y-%m-%d')
+    }
+
+
+@profiled("report.capital_summary_html")
+def generate_capital_summary_html_report(metrics, filtered_df):
+    """Generates a comprehensive HTML report of capital project dashboard state."""
+    current_year = datetime.now().year
+    
+    report_html = f"""
+    <!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><title>Capital Project Report</title><style>
+    body{{font-family:sans-serif;margin:20px;color:#333}}h1,h2,h3{{color:#004d40}}.metric-container{{display:flex;justify-content:space-around;flex-wrap:wrap;margin-bottom:20px}}
+    .metric-box{{border:1px solid #ddd;border-radius:8px;padding:15px;margin:10px;flex:1;min-width:200px;text-align:center;background-color:#f9f9f9}}
+    .metric-label{{font-size:0.9em;color:#555}}.metric-value{{font-size:1.5em;font-weight:bold;color:#222;margin-top:5px}}
+    table{{width:100%;border-collapse:collapse;margin-top:20px}}th,td{{border:1px solid #ddd;padding:8px;text-align:left}}th{{background-color:#e6f2f0}}
+    footer{{text-align:center;margin-top:50px;padding-top:20px;border-top:1px solid #eee;font-size:0.8em;color:#777}}
+    </style></head><body>
+    <h1>Capital Project Portfolio Report</h1><p>Generated on: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+    <h2>Key Metrics Overview</h2><div class="metric-container">
+    {''.join([f'<div class="metric-box"><div class="metric-label">{label}</div><div class="metric-value">{value}</div></div>' for label, value in metrics.items()])}
+    </div>
+    <h2>Project Portfolio Summary</h2>
+    {filtered_df.head(10).to_html(index=False, classes='table')}
+    <footer><p>Generated by Capital Project Portfolio Dashboard</p></footer>
+    </body></html>"""
+    return report_html
+
+
+@profiled("report.capital_summary_excel")
+def generate_capital_summary_excel_report(metrics, filtered_df):
+    """Generates a multi-sheet Excel report for capital projects."""
+    # Streamed in constant memory: rows are flushed to disk as they are written
+    with StreamingExcelWriter() as writer:
+        writer.write_frame(writer.add_sheet('Summary'), pd.DataFrame([metrics]))
+        writer.write_frame(writer.add_sheet('Project_Details'), filtered_df)
+    return writer.getvalue()
+
+
+@profiled("report.capital_html")
+def generate_capital_html_report(metrics, figures, tables, comments, project_details_html=None):
+    """Generates a comprehensive HTML report of the capital dashboard state."""
+    bundle = HTMLChartBundle()
+    monthly_trends_html = bundle.div(figures.get('monthly_trends'), '<p>No monthly trend data available.</p>')
+    
+    def create_comment_block(title, comment_text):
+        if comment_text and comment_text.strip():
+            comment_text_html = comment_text.replace('\n', '<br>')
+            return f"<h3>{title}</h3><p style='white-space: pre-wrap; background-color:#f0f2f6; padding: 10px; border-radius: 5px;'>{comment_text_html}</p>"
+        return ""
+
+    report_html = f"""
+    <!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><title>Capital Project Report</title><style>
+    body{{font-family:sans-serif;margin:20px;color:#333}}h1,h2,h3{{color:#004d40}}.metric-container{{display:flex;justify-content:space-around;flex-wrap:wrap;margin-bottom:20px}}
+    .metric-box{{border:1px solid #ddd;border-radius:8px;padding:15px;margin:10px;flex:1;min-width:200px;text-align:center;background-color:#f9f9f9}}
+    .metric-label{{font-size:0.9em;color:#555}}.metric-value{{font-size:1.5em;font-weight:bold;color:#222;margin-top:5px}}
+    table{{width:100%;border-collapse:collapse;margin-top:20px}}th,td{{border:1px solid #ddd;padding:8px;text-align:left}}th{{background-color:#e6f2f0}}
+    .chart-container{{margin-top:30px;page-break-inside:avoid;}}.section-title{{margin-top:40px;border-bottom:2px solid #004d40;padding-bottom:10px;page-break-after:avoid;}}
+    footer{{text-align:center;margin-top:50px;padding-top:20px;border-top:1px solid #eee;font-size:0.8em;color:#777}}
+    .flex-container{{display:flex;justify-content:space-between;gap:20px;page-break-inside:avoid;}}.flex-child{{flex:1;min-width:45%;}}
+    </style></head><body>
+    <h1>Capital Project Portfolio Report</h1><p>Generated on: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+    <h2 class="section-title">Key Metrics Overview</h2><div class="metric-container">
+    {''.join([f'<div class="metric-box"><div class="metric-label">{label}</div><div class="metric-value">{value}</div></div>' for label, value in metrics.items()])}
+    </div>
+    <h2 class="section-title">Filtered Project Details</h2>{tables['project_details']}
+    <h2 class="section-title">{CURRENT_YEAR} Monthly Spend Trends</h2><div class="chart-container">{monthly_trends_html}</div>
+    <h2 class="section-title">Project Spend Variance Analysis</h2>{create_comment_block('Analyst Comments', comments['variance'])}<div class="flex-container">
+    <div class="flex-child"><h3>Total Spend</h3>{bundle.div(figures['total_spend'])}</div>
+    <div class="flex-child"><h3>Average Spend</h3>{bundle.div(figures['avg_spend'])}</div>
+    </div>
+    <h2 class="section-title">Budget Impact & Reallocation</h2>{create_comment_block('Analyst Comments', comments['impact'])}<div class="flex-container">
+    <div class="flex-child"><h3>Largest Forecasted Overspend</h3>{tables['overspend']}</div>
+    <div class="flex-child"><h3>Largest Potential Underspend</h3>{tables['underspend']}</div>
+    </div>
+    {project_details_html if project_details_html else ''}
+    <h2 class="section-title">Project Performance</h2>{create_comment_block('Analyst Comments on Bottom 5 Projects', comments['bottom5'])}<div class="flex-container">
+    <div class="flex-child"><h3>Top 5 Best Behaving</h3>{tables['top_5']}</div>
+    <div class="flex-child"><h3>Bottom 5 Worst Behaving</h3>{tables['bottom_5']}</div>
+    </div>
+    <footer><p>Generated by Iluvalcar 2.0 - Capital Project Portfolio Dashboard</p></footer>
+    {bundle.scripts()}
+    </body></html>"""
+    return report_html
+
+
+@profiled("report.capital_excel")
+def generate_capital_excel_report(metrics, tables, comments):
+    """Generates a multi-sheet Excel report for capital projects."""
+    with StreamingExcelWriter() as writer:
+        summary_sheet = writer.add_sheet('Summary')
+        summary_df = pd.DataFrame([metrics])
+        comments_df = pd.DataFrame.from_dict(comments, orient='index', columns=['Comments'])
+        writer.write_frame(summary_sheet, summary_df)
+        writer.write_frame(summary_sheet, comments_df, startrow=len(summary_df) + 2, index=True)
+
+        for name, df in tables.items():
+            if not df.empty:
+                sheet_name = re.sub(r'[\\/*?:"<>|]', "", name)[:31]
+                writer.write_frame(writer.add_sheet(sheet_name), df)
+
+    return writer.getvalue()
+
+
+@profiled("report.pl_excel")
+def generate_pl_excel_report(df, summary_stats):
+    """Generate comprehensive P&L Excel report."""
+    output = io.BytesIO()
+    
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        # Write main data
+        df.to_excel(writer, sheet_name='Detailed_PL_Analysis', index=False)
+        
+        # Write summary statistics
+        summary_df = pd.DataFrame([summary_stats])
+        summary_df.to_excel(writer, sheet_name='Executive_Summary', index=False)
+        
+        # Write service line breakdown
+        service_breakdown = df.groupby('Client_Name')[
+            ['Fund_Accounting_Revenue_USD', 'Fund_Administration_Revenue_USD', 
+             'Transfer_Agency_Revenue_USD', 'Regulatory_Reporting_Revenue_USD']
+        ].sum()
+        service_breakdown.to_excel(writer, sheet_name='Service_Line_Breakdown')
+        
+        # Write profitability ranking
+        profitability_ranking = df[['Client_Name', 'Fund_Name', 'Gross_Profit', 'Gross_Margin_Percent']].sort_values('Gross_Margin_Percent', ascending=False)
+        profitability_ranking.to_excel(writer, sheet_name='Profitability_Ranking', index=False)
+    
+    return output.getvalue()
+
+
+def generate_competitive_insights(df):
+    """Generate strategic competitive insights."""
+    if df.empty:
+        return {}
+    
+    insights = {}
+    
+    # Market concentration
+    top_3_share = df.nlargest(3, 'Market_Share_Percent')['Market_Share_Percent'].sum()
+    insights['market_concentration'] = f"Top 3 players control {top_3_share:.1f}% of market"
+    
+    # Technology leaders
+    tech_leaders = df[df['AI_ML_Capabilities'] == 'Advanced']['Competitor_Name'].tolist()
+    insights['tech_leaders'] = f"AI/ML Leaders: {', '.join(tech_leaders)}"
+    
+    # Client satisfaction winners
+    top_satisfaction = df.nlargest(3, 'Client_Satisfaction_Score')
+    insights['satisfaction_leaders'] = top_satisfaction[['Competitor_Name', 'Client_Satisfaction_Score']].to_dict('records')
+    
+    # Geographic diversification
+    global_players = len(df[df['Geographic_Presence'] == 'Global'])
+    insights['geographic_reach'] = f"{global_players} competitors have global presence"
+    
+    # Innovation focus
+    cloud_native = len(df[df['Cloud_Native_Platform'] == 'Yes'])
+    insights['cloud_adoption'] = f"{cloud_native}/{len(df)} competitors are cloud-native"
+    
+    return insights
+
+
+@profiled("report.competitors_excel")
+def generate_competitors_excel_report(df, insights):
+    """Generate comprehensive competitors analysis Excel report."""
+    output = io.BytesIO()
+    
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        # Main competitor data
+        df.to_excel(writer, sheet_name='Competitor_Analysis', index=False)
+        
+        # Market positioning data
+        positioning_df = df[['Competitor_Name', 'Market_Share_Percent', 'Assets_Under_Administration_USD_Trillions', 
+                           'Technology_Investment_Percent', 'Client_Satisfaction_Score']].copy()
+        positioning_df.to_excel(writer, sheet_name='Market_Positioning', index=False)
+        
+        # Technology comparison
+        tech_df = df[['Competitor_Name', 'AI_ML_Capabilities', 'API_Integration_Score', 'Cloud_Native_Platform', 
+                     'Digital_Transformation_Stage']].copy()
+        tech_df.to_excel(writer, sheet_name='Technology_Analysis', index=False)
+        
+        # Strategic insights
+        insights_df = pd.DataFrame.from_dict(insights, orient='index', columns=['Insight'])
+        insights_df.to_excel(writer, sheet_name='Strategic_Insights')
+    
+    return output.getvalue()
+
+
+@profiled("report.business_case_pipeline")
+def generate_business_case_pipeline_report(pipeline_df):
+    """Generate the Excel summary of every case in the pipeline."""
+    pipeline_buffer = io.BytesIO()
+    with pd.ExcelWriter(pipeline_buffer, engine='xlsxwriter') as writer:
+        pipeline_df.to_excel(writer, sheet_name='Pipeline_Summary', index=False)
+    return pipeline_buffer.getvalue()
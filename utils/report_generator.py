@@ -4,57 +4,64 @@ Report generation utilities
 
 import streamlit as st
 import pandas as pd
-import io
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 import plotly.graph_objects as go
 
 from config.settings import REPORT_CONFIG
 from config.constants import SUCCESS_MESSAGES
+from .excel_format import ExcelFormatPlanner
+from .excel_writer import StreamingExcelWriter
+from .html_report import HTMLChartBundle
+from .profiler import profiled
 
 
 class ReportGenerator:
     """Centralized report generation utilities"""
     
     @staticmethod
+    @profiled("report.excel")
     def generate_excel_report(data_dict: Dict[str, pd.DataFrame], 
                             filename: str, 
                             metadata: Optional[Dict[str, Any]] = None) -> bytes:
         """Generate Excel report with multiple sheets"""
         try:
-            output = io.BytesIO()
-            
-            with pd.ExcelWriter(output, engine=REPORT_CONFIG["excel_engine"]) as writer:
-                # Add metadata sheet if provided
-                if metadata:
-                    metadata_df = pd.DataFrame.from_dict(metadata, orient='index', columns=['Value'])
-                    metadata_df.to_excel(writer, sheet_name='Metadata', index=True)
-                
-                # Add data sheets
-                for sheet_name, df in data_dict.items():
-                    if not df.empty:
-                        # Sanitize sheet name
-                        clean_sheet_name = ReportGenerator._sanitize_sheet_name(sheet_name)
-                        df.to_excel(writer, sheet_name=clean_sheet_name, index=False)
-                        
-                        # Get workbook and worksheet for formatting
-                        workbook = writer.book
-                        worksheet = writer.sheets[clean_sheet_name]
-                        
-                        # Apply formatting
-                        ReportGenerator._apply_excel_formatting(workbook, worksheet, df)
-            
-            return output.getvalue()
+            return ReportGenerator.write_excel_report(data_dict, metadata).getvalue()
             
         except Exception as e:
             st.error(f"Error generating Excel report: {str(e)}")
             return bytes()
 
     @staticmethod
+    def write_excel_report(data_dict: Dict[str, pd.DataFrame],
+                           metadata: Optional[Dict[str, Any]] = None) -> StreamingExcelWriter:
+        """Stream a multi-sheet Excel report to a spooled temp file; read it with ``close()`` or ``getvalue()``"""
+        writer = StreamingExcelWriter()
+        with writer:
+            # Add metadata sheet if provided
+            if metadata:
+                metadata_df = pd.DataFrame.from_dict(metadata, orient='index', columns=['Value'])
+                writer.write_frame(writer.add_sheet('Metadata'), metadata_df, index=True)
+            
+            # Add data sheets
+            for sheet_name, df in data_dict.items():
+                if not df.empty:
+                    # Sanitize sheet name
+                    worksheet = writer.add_sheet(ReportGenerator._sanitize_sheet_name(sheet_name))
+                    
+                    # Header and column formatting go first: rows are streamed top to bottom
+                    ReportGenerator._apply_excel_formatting(writer.workbook, worksheet, df)
+                    writer.write_rows(worksheet, df, startrow=1)
+        return writer
+
+    @staticmethod
+    @profiled("report.html")
     def generate_html_report(title: str, sections: Dict[str, str], 
                            charts: Optional[Dict[str, go.Figure]] = None) -> str:
         """Generate HTML report with sections and charts"""
         try:
+            bundle = HTMLChartBundle()
+            
             # HTML template
             html_template = f"""
             <!DOCTYPE html>
@@ -83,11 +90,12 @@ class ReportGenerator:
                 
                 {ReportGenerator._generate_html_sections(sections)}
                 
-                {ReportGenerator._generate_html_charts(charts) if charts else ""}
+                {ReportGenerator._generate_html_charts(charts, bundle) if charts else ""}
                 
                 <div class="footer">
                     <p>Generated by Fund Administration Platform</p>
                 </div>
+                {bundle.scripts()}
             </body>
             </html>
             """
@@ -119,20 +127,15 @@ class ReportGenerator:
                 'border': 1
             })
             
-            currency_format = workbook.add_format({'num_format': '$#,##0.00'})
-            percent_format = workbook.add_format({'num_format': '0.00%'})
-            
             # Apply header formatting
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num, value, header_format)
+            worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
             
-            # Auto-adjust column widths
-            for i, col in enumerate(df.columns):
-                max_length = max(
-                    df[col].astype(str).map(len).max(),
-                    len(str(col))
-                ) + 2
-                worksheet.set_column(i, i, min(max_length, 50))
+            # Widths and number formats from names, dtypes and a row sample
+            number_formats = {}
+            for i, (width, num_format) in enumerate(ExcelFormatPlanner.plan(df)):
+                if num_format is not None and num_format not in number_formats:
+                    number_formats[num_format] = workbook.add_format({'num_format': num_format})
+                worksheet.set_column(i, i, width, number_formats.get(num_format))
                 
         except Exception as e:
             # Formatting errors shouldn't break report generation
@@ -154,13 +157,13 @@ class ReportGenerator:
         return html_sections
 
     @staticmethod
-    def _generate_html_charts(charts: Dict[str, go.Figure]) -> str:
-        """Generate HTML chart sections"""
+    def _generate_html_charts(charts: Dict[str, go.Figure], bundle: HTMLChartBundle) -> str:
+        """Generate HTML chart sections, drawn from the report's shared chart bundle"""
         html_charts = ""
         
         for title, chart in charts.items():
             try:
-                chart_html = chart.to_html(full_html=False, include_plotlyjs='cdn')
+                chart_html = bundle.div(chart)
                 html_charts += f"""
                 <div class="section">
                     <h2 class="section-title">{title}</h2>
@@ -0,0 +1,203 @@
+"""
+Concurrent report generation with a shared cache of finished artefacts
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+import streamlit as st
+
+from config.settings import REPORT_JOBS_CONFIG
+from .figure_cache import FigureCache
+from .html_report import HTMLChartBundle
+from .profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+
+class ReportArtefact:
+    """A downloadable report: how to build it and how to offer it (gzipped if ``compress``)"""
+
+    __slots__ = ('label', 'report_type', 'builder', 'args', 'file_name', 'mime', 'compress')
+
+    def __init__(self, label: str, report_type: str, builder: Callable[..., Any], args: tuple,
+                 file_name: str, mime: str, compress: bool = False):
+        self.label = label
+        self.report_type = report_type
+        self.builder = builder
+        self.args = args
+        self.file_name = f"{file_name}.gz" if compress else file_name
+        self.mime = "application/gzip" if compress else mime
+        self.compress = compress
+
+
+class ReportJob:
+    """One artefact being built (or served from the cache)"""
+
+    __slots__ = ('key', 'artefact', 'future', 'cached', 'submitted')
+
+    def __init__(self, key: str, artefact: ReportArtefact, future: Future, cached: bool = False):
+        self.key = key
+        self.artefact = artefact
+        self.future = future
+        self.cached = cached
+        self.submitted = time.time()
+
+    @property
+    def status(self) -> str:
+        if self.cached:
+            return 'cached'
+        if not self.future.done():
+            return 'running' if self.future.running() else 'queued'
+        return 'failed' if self.future.exception() is not None else 'done'
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self.future.exception() if self.future.done() else None
+
+    def result(self) -> bytes:
+        return self.future.result()
+
+
+class ReportPipeline:
+    """Build report artefacts concurrently on worker threads, caching the finished bytes.
+
+    Each artefact is keyed by its report type and a content hash of the
+    builder's inputs - the data (by content), the analyst comments and any
+    other parameters - so reruns and download clicks are served the stored
+    bytes and a report is only rebuilt when something it shows changed.
+    Identical requests already in flight share one job. Builders run off
+    the script thread and must not call Streamlit. Finished artefacts are
+    kept in an LRU under a byte budget shared by every session.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_size_mb: Optional[int] = None,
+                 enabled: Optional[bool] = None):
+        self.max_workers = max_workers or REPORT_JOBS_CONFIG["max_workers"]
+        self.max_size_bytes = (max_size_mb or REPORT_JOBS_CONFIG["max_size_mb"]) * 1024**2
+        self.enabled = REPORT_JOBS_CONFIG["enabled"] if enabled is None else enabled
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._running = {}
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, artefact: ReportArtefact) -> str:
+        """Cache key of an artefact: its report type and the content of the builder's inputs"""
+        return FigureCache.make_key(artefact.report_type, artefact.args, artefact.compress)
+
+    def _build(self, key: str, artefact: ReportArtefact) -> bytes:
+        try:
+            with profiler.span(f"report.job.{artefact.report_type}") as span:
+                data = artefact.builder(*artefact.args)
+                if isinstance(data, str):
+                    data = data.encode('utf-8')
+                if not data:
+                    raise ValueError("the report came out empty")
+                if artefact.compress:
+                    data = HTMLChartBundle.compress(data)
+                span.set(size_kb=round(len(data) / 1024, 1))
+        except Exception as e:
+            logger.error(f"Report {artefact.label} failed: {e}")
+            with self._lock:
+                self._running.pop(key, None)
+            raise
+        self._store(key, data)
+        return data
+
+    def _store(self, key: str, data: bytes):
+        with self._lock:
+            self._running.pop(key, None)
+            if not self.enabled or len(data) > self.max_size_bytes:
+                return
+            if key in self._entries:
+                self.size_bytes -= len(self._entries[key])
+            self._entries[key] = data
+            self.size_bytes += len(data)
+            while self.size_bytes > self.max_size_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def submit(self, artefact: ReportArtefact) -> ReportJob:
+        """Start building ``artefact``, or return its cached or in-flight job"""
+        key = self.make_key(artefact)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                future = Future()
+                future.set_result(data)
+                return ReportJob(key, artefact, future, cached=True)
+
+            self.misses += 1
+            job = self._running.get(key)
+            if job is not None:
+                return ReportJob(key, artefact, job.future)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="report")
+            job = self._running[key] = ReportJob(key, artefact, self._executor.submit(self._build, key, artefact))
+        return job
+
+    @staticmethod
+    def as_completed(jobs: Iterable[ReportJob]) -> Iterator[ReportJob]:
+        """Yield jobs as they finish, cached ones first"""
+        jobs = list(jobs)
+        by_future = {}
+        for job in jobs:
+            if job.future.done():
+                yield job
+            else:
+                by_future.setdefault(job.future, []).append(job)
+        for future in as_completed(by_future):
+            yield from by_future[future]
+
+    def render_downloads(self, artefacts: List[ReportArtefact], key: str):
+        """Build the artefacts concurrently and show a download button for each as it finishes"""
+        jobs = [self.submit(artefact) for artefact in artefacts]
+        slots = {}
+        for column, job in zip(st.columns(len(jobs)), jobs):
+            slots[id(job)] = column.empty()
+            if not job.future.done():
+                slots[id(job)].info(f"⏳ Building {job.artefact.label}...")
+
+        for job in self.as_completed(jobs):
+            artefact = job.artefact
+            with slots[id(job)].container():
+                if job.error is not None:
+                    st.error(f"❌ {artefact.label} could not be generated: {job.error}")
+                    continue
+                data = job.result()
+                st.download_button(f"⬇️ Download {artefact.label}", data, artefact.file_name, artefact.mime,
+                                   key=f"{key}_{artefact.report_type}", on_click="ignore")
+                origin = "cached" if job.cached else f"built in {time.time() - job.submitted:.1f}s"
+                st.caption(f"{len(data) / 1024:,.0f} KB · {origin}")
+
+    def clear(self):
+        """Remove every cached artefact"""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters, jobs in flight and the cache footprint"""
+        total = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'running': len(self._running),
+            'entries': len(self._entries),
+            'size_mb': self.size_bytes / 1024**2
+        }
+
+
+# Global report pipeline
+report_pipeline = ReportPipeline()
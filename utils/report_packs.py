@@ -0,0 +1,150 @@
+"""
+Report packs: the reports of each dashboard, built headless from an input file
+"""
+
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import pandas as pd
+
+from config.constants import (CURRENT_YEAR, CURRENT_MONTH, CAPITAL_FINANCIAL_PATTERN, PL_REQUIRED_COLUMNS,
+                              COMPETITORS_REQUIRED_COLUMNS, BUSINESS_CASE_REQUIRED_COLUMNS)
+from config.settings import REPORT_CONFIG
+from .business_case_scoring import PIPELINE_COLUMNS, BusinessCaseScorer
+from .capital_cube import CapitalTimeSeries
+from .capital_metrics import CapitalMetrics
+from .data_loader import DataLoader
+from .html_report import HTMLChartBundle
+from .pl_metrics import PLMetrics
+from .profiler import profiler
+from .report_builders import (frame_to_csv, capital_report_metrics, pl_summary_stats,
+                              generate_capital_summary_html_report, generate_capital_summary_excel_report,
+                              generate_pl_excel_report, generate_competitive_insights,
+                              generate_competitors_excel_report, generate_business_case_pipeline_report)
+
+logger = logging.getLogger(__name__)
+
+INPUT_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+
+def read_input(path: Union[str, Path]) -> pd.DataFrame:
+    """First sheet of a workbook, or a CSV file"""
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+
+def _require(df: pd.DataFrame, columns: List[str]):
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+
+def _html(html: str) -> Dict[str, Union[str, bytes]]:
+    """The HTML report under its extension, gzipped when REPORT_HTML_GZIP is set"""
+    if REPORT_CONFIG["html_gzip"]:
+        return {'.html.gz': HTMLChartBundle.compress(html)}
+    return {'.html': html}
+
+
+def prepare_capital_projects(df: pd.DataFrame, year: int = CURRENT_YEAR, month: int = CURRENT_MONTH) -> pd.DataFrame:
+    """Clean names, convert amounts and derive the metrics as of ``year``/``month``, as the capital upload does"""
+    df.columns = [DataLoader.clean_column_name(col) for col in df.columns]
+    df.columns = DataLoader.handle_duplicate_columns(df.columns.tolist())
+    df = DataLoader.convert_financial_columns(
+        df, DataLoader.classify_financial_columns(df.columns, CAPITAL_FINANCIAL_PATTERN))
+    return CapitalMetrics.calculate(df, year, month, on_warning=logger.warning)
+
+
+def build_capital_pack(df: pd.DataFrame, stem: str, run_date: datetime) -> Dict[str, Union[str, bytes]]:
+    """Capital HTML and Excel reports of every project in the default analysis year as of ``run_date``"""
+    year, month = run_date.year, run_date.month
+    df = prepare_capital_projects(df, year, month)
+    series = CapitalTimeSeries(df)
+    analysis_year = series.default_year(year) if series.years else year
+    if analysis_year != year:
+        df = series.frame_for_year(analysis_year, series.analysis_month(analysis_year, year, month))
+
+    rollup = series.rollup(analysis_year, df)
+    projects, _ = rollup.select({})
+    metrics = capital_report_metrics(rollup.totals({}))
+    files = {f"{stem}_capital_project_report{ext}": html
+             for ext, html in _html(generate_capital_summary_html_report(metrics, projects)).items()}
+    files[f"{stem}_capital_project_report.xlsx"] = generate_capital_summary_excel_report(metrics, projects)
+    return files
+
+
+def build_pl_pack(df: pd.DataFrame, stem: str, run_date: datetime) -> Dict[str, Union[str, bytes]]:
+    """P&L analysis workbook and the derived data as CSV"""
+    _require(df, PL_REQUIRED_COLUMNS)
+    pl_analysis = PLMetrics.calculate(df)
+    return {
+        f"{stem}_PL_Analysis.xlsx": generate_pl_excel_report(pl_analysis, pl_summary_stats(pl_analysis, run_date)),
+        f"{stem}_PL_Raw_Data.csv": frame_to_csv(pl_analysis),
+    }
+
+
+def build_competitors_pack(df: pd.DataFrame, stem: str, run_date: datetime) -> Dict[str, Union[str, bytes]]:
+    """Competitive analysis workbook and the data as CSV"""
+    _require(df, COMPETITORS_REQUIRED_COLUMNS)
+    return {
+        f"{stem}_Competitors_Analysis.xlsx": generate_competitors_excel_report(df, generate_competitive_insights(df)),
+        f"{stem}_Competitors_Data.csv": frame_to_csv(df),
+    }
+
+
+def business_case_pipeline(scored: pd.DataFrame, run_date: Optional[datetime] = None) -> pd.DataFrame:
+    """Qualifying cases as the dashboard promotes them to the parking lot, added on ``run_date``"""
+    return pd.DataFrame([BusinessCaseScorer.pipeline_item(case, run_date)
+                         for _, case in BusinessCaseScorer.qualifying(scored).iterrows()],
+                        columns=PIPELINE_COLUMNS)
+
+
+def build_business_case_pack(df: pd.DataFrame, stem: str, run_date: datetime) -> Dict[str, Union[str, bytes]]:
+    """Pipeline workbook of the qualifying cases and every case's scores as CSV"""
+    _require(df, BUSINESS_CASE_REQUIRED_COLUMNS)
+    scored = BusinessCaseScorer.score_columns(df)
+    pipeline = business_case_pipeline(scored, run_date=run_date)
+    return {
+        f"{stem}_Business_Case_Pipeline.xlsx": generate_business_case_pipeline_report(pipeline),
+        f"{stem}_Business_Case_Scores.csv": frame_to_csv(scored),
+    }
+
+
+# Input subdirectory -> pack builder
+REPORT_PACKS: Dict[str, Callable[[pd.DataFrame, str, datetime], Dict[str, Union[str, bytes]]]] = {
+    'capital': build_capital_pack,
+    'pl': build_pl_pack,
+    'competitors': build_competitors_pack,
+    'business_cases': build_business_case_pack,
+}
+
+
+def _write(path: Path, content: Union[str, bytes]):
+    """Write a report file atomically, so a half-written pack is never picked up"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    partial = path.with_name(f".{path.name}.partial")
+    partial.write_bytes(content)
+    os.replace(partial, path)
+
+
+def run_pack(pack: str, input_path: str, output_dir: str, run_date: datetime) -> dict:
+    """Build one pack from one input file into ``output_dir/pack``; runs in a scheduler worker process.
+
+    ``run_date`` is the scheduled time of the run: long-lived workers must
+    not use the year and month that were current when they were started.
+    """
+    started = time.perf_counter()
+    with profiler.span(f"scheduler.pack.{pack}", file=Path(input_path).name) as span:
+        files = REPORT_PACKS[pack](read_input(input_path), Path(input_path).stem, run_date)
+        target = Path(output_dir) / pack
+        target.mkdir(parents=True, exist_ok=True)
+        for name, content in files.items():
+            _write(target / name, content)
+        span.set(files=len(files))
+    return {'outputs': sorted(files), 'seconds': round(time.perf_counter() - started, 3)}
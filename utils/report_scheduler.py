@@ -0,0 +1,229 @@
+"""
+Headless scheduler that rebuilds the report packs from a watched input directory
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from config.settings import REPORT_SCHEDULER_CONFIG
+from .report_packs import INPUT_EXTENSIONS, REPORT_PACKS, run_pack
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+# (name, lowest value, highest value) of the five cron fields
+CRON_FIELDS = [('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 6)]
+
+
+class CronSchedule:
+    """A five-field cron expression: ``minute hour day month weekday``.
+
+    Each field is ``*``, a value, a range ``a-b``, a step ``*/n``, ``a-b/n``
+    or ``a/n`` (from ``a`` to the field's highest value), or a
+    comma-separated list of those; weekday 0 (or 7) is Sunday. As in cron,
+    when both day and weekday are restricted a time matches if either does.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression needs {len(CRON_FIELDS)} fields, got {len(fields)}: {expression!r}")
+        self.values = [self._parse(field, *spec) for field, spec in zip(fields, CRON_FIELDS)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = self.values
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    @staticmethod
+    def _parse(field: str, name: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(','):
+            span, _, step = part.partition('/')
+            if span == '*':
+                start, stop = low, high
+            elif '-' in span:
+                start, stop = (int(bound) for bound in span.split('-', 1))
+            else:
+                start = int(span)
+                stop = high if step else start
+            # Weekday 7 is Sunday again, so ranges may end on it
+            if not (low <= start <= stop <= (7 if name == 'weekday' else high)) or (step and int(step) < 1):
+                raise ValueError(f"Invalid cron {name} field: {field!r}")
+            values.update(value % 7 if name == 'weekday' else value
+                          for value in range(start, stop + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def matches(self, moment: datetime) -> bool:
+        return (moment.minute in self.minutes and moment.hour in self.hours
+                and moment.month in self.months and self._day_matches(moment))
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after ``moment``"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+class ReportScheduler:
+    """Rebuild every report pack whose inputs changed, on a cron schedule.
+
+    Inputs are read from ``input_dir/<pack>/`` (one subdirectory per entry
+    of REPORT_PACKS). At each scheduled time the directory is scanned and
+    one job per input file is queued on a pool of worker processes; each
+    job writes its reports to ``output_dir/YYYY-MM-DD/<pack>/``. The
+    day's ``manifest.json`` records every job with the size and mtime of
+    its input, so later runs that day skip inputs already built and only
+    new or changed files are processed. A failed job is recorded and
+    retried at the next run.
+    """
+
+    def __init__(self, input_dir: Optional[str] = None, output_dir: Optional[str] = None,
+                 schedule: Optional[str] = None, max_workers: Optional[int] = None,
+                 start_method: Optional[str] = None):
+        self.input_dir = Path(input_dir or REPORT_SCHEDULER_CONFIG["input_dir"])
+        self.output_dir = Path(output_dir or REPORT_SCHEDULER_CONFIG["output_dir"])
+        self.schedule = CronSchedule(schedule or REPORT_SCHEDULER_CONFIG["schedule"])
+        self.max_workers = max_workers or REPORT_SCHEDULER_CONFIG["max_workers"]
+        self.start_method = start_method or REPORT_SCHEDULER_CONFIG["start_method"]
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stop = threading.Event()
+
+    def executor(self) -> ProcessPoolExecutor:
+        """Worker process pool, started on first use"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context(self.start_method))
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stop(self):
+        """Ask ``serve_forever`` to return after the run in progress"""
+        self._stop.set()
+
+    def create_input_dirs(self):
+        for pack in REPORT_PACKS:
+            (self.input_dir / pack).mkdir(parents=True, exist_ok=True)
+
+    def scan(self) -> List[Tuple[str, Path, str]]:
+        """``(pack, input path, signature)`` of every input file, pack by pack"""
+        inputs = []
+        for pack in REPORT_PACKS:
+            directory = self.input_dir / pack
+            if not directory.is_dir():
+                continue
+            for path in sorted(directory.iterdir()):
+                if path.name.startswith(('.', '~$')) or path.suffix.lower() not in INPUT_EXTENSIONS or not path.is_file():
+                    continue
+                stat = path.stat()
+                inputs.append((pack, path, f"{stat.st_size}:{stat.st_mtime_ns}"))
+        return inputs
+
+    @staticmethod
+    def load_manifest(run_dir: Path) -> dict:
+        path = run_dir / MANIFEST_NAME
+        if path.exists():
+            try:
+                return json.loads(path.read_text())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable manifest {path}: {e}")
+        return {'runs': [], 'jobs': {}}
+
+    @staticmethod
+    def save_manifest(run_dir: Path, manifest: dict):
+        partial = run_dir / f".{MANIFEST_NAME}.partial"
+        partial.write_text(json.dumps(manifest, indent=2, default=str))
+        os.replace(partial, run_dir / MANIFEST_NAME)
+
+    def run_once(self, now: Optional[datetime] = None) -> dict:
+        """Build the packs of every new or changed input into today's directory; returns the run record"""
+        now = now or datetime.now()
+        run_dir = self.output_dir / now.strftime('%Y-%m-%d')
+        run_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.load_manifest(run_dir)
+
+        queue = []
+        skipped = 0
+        for pack, path, signature in self.scan():
+            job_id = f"{pack}/{path.name}"
+            previous = manifest['jobs'].get(job_id)
+            if previous and previous.get('status') == 'done' and previous.get('signature') == signature:
+                skipped += 1
+                continue
+            queue.append((job_id, pack, path, signature))
+
+        run = {'started': now.isoformat(timespec='seconds'), 'queued': len(queue), 'skipped': skipped,
+               'done': 0, 'failed': 0}
+        if queue:
+            logger.info(f"Building {len(queue)} report pack(s) into {run_dir}")
+            futures = {}
+            for job_id, pack, path, signature in queue:
+                manifest['jobs'][job_id] = {'pack': pack, 'input': str(path), 'signature': signature,
+                                            'status': 'queued'}
+                futures[self.executor().submit(run_pack, pack, str(path), str(run_dir), now)] = job_id
+            self.save_manifest(run_dir, manifest)
+
+            for future in as_completed(futures):
+                job = manifest['jobs'][futures[future]]
+                try:
+                    job.update(future.result(), status='done', error=None)
+                    run['done'] += 1
+                except Exception as e:
+                    job.update(status='failed', error=str(e) or type(e).__name__)
+                    run['failed'] += 1
+                    logger.error(f"Report pack {futures[future]} failed: {job['error']}")
+                    if isinstance(e, BrokenProcessPool):
+                        self._executor = None
+                job['finished'] = datetime.now().isoformat(timespec='seconds')
+                self.save_manifest(run_dir, manifest)
+
+        run['finished'] = datetime.now().isoformat(timespec='seconds')
+        manifest['runs'].append(run)
+        self.save_manifest(run_dir, manifest)
+        logger.info(f"Report run finished: {run['done']} built, {run['failed']} failed, {skipped} unchanged")
+        return run
+
+    def serve_forever(self):
+        """Run at every scheduled time until ``stop`` is called"""
+        self.create_input_dirs()
+        try:
+            while not self._stop.is_set():
+                next_run = self.schedule.next_after(datetime.now())
+                logger.info(f"Next report run at {next_run:%Y-%m-%d %H:%M}")
+                while not self._stop.is_set():
+                    remaining = (next_run - datetime.now()).total_seconds()
+                    if remaining <= 0:
+                        break
+                    self._stop.wait(min(remaining, REPORT_SCHEDULER_CONFIG["poll_interval_s"]))
+                if not self._stop.is_set():
+                    self.run_once(next_run)
+        finally:
+            self.shutdown()
@@ -0,0 +1,341 @@
+"""
+Memory accounting of Streamlit session state, with spill of large frames to disk
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.settings import SESSION_MEMORY_CONFIG
+from .derived_cache import SESSION_KEY as DERIVED_CACHE_KEY, DerivedDataCache
+
+logger = logging.getLogger(__name__)
+
+MEMORY_COLUMNS = ['Key', 'Type', 'Size_MB']
+
+
+class SpilledFrame:
+    """Placeholder left in session state for a DataFrame spilled to a Parquet file"""
+
+    __slots__ = ('path', 'fingerprint', 'rows', 'size_bytes', 'columns')
+
+    def __init__(self, path: Path, fingerprint: str, rows: int, size_bytes: int, columns: Optional[list]):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.rows = rows
+        self.size_bytes = size_bytes
+        self.columns = columns
+
+    def load(self) -> pd.DataFrame:
+        """Read the frame back, with its original column labels and content fingerprint"""
+        df = pd.read_parquet(self.path)
+        if self.columns is not None:
+            df.columns = self.columns
+        DerivedDataCache.remember(df, self.fingerprint)
+        return df
+
+    def __repr__(self) -> str:
+        return f"SpilledFrame({self.rows:,} rows, {self.size_bytes / 1024**2:.1f} MB, {self.path.name})"
+
+
+class _SessionEntry:
+    """Bookkeeping of one session: its state, activity and last measured footprint.
+
+    ``state`` is the session's own SessionState, which outlives the
+    thread-safe wrapper Streamlit creates for each script run.
+    """
+
+    __slots__ = ('state', 'running', 'last_active', 'size_bytes', 'spilled')
+
+    def __init__(self, state):
+        self.state = state
+        self.running = False
+        self.last_active = time.time()
+        self.size_bytes = 0
+        self.spilled = 0
+
+
+class SessionMemory:
+    """Per-session memory accounting under a session and a process budget.
+
+    ``estimate_size()`` measures DataFrames and arrays by their buffers
+    (object columns deeply) and walks containers and plain objects, counting
+    every object once, so a frame shared by two keys is charged to the first
+    key that reaches it.
+
+    ``restore()`` runs at the start of every script run and reloads the
+    session's spilled frames, so the app only ever sees DataFrames.
+    ``enforce()`` runs at the end: a session over its own budget spills its
+    largest frames, and when the sessions of the process together exceed
+    the process budget the least recently active idle sessions lose their
+    derived-data cache and then their largest frames first. Spilled frames
+    are written once per content version and deleted once Streamlit has
+    closed their session.
+    """
+
+    def __init__(self, session_budget_mb: Optional[int] = None, process_budget_mb: Optional[int] = None,
+                 directory: Optional[str] = None, enabled: Optional[bool] = None):
+        self.enabled = SESSION_MEMORY_CONFIG["enabled"] if enabled is None else enabled
+        self.session_budget_bytes = (session_budget_mb or SESSION_MEMORY_CONFIG["session_budget_mb"]) * 1024**2
+        self.process_budget_bytes = (process_budget_mb or SESSION_MEMORY_CONFIG["process_budget_mb"]) * 1024**2
+        self.min_spill_bytes = SESSION_MEMORY_CONFIG["min_spill_mb"] * 1024**2
+        self.stale_run_s = SESSION_MEMORY_CONFIG["stale_run_s"]
+        self.directory = Path(directory or SESSION_MEMORY_CONFIG["spill_dir"]) / str(os.getpid())
+        self._sessions: Dict[str, _SessionEntry] = {}
+        self._lock = threading.RLock()
+        self.spills = 0
+        self.restores = 0
+
+    @staticmethod
+    def estimate_size(value: Any, _seen: Optional[Set[int]] = None, _depth: int = 0) -> int:
+        """Approximate bytes held by ``value`` and everything it references"""
+        seen = set() if _seen is None else _seen
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(deep=True, index=True).sum())
+        if isinstance(value, (pd.Series, pd.Index)):
+            return int(value.memory_usage(deep=True))
+        if isinstance(value, np.ndarray):
+            return int(value.nbytes)
+        if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+            return sys.getsizeof(value)
+        if hasattr(value, 'getbuffer'):
+            # BytesIO-like buffers, e.g. Streamlit's UploadedFile
+            return sys.getsizeof(value) + value.getbuffer().nbytes
+
+        size = sys.getsizeof(value)
+        if _depth >= 8:
+            return size
+        if isinstance(value, dict):
+            items = [item for pair in value.items() for item in pair]
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            items = list(value)
+        elif hasattr(value, '__dict__'):
+            items = [vars(value)]
+        else:
+            items = []
+        return size + sum(SessionMemory.estimate_size(item, seen, _depth + 1) for item in items)
+
+    @staticmethod
+    def usage(state=None) -> pd.DataFrame:
+        """Memory held by each session-state key, largest first"""
+        state = st.session_state if state is None else state
+        seen: Set[int] = set()
+        rows = []
+        for key in list(state.keys()):
+            try:
+                value = state[key]
+            except KeyError:
+                continue
+            rows.append({
+                'Key': str(key),
+                'Type': type(value).__name__,
+                'Size_MB': SessionMemory.estimate_size(value, seen) / 1024**2,
+            })
+        return pd.DataFrame(rows, columns=MEMORY_COLUMNS).sort_values('Size_MB', ascending=False,
+                                                                      ignore_index=True)
+
+    @staticmethod
+    def process_memory_mb() -> Optional[float]:
+        """Resident memory of this process, or None without psutil"""
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().rss / 1024**2
+
+    @staticmethod
+    def _context():
+        """ID and thread-safe state of the Streamlit session running on this thread"""
+        try:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+            ctx = get_script_run_ctx(suppress_warning=True)
+        except Exception:
+            return None, None
+        if ctx is None:
+            return None, None
+        return ctx.session_id, ctx.session_state
+
+    @staticmethod
+    def _session_open(session_id: str) -> bool:
+        """False once Streamlit has closed the session; disconnected sessions are kept for a reconnect"""
+        try:
+            from streamlit.runtime import Runtime
+            if not Runtime.exists():
+                return True
+            return Runtime.instance()._session_mgr.get_session_info(session_id) is not None
+        except Exception:
+            return True
+
+    def _entry(self, session_id: str, state) -> _SessionEntry:
+        # Key on the SessionState behind the per-run SafeSessionState wrapper
+        state = getattr(state, '_state', state)
+        entry = self._sessions.get(session_id)
+        if entry is None or entry.state is not state:
+            entry = self._sessions[session_id] = _SessionEntry(state)
+        return entry
+
+    def _account(self, state) -> Tuple[int, List[Tuple[str, pd.DataFrame, int]]]:
+        """Total bytes held by ``state`` and its spillable frames, largest first"""
+        seen: Set[int] = set()
+        total = 0
+        frames = []
+        for key, value in state.filtered_state.items():
+            size = self.estimate_size(value, seen)
+            total += size
+            if isinstance(value, pd.DataFrame) and size >= self.min_spill_bytes:
+                frames.append((key, value, size))
+        frames.sort(key=lambda item: item[2], reverse=True)
+        return total, frames
+
+    def restore(self) -> int:
+        """Reload this session's spilled frames; call at the start of every script run"""
+        session_id, state = self._context()
+        if not self.enabled or session_id is None:
+            return 0
+
+        with self._lock:
+            entry = self._entry(session_id, state)
+            entry.running = True
+            entry.last_active = time.time()
+            spilled = {key: value for key, value in state.filtered_state.items()
+                       if isinstance(value, SpilledFrame)}
+
+            restored = 0
+            for key, placeholder in spilled.items():
+                try:
+                    state[key] = placeholder.load()
+                    restored += 1
+                except Exception as e:
+                    logger.error(f"Could not reload spilled session data {key}: {e}")
+                    state[key] = pd.DataFrame()
+                    st.warning(f"⚠️ Your '{key}' data could not be reloaded from disk - please upload it again.")
+            entry.spilled = 0
+            self.restores += restored
+        return restored
+
+    def enforce(self) -> int:
+        """Measure this session and spill to the budgets; call at the end of every script run"""
+        session_id, state = self._context()
+        if not self.enabled or session_id is None:
+            return 0
+
+        with self._lock:
+            entry = self._entry(session_id, state)
+            entry.size_bytes, _ = self._account(state)
+            entry.running = False
+            entry.last_active = time.time()
+
+            freed = 0
+            if entry.size_bytes > self.session_budget_bytes:
+                freed += self._spill(session_id, state, entry, entry.size_bytes - self.session_budget_bytes)
+            return freed + self.evict(self.process_budget_bytes, exclude=session_id)
+
+    def evict(self, target_bytes: int, exclude: Optional[str] = None) -> int:
+        """Spill data of the least recently active idle sessions until all sessions fit ``target_bytes``"""
+        with self._lock:
+            self._prune()
+            total = sum(entry.size_bytes for entry in self._sessions.values())
+            if total <= target_bytes:
+                return 0
+
+            now = time.time()
+            idle = sorted(((session_id, entry) for session_id, entry in self._sessions.items()
+                           if session_id != exclude
+                           and (not entry.running or now - entry.last_active > self.stale_run_s)),
+                          key=lambda item: item[1].last_active)
+            freed = 0
+            for session_id, entry in idle:
+                if total - freed <= target_bytes:
+                    break
+                freed += self._spill(session_id, entry.state, entry, total - freed - target_bytes)
+            return freed
+
+    def _spill(self, session_id: str, state, entry: _SessionEntry, needed: int) -> int:
+        """Free at least ``needed`` bytes of one session: derived data first, then its largest frames"""
+        freed = 0
+        if DERIVED_CACHE_KEY in state:
+            derived = state[DERIVED_CACHE_KEY]
+            before = self.estimate_size(derived)
+            derived.invalidate()
+            freed += before - self.estimate_size(derived)
+
+        _, frames = self._account(state)
+        for key, df, size in frames:
+            if freed >= needed:
+                break
+            placeholder = self._write(session_id, key, df, size)
+            if placeholder is not None:
+                state[key] = placeholder
+                freed += size
+                entry.spilled += 1
+                self.spills += 1
+
+        entry.size_bytes = max(0, entry.size_bytes - freed)
+        return freed
+
+    def _write(self, session_id: str, key: str, df: pd.DataFrame, size: int) -> Optional[SpilledFrame]:
+        """Write ``df`` to this session's spill directory, once per content version"""
+        fingerprint = DerivedDataCache.fingerprint(df)
+        directory = self.directory / session_id
+        stem = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+        path = directory / f"{stem}-{fingerprint[:16]}.parquet"
+        # Parquet needs string column names; the originals are restored on load
+        columns = None if all(isinstance(col, str) for col in df.columns) else list(df.columns)
+
+        if not path.exists():
+            tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                frame = df if columns is None else df.set_axis([str(position) for position in range(len(columns))],
+                                                               axis=1)
+                frame.to_parquet(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning(f"Could not spill session data {key}: {e}")
+                tmp_path.unlink(missing_ok=True)
+                return None
+            for stale in directory.glob(f"{stem}-*.parquet"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+
+        return SpilledFrame(path, fingerprint, len(df), size, columns)
+
+    def _prune(self):
+        """Forget closed sessions and delete their spill files"""
+        for session_id in [session_id for session_id in self._sessions if not self._session_open(session_id)]:
+            del self._sessions[session_id]
+            shutil.rmtree(self.directory / session_id, ignore_errors=True)
+
+    def stats(self) -> dict:
+        """Return tracked sessions, their measured footprint and spill counters"""
+        with self._lock:
+            self._prune()
+            return {
+                'enabled': self.enabled,
+                'sessions': len(self._sessions),
+                'tracked_mb': sum(entry.size_bytes for entry in self._sessions.values()) / 1024**2,
+                'spilled_frames': sum(entry.spilled for entry in self._sessions.values()),
+                'spills': self.spills,
+                'restores': self.restores,
+                'session_budget_mb': self.session_budget_bytes / 1024**2,
+                'process_budget_mb': self.process_budget_bytes / 1024**2,
+            }
+
+
+# Global session memory manager
+session_memory = SessionMemory()
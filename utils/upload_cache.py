@@ -0,0 +1,185 @@
+"""
+Persistent columnar cache of parsed uploads
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+from config.settings import UPLOAD_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class UploadCache:
+    """Parquet cache of post-cleaning DataFrames keyed by upload content.
+
+    Entries are keyed by a SHA-256 of the upload bytes, the loader namespace
+    and the pipeline version, so the same file parsed by the same pipeline is
+    only parsed once - across reruns, restarts and replicas sharing the
+    cache directory. The directory is kept under a size budget by evicting
+    the least recently used entries.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_size_mb: Optional[int] = None,
+                 pipeline_version: Optional[str] = None, enabled: Optional[bool] = None):
+        self.directory = Path(directory or UPLOAD_CACHE_CONFIG["directory"])
+        self.max_size_bytes = (max_size_mb or UPLOAD_CACHE_CONFIG["max_size_mb"]) * 1024 * 1024
+        self.pipeline_version = pipeline_version or UPLOAD_CACHE_CONFIG["pipeline_version"]
+        self.enabled = UPLOAD_CACHE_CONFIG["enabled"] if enabled is None else enabled
+        self.hits = 0
+        self.misses = 0
+
+        if self.enabled and not self._parquet_available():
+            logger.info("pyarrow not installed - persistent upload cache disabled")
+            self.enabled = False
+
+    @staticmethod
+    def _parquet_available() -> bool:
+        """Check whether a Parquet engine is installed"""
+        try:
+            import pyarrow  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def make_key(self, data: bytes, namespace: str, context: str = "") -> str:
+        """Build the cache key for an upload"""
+        hasher = hashlib.sha256()
+        hasher.update(f"{namespace}|{self.pipeline_version}|{context}|".encode('utf-8'))
+        hasher.update(data)
+        return hasher.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.parquet"
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached frame for ``key`` or None"""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            df = pd.read_parquet(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable upload cache entry {path.name}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        # Refresh the access time used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """Store ``df`` under ``key``; returns False if the frame could not be cached"""
+        if not self.enabled or df is None or df.empty:
+            return False
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            frame = df
+            if not all(isinstance(col, str) for col in df.columns):
+                frame = df.rename(columns=str)
+            frame.to_parquet(tmp_path, index=False)
+            # Atomic rename so concurrent readers never see a partial file
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not cache upload {key[:12]}: {e}")
+            self._remove(tmp_path)
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits its budget"""
+        try:
+            entries = [(entry.stat().st_mtime, entry.stat().st_size, entry)
+                       for entry in self.directory.glob("*.parquet")]
+        except OSError:
+            return 0
+
+        total_size = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total_size <= self.max_size_bytes:
+                break
+            if self._remove(entry):
+                total_size -= size
+                removed += 1
+
+        return removed
+
+    def clear(self):
+        """Remove every cache entry"""
+        for entry in self.directory.glob("*.parquet"):
+            self._remove(entry)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the on-disk footprint"""
+        entries = list(self.directory.glob("*.parquet")) if self.directory.exists() else []
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'size_mb': sum(entry.stat().st_size for entry in entries) / 1024**2
+        }
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
+
+
+# Global upload cache
+upload_cache = UploadCache()
+
+
+def cached_upload(namespace: str, context: Optional[Callable[[], str]] = None):
+    """Decorator persisting a loader's cleaned DataFrame in the upload cache.
+
+    ``context`` may return extra key material for loaders whose output
+    depends on more than the file contents (e.g. the current month).
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(uploaded_file, *args, **kwargs):
+            if not upload_cache.enabled or uploaded_file is None:
+                return func(uploaded_file, *args, **kwargs)
+
+            key = upload_cache.make_key(
+                uploaded_file.getvalue(), namespace, context() if context else ""
+            )
+            df = upload_cache.get(key)
+            if df is not None:
+                return df
+
+            df = func(uploaded_file, *args, **kwargs)
+            if isinstance(df, pd.DataFrame):
+                upload_cache.put(key, df)
+            return df
+        return wrapper
+    return decorator